@@ -0,0 +1,37 @@
+import logging
+
+import pytest
+
+from config import Config
+from utils.standin_server import StandInServer
+
+logger = logging.getLogger(__name__)
+
+# Uses of a pooled browser before it is recycled, more than any benchmark makes
+BENCHMARK_MAX_USES = 1_000_000
+
+
+def pytest_configure(config):
+    """
+    Keep browser launches out of the timings: no pool launching in the background while the
+    benchmarks run, and no pooled browser recycled in the middle of a measurement.
+    """
+    Config.PRELAUNCH_BROWSERS = 0
+    Config.DRIVER_MAX_USES = BENCHMARK_MAX_USES
+
+
+@pytest.fixture(scope="session", autouse=True)
+def standin_server():
+    """Fixture to always benchmark against the local stand-in site, whatever Config.USE_STANDIN is."""
+    server = StandInServer().start()
+    live_url, Config.APP_URL = Config.APP_URL, server.url
+    yield server
+
+    Config.APP_URL = live_url
+    server.stop()
+
+
+@pytest.fixture
+def canvas_account_url(standin_server):
+    """URL of the stand-in Canvas account page with the Canvas Network form selected."""
+    return f"{standin_server.url}canvas/login#canvas-network"
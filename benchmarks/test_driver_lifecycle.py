@@ -0,0 +1,32 @@
+import pytest
+
+from utils.driver_pool import DriverPool
+from utils.webdriver_factory import WebDriverFactory
+
+
+def test_driver_startup(benchmark):
+    """Cold start and quit of a browser, the fixed cost the driver pool amortizes."""
+
+    def start_and_quit():
+        WebDriverFactory.get_driver().quit()
+
+    benchmark.pedantic(start_and_quit, rounds=3, iterations=1, warmup_rounds=1)
+
+
+def test_pool_acquire_release(benchmark, driver_pool):
+    """Handing out a warm pooled browser and resetting it afterwards."""
+
+    def acquire_and_release():
+        driver_pool.release(driver_pool.acquire())
+
+    benchmark(acquire_and_release)
+
+
+@pytest.mark.parametrize("size", [1, 2])
+def test_pool_start(benchmark, size):
+    """Launching a pool of `size` browsers concurrently."""
+
+    def start_and_close():
+        DriverPool(size=size).start().close()
+
+    benchmark.pedantic(start_and_close, rounds=2, iterations=1)
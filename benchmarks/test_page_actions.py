@@ -0,0 +1,76 @@
+import pytest
+
+from config import Config
+from pages.base_page import BasePage
+from pages.canvas_accountpage import CanvasAccountPage
+from pages.canvas_loginpage import CanvasLoginPage
+from pages.homepage import Homepage
+
+WAIT_ENGINES = ["polling", "observer"]
+
+
+def test_navigate_to(benchmark, driver):
+    """Navigation to the homepage until it is ready."""
+    home_page = Homepage(driver)
+    benchmark(home_page.navigate_to, Config.APP_URL)
+
+
+def test_wait_for_page_load(benchmark, driver):
+    """document.readyState check on an already loaded page."""
+    home_page = Homepage(driver)
+    home_page.navigate_to(Config.APP_URL)
+    benchmark(home_page.wait_for_page_load)
+
+
+@pytest.mark.parametrize("wait_engine", WAIT_ENGINES)
+def test_wait_for_element_visible(benchmark, driver, canvas_account_url, wait_engine):
+    page = BasePage(driver, wait_engine=wait_engine)
+    driver.get(canvas_account_url)
+    benchmark(page.wait_for_element_visible, CanvasAccountPage.LOCATORS["email_textbox"])
+
+
+@pytest.mark.parametrize("wait_engine", WAIT_ENGINES)
+def test_wait_for_element_clickable(benchmark, driver, canvas_account_url, wait_engine):
+    page = BasePage(driver, wait_engine=wait_engine)
+    driver.get(canvas_account_url)
+    benchmark(page.wait_for_element_clickable, CanvasAccountPage.LOCATORS["login_button"])
+
+
+@pytest.mark.parametrize("wait_engine", WAIT_ENGINES)
+def test_is_element_displayed(benchmark, driver, canvas_account_url, wait_engine):
+    page = BasePage(driver, wait_engine=wait_engine)
+    driver.get(canvas_account_url)
+    benchmark(page.is_element_displayed, CanvasAccountPage.LOCATORS["password_textbox"])
+
+
+def test_wait_for_url_contains(benchmark, driver, canvas_account_url):
+    page = BasePage(driver)
+    driver.get(canvas_account_url)
+    benchmark(page.wait_for_url_contains, CanvasAccountPage.CANVAS_ACCOUNT_URLPATH)
+
+
+@pytest.mark.parametrize("wait_engine", WAIT_ENGINES)
+def test_fill_text_field(benchmark, driver, canvas_account_url, wait_engine):
+    page = BasePage(driver, wait_engine=wait_engine)
+    driver.get(canvas_account_url)
+    benchmark(
+        page.fill_text_field,
+        CanvasAccountPage.LOCATORS["email_textbox"],
+        Config.INVALID_USERNAME,
+    )
+
+
+def test_login_journey(benchmark, driver):
+    """Full journey: homepage -> Canvas link -> Canvas Network -> login -> flash message."""
+
+    def journey():
+        home_page = Homepage(driver)
+        home_page.navigate_to(Config.APP_URL)
+        home_page.select_canvas_link()
+        canvas_account_page = CanvasAccountPage(driver)
+        canvas_account_page.click_canvas_network()
+        canvas_account_page.click_login_button(Config.INVALID_USERNAME, Config.INVALID_PASSWORD)
+        return CanvasLoginPage(driver).get_flash_error_message()
+
+    message = benchmark.pedantic(journey, rounds=5, iterations=1, warmup_rounds=1)
+    assert "Please verify your username or password" in message
@@ -6,6 +6,10 @@ class Config:
     # URLS
     APP_URL = "https://www.instructure.com/"
 
+    # Serve a local replica of the pages instead of the live site, see utils/standin_server.py
+    USE_STANDIN = int(os.environ.get("USE_STANDIN", 0))
+    STANDIN_PORT = int(os.environ.get("STANDIN_PORT", 0))
+
     # CREDS
     INVALID_USERNAME = "invalid_email@gmail.com"
     INVALID_PASSWORD = "ncdhc@892912"
@@ -14,9 +18,81 @@ class Config:
     VALID_PASSWORD = "valid_password"
 
     # BROWSER OPTIONS
-    BROWSER = os.environ.get("BROWSER", "chrome")  # chrome, safari
+    BROWSER = os.environ.get("BROWSER", "chrome")  # chrome, remote, safari
     HEADLESS = int(os.environ.get("HEADLESS", 1))
+    GRID_URL = os.environ.get("GRID_URL", "http://localhost:4444")
+    GRID_SESSION_TIMEOUT = int(os.environ.get("GRID_SESSION_TIMEOUT", 300))
+    PAGE_LOAD_STRATEGY = os.environ.get("PAGE_LOAD_STRATEGY", "eager")  # normal, eager, none
+    BROWSER_PROFILE = os.environ.get("BROWSER_PROFILE", "default")  # default, dense
+    DENSE_WINDOW_SIZE = os.environ.get("DENSE_WINDOW_SIZE", "1280,800")
+    DENSE_RENDERER_PROCESS_LIMIT = int(os.environ.get("DENSE_RENDERER_PROCESS_LIMIT", 2))
+    DENSE_DISK_CACHE_MB = int(os.environ.get("DENSE_DISK_CACHE_MB", 32))
+    # Below this much shared memory, Chrome writes its shared memory files to /tmp instead
+    DENSE_MIN_SHM_MB = int(os.environ.get("DENSE_MIN_SHM_MB", 1024))
 
     # TIMEOUTS
     IMPLICIT_PAGE_TIMEOUT = int(os.environ.get("IMPLICIT_PAGE_TIMEOUT", 15))
     EXPLICIT_WAIT = int(os.environ.get("EXPLICIT_WAIT", 20))
+
+    # ADAPTIVE TIMEOUTS, see utils/timeout_model.py
+    ADAPTIVE_TIMEOUTS = int(os.environ.get("ADAPTIVE_TIMEOUTS", 0))
+    TIMEOUT_PERCENTILE = int(os.environ.get("TIMEOUT_PERCENTILE", 95))
+    TIMEOUT_FACTOR = float(os.environ.get("TIMEOUT_FACTOR", 1.5))
+    TIMEOUT_MARGIN = float(os.environ.get("TIMEOUT_MARGIN", 2))
+    TIMEOUT_MIN_SAMPLES = int(os.environ.get("TIMEOUT_MIN_SAMPLES", 5))
+    NEGATIVE_CHECK_TIMEOUT = int(os.environ.get("NEGATIVE_CHECK_TIMEOUT", 3))
+
+    # DRIVER POOL
+    DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", 1))
+    DRIVER_MAX_USES = int(os.environ.get("DRIVER_MAX_USES", 50))
+    # Launch the pool in the background while pytest collects the tests
+    PRELAUNCH_BROWSERS = int(os.environ.get("PRELAUNCH_BROWSERS", 1))
+    TABS_PER_DRIVER = int(os.environ.get("TABS_PER_DRIVER", 4))  # see utils/tab_scheduler.py
+    ASYNC_DRIVERS = int(os.environ.get("ASYNC_DRIVERS", 2))  # see utils/async_webdriver.py
+
+    # CHROMEDRIVER RESOLUTION
+    CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+    CHROME_BINARY = os.environ.get("CHROME_BINARY")
+    DRIVER_CACHE_DIR = os.environ.get(
+        "DRIVER_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "instructure-assessment", "chromedriver"),
+    )
+
+    # CHECKPOINTS
+    CHECKPOINT_VERIFY_TIMEOUT = int(os.environ.get("CHECKPOINT_VERIFY_TIMEOUT", 5))
+
+    # WAITS
+    WAIT_ENGINE = os.environ.get("WAIT_ENGINE", "polling")  # polling, observer
+
+    # REQUEST BLOCKING (comma separated lists)
+    # Off by default, tests opt in with @pytest.mark.block_requests(third_party=True)
+    BLOCK_THIRD_PARTY = int(os.environ.get("BLOCK_THIRD_PARTY", 0))
+    BLOCKED_URL_PATTERNS = [
+        p for p in os.environ.get("BLOCKED_URL_PATTERNS", "").split(",") if p
+    ]
+    BLOCKED_EXTENSION_GROUPS = [
+        g for g in os.environ.get("BLOCKED_EXTENSION_GROUPS", "").split(",") if g
+    ]  # image, font, media, stylesheet
+    ALLOWED_HOSTS = [h for h in os.environ.get("ALLOWED_HOSTS", "").split(",") if h]
+
+    # STRUCTURED LOGGING, see utils/log_pipeline.py
+    LOG_PIPELINE = int(os.environ.get("LOG_PIPELINE", 1))
+    LOG_JSON_MAX_BYTES = int(os.environ.get("LOG_JSON_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_JSON_BACKUPS = int(os.environ.get("LOG_JSON_BACKUPS", 5))
+
+    # NETWORK RECORD/REPLAY, see utils/network_replay.py
+    NETWORK_MODE = os.environ.get("NETWORK_MODE", "live")  # live, record, replay
+    NETWORK_ARCHIVE = os.environ.get("NETWORK_ARCHIVE", "network_archive")
+    # Query parameters left out of the archive keys: cache busters, timestamps, campaign tags
+    NETWORK_IGNORED_PARAMS = [
+        p
+        for p in os.environ.get(
+            "NETWORK_IGNORED_PARAMS",
+            "_,cb,cachebuster,nocache,t,ts,timestamp,rnd,random,"
+            "utm_source,utm_medium,utm_campaign,utm_term,utm_content,gclid,fbclid",
+        ).split(",")
+        if p
+    ]
+
+    # FAILURE ARTIFACTS
+    ARTIFACT_QUEUE_SIZE = int(os.environ.get("ARTIFACT_QUEUE_SIZE", 16))
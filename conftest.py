@@ -1,17 +1,61 @@
+import asyncio
 import logging
 import os
 import time
-import traceback
 import datetime
+import functools
+import inspect
+import math
 
 import pytest
 
+from selenium.common.exceptions import WebDriverException
+
+import pages.locator_registry  # noqa: F401 - validates all page LOCATORS before collection
+from config import Config
+from utils.artifact_writer import ArtifactWriter
+from utils.async_webdriver import run_concurrently
+from utils.driver_pool import DriverPool, DriverPoolLauncher
+from utils.instrumentation import merge_action_files, recorder, render_summary_html
+from utils.log_pipeline import LogPipeline
+from utils.network_replay import stop_replay_proxy
+from utils.parallel import (
+    is_distributed,
+    merge_worker_json_logs,
+    merge_worker_logs,
+    worker_id,
+    worker_suffix,
+)
+from utils.request_blocking import apply_request_blocking, blocked_url_patterns
+from utils.standin_server import StandInServer
+from utils.stream_report import StreamReport
+from utils.test_scheduling import SCHEDULE_MODES, DurationHistory, order_items
+from utils.timeout_model import timeout_model
 from utils.webdriver_factory import WebDriverFactory
 
 # Create required directories
 
 logger = logging.getLogger(__name__)  # Get global logger
 
+# Timestamp shared by the controller and all xdist workers of a run
+RUN_TIMESTAMP_KEY = pytest.StashKey[str]()
+# Whether the log file name was generated here and worker logs should be merged
+MERGE_LOGS_KEY = pytest.StashKey[bool]()
+# Summary of the page actions of the run, rendered into the HTML report
+ACTION_SUMMARY_KEY = pytest.StashKey[dict]()
+# Background writer of the failure artifacts
+ARTIFACT_WRITER_KEY = pytest.StashKey[ArtifactWriter]()
+# Test durations and failures of previous runs, used to order the tests
+DURATION_HISTORY_KEY = pytest.StashKey[DurationHistory]()
+# Background writer of the JSON lines (and text) logs
+LOG_PIPELINE_KEY = pytest.StashKey[LogPipeline]()
+# Report written incrementally as the tests finish
+STREAM_REPORT_KEY = pytest.StashKey[StreamReport]()
+# Browser pool launched in the background while the tests are collected
+POOL_LAUNCHER_KEY = pytest.StashKey[DriverPoolLauncher]()
+
+REPORT_FORMATS = ("stream", "html", "both")
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -26,6 +70,20 @@ def pytest_addoption(parser):
     parser.addoption(
         "--reports-dir", action="store", default="reports", help="report directory"
     )
+    parser.addoption(
+        "--schedule",
+        action="store",
+        default="duration",
+        choices=SCHEDULE_MODES,
+        help="test order: longest first from previous runs, last failures first, or unchanged",
+    )
+    parser.addoption(
+        "--report-format",
+        action="store",
+        default="stream",
+        choices=REPORT_FORMATS,
+        help="streamed report with a lightweight viewer, pytest-html report, or both",
+    )
 
 
 def pytest_configure(config):
@@ -33,7 +91,13 @@ def pytest_configure(config):
     logs_dir = config.getoption("--logs-dir")
     reports_dir = config.getoption("--reports-dir")
 
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput:
+        timestamp = workerinput["run_timestamp"]
+    else:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    config.stash[RUN_TIMESTAMP_KEY] = timestamp
+    suffix = worker_suffix(config)
 
     # Create screenshots directory if it doesn't exist
     if not os.path.exists(screenshot_dir):
@@ -46,48 +110,335 @@ def pytest_configure(config):
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
 
-    # Run pytest with HTML reporting
+    # Run pytest with HTML reporting, pytest-html only writes it from the controller
+    report_format = config.getoption("--report-format")
     report_path = config.getoption("--html")
-    if not report_path:
+    if not report_path and report_format in ("html", "both"):
         config.option.htmlpath = f"{reports_dir}/report_{timestamp}.html"
+    if report_format in ("stream", "both") and worker_id(config) is None:
+        stream_report = StreamReport(os.path.join(reports_dir, f"run_{timestamp}"))
+        config.stash[STREAM_REPORT_KEY] = stream_report
+        config.pluginmanager.register(stream_report, "stream_report")
         
     logfile_path = config.getoption("--log-file")
+    config.stash[MERGE_LOGS_KEY] = not logfile_path
     if not logfile_path:
-        config.option.log_file = f"{logs_dir}/log_{timestamp}.log"
+        config.option.log_file = f"{logs_dir}/log_{timestamp}{suffix}.log"
+
+    if Config.LOG_PIPELINE:
+        text_path = None
+        if not logfile_path:
+            # The pipeline writes the text log from its thread instead of pytest's handler
+            text_path = config.option.log_file
+            config.option.log_file = os.devnull
+        config.stash[LOG_PIPELINE_KEY] = LogPipeline(
+            f"{logs_dir}/log_{timestamp}{suffix}.jsonl",
+            worker=suffix.lstrip("_") or None,
+            text_path=text_path,
+            text_format=config.getini("log_file_format"),
+            date_format=config.getini("log_file_date_format"),
+        ).start()
+
+    config.stash[ARTIFACT_WRITER_KEY] = ArtifactWriter()
+    timeout_model.load(os.path.join(reports_dir, "timeout_history.json"))
+
+    history = DurationHistory(os.path.join(reports_dir, "test_durations.json"))
+    config.stash[DURATION_HISTORY_KEY] = history
+    if worker_id(config) is None:
+        # Test reports of all xdist workers reach the controller, which keeps the history
+        config.pluginmanager.register(history, "duration_history")
+
+
+def _prelaunch_enabled(config):
+    return Config.PRELAUNCH_BROWSERS and not config.option.collectonly
+
+
+def pytest_sessionstart(session):
+    """Start launching the browser pool so that it starts while pytest collects the tests."""
+    config = session.config
+    # xdist workers only know how many browsers they need once collected
+    if not _prelaunch_enabled(config) or is_distributed(config) or worker_id(config):
+        return
+    config.stash[POOL_LAUNCHER_KEY] = DriverPoolLauncher()
+    logger.info("Browser pool launching in the background.")
+
+
+def pytest_collection_finish(session):
+    """
+    Drop the pre-launched browser pool if no selected test uses a driver. On an xdist worker,
+    pre-launch a pool sized for the worker's share of the tests that use one.
+    """
+    config = session.config
+    needs_driver = sum("driver_pool" in item.fixturenames for item in session.items)
+    launcher = config.stash.get(POOL_LAUNCHER_KEY, None)
+    if launcher and not needs_driver:
+        launcher.discard()
+    if worker_id(config) and _prelaunch_enabled(config) and needs_driver:
+        share = math.ceil(needs_driver / config.workerinput["workercount"])
+        size = min(Config.DRIVER_POOL_SIZE, share)
+        config.stash[POOL_LAUNCHER_KEY] = DriverPoolLauncher(
+            functools.partial(DriverPool, size=size)
+        )
+        logger.info(f"Browser pool of {size} launching in the background.")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Order the tests from their history, see utils/test_scheduling.py."""
+    order_items(items, config.stash[DURATION_HISTORY_KEY], config.getoption("--schedule"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Share the controller's run timestamp with each xdist worker."""
+    node.workerinput["run_timestamp"] = node.config.stash[RUN_TIMESTAMP_KEY]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """
+    Write the page action timings and, once all xdist workers are done, merge the per-worker
+    logs and timings. Runs before pytest-html so the timings end up in the report.
+    """
+    config = session.config
+    reports_dir = config.getoption("--reports-dir")
+    timestamp = config.stash[RUN_TIMESTAMP_KEY]
+
+    # Failure artifacts still being written must make it into the logs and report
+    artifact_writer = config.stash[ARTIFACT_WRITER_KEY]
+    artifact_writer.flush()
+    for test_name, error in artifact_writer.errors:
+        logger.warning(f"Failure artifacts of {test_name} could not be written: {error}")
+    if LOG_PIPELINE_KEY in config.stash:
+        # Workers are merged by the controller as soon as they report being finished
+        config.stash[LOG_PIPELINE_KEY].flush()
+
+    if worker_id(config) is None:
+        config.stash[DURATION_HISTORY_KEY].save()
+
+    # Wait latencies of the run feed the adaptive timeouts of the next runs
+    if worker_id(config) is not None:
+        timeout_model.write_samples(
+            os.path.join(reports_dir, f"timeouts_{timestamp}{worker_suffix(config)}.json")
+        )
+    else:
+        if is_distributed(config):
+            timeout_model.merge_samples(
+                os.path.join(reports_dir, f"timeouts_{timestamp}_gw*.json")
+            )
+        timeout_model.save()
+
+    if recorder.has_records():
+        recorder.write_json(
+            os.path.join(reports_dir, f"actions_{timestamp}{worker_suffix(config)}.json")
+        )
+        config.stash[ACTION_SUMMARY_KEY] = recorder.summary()
+
+    if is_distributed(config):
+        summary = merge_action_files(
+            os.path.join(reports_dir, f"actions_{timestamp}_gw*.json"),
+            os.path.join(reports_dir, f"actions_{timestamp}.json"),
+        )
+        if summary:
+            config.stash[ACTION_SUMMARY_KEY] = summary
+
+        logs_dir = config.getoption("--logs-dir")
+        if config.stash[MERGE_LOGS_KEY]:
+            combined_path = merge_worker_logs(logs_dir, timestamp)
+            if combined_path:
+                logger.info(f"Combined worker logs into {combined_path}")
+        if LOG_PIPELINE_KEY in config.stash:
+            config.stash[LOG_PIPELINE_KEY].flush()
+            combined_path = merge_worker_json_logs(logs_dir, timestamp)
+            if combined_path:
+                logger.info(f"Combined worker JSON logs into {combined_path}")
+
+    # The streamed report only exists on the controller, which has the merged summary
+    if STREAM_REPORT_KEY in config.stash and ACTION_SUMMARY_KEY in config.stash:
+        config.stash[STREAM_REPORT_KEY].write_summary(config.stash[ACTION_SUMMARY_KEY])
+
+
+def pytest_unconfigure(config):
+    """Stop the pool launcher, the artifact writer, the proxy, Grid connections and log pipeline."""
+    if POOL_LAUNCHER_KEY in config.stash:
+        config.stash[POOL_LAUNCHER_KEY].shutdown()
+    if STREAM_REPORT_KEY in config.stash:
+        config.stash[STREAM_REPORT_KEY].close()
+        logger.info(f"Report written to {config.stash[STREAM_REPORT_KEY].directory}")
+    if ARTIFACT_WRITER_KEY in config.stash:
+        config.stash[ARTIFACT_WRITER_KEY].close()
+    stop_replay_proxy()
+    WebDriverFactory.close_remote_connections()
+    if LOG_PIPELINE_KEY in config.stash:
+        config.stash[LOG_PIPELINE_KEY].stop()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Add the slowest page actions and per-locator timings to the HTML report."""
+    if ACTION_SUMMARY_KEY in session.config.stash:
+        postfix.append(render_summary_html(session.config.stash[ACTION_SUMMARY_KEY]))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """Tag the page actions recorded from now on with the running test."""
+    recorder.start_test(nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    recorder.finish_test()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def standin_server():
+    """Fixture to serve the local stand-in site as Config.APP_URL when Config.USE_STANDIN is set."""
+    if not Config.USE_STANDIN:
+        yield None
+        return
+
+    server = StandInServer().start()
+    live_url, Config.APP_URL = Config.APP_URL, server.url
+    yield server
+
+    Config.APP_URL = live_url
+    server.stop()
 
 
 @pytest.fixture(scope="session")
-def driver():
-    """Fixture to set up WebDriver and return it for test execution."""
-    driver = WebDriverFactory.get_driver()
-    logger.info("Browser started for test execution.")
+def driver_pool(request):
+    """Fixture to launch a pool of warm WebDrivers shared by the whole session."""
+    launcher = request.config.stash.get(POOL_LAUNCHER_KEY, None)
+    try:
+        pool = launcher.take() if launcher else DriverPool().start()
+    except Exception as error:
+        # Every test using a driver would fail the same way, stop after reporting this one
+        logger.exception("Could not start the browser pool.")
+        request.session.shouldstop = f"Could not start the browser pool: {error!r}"
+        raise
+    logger.info("Browser pool started for test execution.")
+    yield pool
+
+    pool.close()
+    logger.info("Browser pool closed after test execution.")
+
+
+def _lease_driver(driver_pool, node):
+    """Acquire a pooled driver with the blocklist of `node` applied, and release it after."""
+    driver = driver_pool.acquire()
+    # Blocklist of the test or module, e.g. @pytest.mark.block_requests(extension_groups=["image"])
+    marker = node.get_closest_marker("block_requests")
+    if marker:
+        apply_request_blocking(driver, *marker.args, **marker.kwargs)
     yield driver
 
-    driver.quit()
-    logger.info("Browser closed after test execution.")
+    if marker:
+        apply_request_blocking(driver)
+    driver_pool.release(driver)
+
+
+@pytest.fixture
+def driver(driver_pool, request):
+    """Fixture to hand out a clean pooled WebDriver for a single test."""
+    yield from _lease_driver(driver_pool, request.node)
+
+
+@pytest.fixture(scope="module")
+def module_driver(driver_pool, request):
+    """
+    Fixture to share one pooled WebDriver between all the tests of a module.
+
+    A module overrides `driver` with it, so that the failure artifacts hook finds the
+    driver under its usual name:
+
+        @pytest.fixture(scope="module")
+        def driver(module_driver):
+            return module_driver
+    """
+    yield from _lease_driver(driver_pool, request.node)
+
+
+@pytest.fixture(scope="session")
+def async_loop():
+    """Fixture providing the event loop of the async scenarios, shared by the whole session."""
+    loop = asyncio.new_event_loop()
+    yield loop
+
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture
+def async_scenarios(async_loop, request):
+    """
+    Fixture running async scenarios concurrently on one event loop across several browsers.
+
+    Usage: async_scenarios([scenario, ...], drivers=2) where each scenario is a coroutine
+    function taking an AsyncWebDriver; returns their results in order. The browsers block
+    the requests of the test's block_requests marker, like the pooled drivers.
+    """
+    marker = request.node.get_closest_marker("block_requests")
+    blocking = None
+    if marker:
+        blocking = inspect.signature(blocked_url_patterns).bind(
+            *marker.args, **marker.kwargs
+        ).arguments
+
+    def run(scenarios, drivers=None):
+        return async_loop.run_until_complete(
+            run_concurrently(scenarios, drivers, blocking=blocking)
+        )
+
+    return run
 
 
 def pytest_runtest_makereport(item, call):
-    """Capture screenshots and log errors on test failure."""
+    """
+    Capture screenshot, page source, console logs and URL on test failure.
+
+    Only the raw data is grabbed here, the artifacts are compressed and written and the
+    error is logged by the background ArtifactWriter. The page action summary of the test
+    is attached to its teardown report for the streamed report.
+    """
+    if call.when == "teardown":
+        actions = recorder.test_summary()
+        if actions:
+            item.user_properties.append(("actions", actions))
+        return
     if call.when == "call" and call.excinfo is not None:  # If test fails
         test_name = item.nodeid.split("::")[-1]  # Get test function name
+        writer = item.config.stash[ARTIFACT_WRITER_KEY]
         screenshot_dir = item.config.getoption("--screenshot-dir", None)
-        if screenshot_dir:
-            timestamp = time.strftime("%Y%m%d-%H%M%S")
-            screenshot_path = os.path.join(
-                screenshot_dir, f"{test_name}_{timestamp}.png"
-            )
-            logger.info(f"Capturing screenshot: {screenshot_path}")
-            driver = item.funcargs["driver"]  # Access WebDriver
-            driver.save_screenshot(screenshot_path)
-
-        # Capture exception and traceback
-        error_message = str(call.excinfo.value)  # Get error message
-        traceback_info = "".join(
-            traceback.format_exception(None, call.excinfo.value, call.excinfo.tb)
+        driver = item.funcargs.get("driver")  # Access WebDriver
+        if not screenshot_dir or driver is None:
+            writer.submit(None, test_name, excinfo=call.excinfo, nodeid=item.nodeid)
+            return
+
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        base_path = os.path.join(
+            screenshot_dir, f"{test_name}_{timestamp}{worker_suffix(item.config)}"
         )
+        try:
+            screenshot = driver.get_screenshot_as_png()
+            page_source = driver.page_source
+            url = driver.current_url
+        except WebDriverException:
+            logger.warning(f"Browser unavailable, no failure artifacts for {test_name}")
+            writer.submit(None, test_name, excinfo=call.excinfo, nodeid=item.nodeid)
+            return
+        try:
+            console_logs = driver.get_log("browser")
+        except (WebDriverException, AttributeError):
+            console_logs = None
 
-        # Log error details
-        logger.error(f"Test failed: {test_name}")
-        logger.error(f"Error message: {error_message}")
-        logger.error(f"Traceback:\n{traceback_info}")
+        logger.info(f"Capturing failure artifacts: {base_path}.*")
+        # Referenced by the streamed report, see utils/stream_report.py
+        item.user_properties.append(("artifacts", base_path))
+        writer.submit(
+            base_path,
+            test_name,
+            screenshot=screenshot,
+            page_source=page_source,
+            url=url,
+            console_logs=console_logs,
+            excinfo=call.excinfo,
+            nodeid=item.nodeid,
+        )
@@ -0,0 +1,215 @@
+"""
+Async base page class, the counterpart of BasePage for AsyncWebDriver.
+"""
+
+import asyncio
+import logging
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from config import Config
+from utils.dom_wait import (
+    SCRIPT_TIMEOUT_MARGIN,
+    SET_VALUES_JS,
+    WAIT_FOR_ELEMENTS_JS,
+    DomConditionsWait,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBasePage:
+    """
+    Base class for async page objects.
+
+    Every wait runs inside the page (the "observer" engine of BasePage), so waiting costs a
+    single awaited WebDriver command during which the event loop serves the other drivers.
+    """
+
+    # Element locators of the page, keyed by name
+    LOCATORS = {}
+
+    # LOCATORS key of an element that must be visible for the page to be ready
+    READY_LOCATOR = None
+
+    def __init__(self, driver, timeout=None):
+        """
+        Initialize the async base page.
+
+        Args:
+            driver (AsyncWebDriver): The async driver instance
+            timeout (int): Default timeout for waiting operations
+        """
+        self.driver = driver
+        self.timeout = timeout or Config.EXPLICIT_WAIT
+
+    async def navigate_to(self, url):
+        """Navigate to the specified URL and wait until the page is ready."""
+        await self.driver.get(url)
+        if self.READY_LOCATOR:
+            await self.wait_for_element_visible(self.LOCATORS[self.READY_LOCATOR])
+
+    async def wait_for_elements(self, specs, timeout=None):
+        """
+        Wait inside the page until every element of `specs` meets its condition.
+
+        Args:
+            specs (list): (locator, condition) pairs, condition being "present", "visible"
+                or "clickable"
+            timeout (int, optional): Custom timeout for this operation
+
+        Returns:
+            list: The found AsyncWebElements, in the order of `specs`
+
+        Raises:
+            TimeoutException: If the conditions are not all met within the timeout
+            JavascriptException: If the script fails for another reason than a navigation
+        """
+        timeout = timeout or self.timeout
+        wait = DomConditionsWait(specs, timeout, asyncio.get_running_loop().time)
+        await self.driver.set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+
+        while True:
+            args = wait.script_args()
+            if args is None:
+                raise wait.timeout_error()
+            try:
+                elements = await self.driver.execute_async_script(WAIT_FOR_ELEMENTS_JS, *args)
+            except WebDriverException as error:
+                if wait.retry_reason(error) == wait.RETRY_AFTER_NAVIGATION:
+                    await asyncio.sleep(wait.NAVIGATION_RETRY_DELAY)
+                else:
+                    await self.driver.set_script_timeout(
+                        timeout + SCRIPT_TIMEOUT_MARGIN, force=True
+                    )
+                continue
+            if elements:
+                return elements
+            raise wait.timeout_error()
+
+    async def wait_for_element_visible(self, locator):
+        """
+        Wait for an element to be visible.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+
+        Returns:
+            AsyncWebElement: The visible element
+
+        Raises:
+            TimeoutException: If the element is not visible within the timeout
+        """
+        return (await self.wait_for_elements([(locator, "visible")]))[0]
+
+    async def wait_for_element_clickable(self, locator):
+        """
+        Wait for an element to be clickable.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+
+        Returns:
+            AsyncWebElement: The clickable element
+
+        Raises:
+            TimeoutException: If the element is not clickable within the timeout
+        """
+        return (await self.wait_for_elements([(locator, "clickable")]))[0]
+
+    async def click_element(self, locator):
+        """
+        Click on an element once it is clickable.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+        """
+        element = await self.wait_for_element_clickable(locator)
+        await element.click()
+
+    async def fill_text_field(self, locator, text):
+        """
+        Clear and fill a text field.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+            text (str): Text to enter in the field
+        """
+        element = await self.wait_for_element_visible(locator)
+        await element.clear()
+        await element.send_keys(text)
+
+    async def fill_form(self, values, submit=None, fast_fill=False):
+        """
+        Fill several fields and optionally submit, like BasePage.fill_form.
+
+        Args:
+            values (dict): LOCATORS keys of the fields mapped to the text to enter
+            submit (str, optional): LOCATORS key of the element to click once filled
+            fast_fill (bool): Set the values with one script call instead of typing them
+        """
+        specs = [(self.LOCATORS[key], "visible") for key in values]
+        if submit:
+            specs.append((self.LOCATORS[submit], "clickable"))
+        if not specs:
+            return
+        elements = await self.wait_for_elements(specs)
+        fields = elements[: len(values)]
+        if fast_fill and fields:
+            await self.driver.execute_script(SET_VALUES_JS, fields, list(values.values()))
+        else:
+            for element, text in zip(fields, values.values()):
+                await element.clear()
+                await element.send_keys(text)
+        if submit:
+            await elements[-1].click()
+
+    async def get_element_text(self, locator):
+        """
+        Get the text of an element once it is visible.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+
+        Returns:
+            str: The text of the element
+        """
+        element = await self.wait_for_element_visible(locator)
+        return await element.text()
+
+    async def is_element_displayed(self, locator, timeout=None):
+        """
+        Check if an element is displayed.
+
+        Args:
+            locator (tuple): Element locator (By strategy, selector)
+            timeout (int, optional): Custom timeout for this operation
+
+        Returns:
+            bool: True if the element is displayed, False otherwise
+        """
+        try:
+            await self.wait_for_elements([(locator, "visible")], timeout)
+        except TimeoutException:
+            return False
+        return True
+
+    async def wait_for_url_contains(self, text, timeout=None):
+        """
+        Wait for the URL to contain specific text.
+
+        Args:
+            text (str): Text that should be in the URL
+            timeout (int, optional): Custom timeout for this operation
+
+        Returns:
+            bool: True if the URL contains the text, False otherwise
+        """
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while text not in await self.driver.current_url():
+            if loop.time() > deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
@@ -0,0 +1,37 @@
+from pages.async_base_page import AsyncBasePage
+from pages.canvas_accountpage import CanvasAccountPage
+
+
+class AsyncCanvasAccountPage(AsyncBasePage):
+    """
+    AsyncCanvasAccountPage class represents the account page of Canvas on an AsyncWebDriver.
+
+    It shares the locators and URL path of CanvasAccountPage.
+    """
+
+    LOCATORS = CanvasAccountPage.LOCATORS
+    READY_LOCATOR = CanvasAccountPage.READY_LOCATOR
+
+    CANVAS_ACCOUNT_URLPATH = CanvasAccountPage.CANVAS_ACCOUNT_URLPATH
+
+    async def click_canvas_network(self):
+        """
+        Clicks on the Canvas Network button once the account page is reached.
+        """
+        await self.wait_for_url_contains(self.CANVAS_ACCOUNT_URLPATH)
+        await self.click_element(self.LOCATORS["canvas_network_button"])
+
+    async def click_login_button(self, email=None, password=None):
+        """
+        Clicks the login button after optionally entering email and password.
+
+        Args:
+            email (str, optional): The email address to enter. Defaults to None.
+            password (str, optional): The password to enter. Defaults to None.
+        """
+        values = {}
+        if email:
+            values["email_textbox"] = email
+        if password:
+            values["password_textbox"] = password
+        await self.fill_form(values, submit="login_button")
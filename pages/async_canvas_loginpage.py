@@ -0,0 +1,25 @@
+from pages.async_base_page import AsyncBasePage
+from pages.canvas_loginpage import CanvasLoginPage
+
+
+class AsyncCanvasLoginPage(AsyncBasePage):
+    """
+    AsyncCanvasLoginPage class represents the login page for Canvas on an AsyncWebDriver.
+
+    It shares the locators and URL path of CanvasLoginPage.
+    """
+
+    LOCATORS = CanvasLoginPage.LOCATORS
+
+    CANVAS_LOGIN_URLPATH = CanvasLoginPage.CANVAS_LOGIN_URLPATH
+
+    async def get_flash_error_message(self):
+        """
+        Retrieves the flash error message displayed on the Canvas login page.
+
+        Returns:
+            str: The text of the flash error message.
+        """
+        await self.wait_for_url_contains(self.CANVAS_LOGIN_URLPATH)
+        message = await self.get_element_text(self.LOCATORS["flash_message"])
+        return message.strip()
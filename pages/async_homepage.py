@@ -0,0 +1,26 @@
+from pages.async_base_page import AsyncBasePage
+from pages.homepage import Homepage
+
+
+class AsyncHomepage(AsyncBasePage):
+    """
+    AsyncHomepage class represents the home page of the application on an AsyncWebDriver.
+
+    It shares the locators of Homepage.
+    """
+
+    LOCATORS = Homepage.LOCATORS
+    READY_LOCATOR = Homepage.READY_LOCATOR
+
+    async def click_login(self):
+        """
+        Clicks the login link on the homepage.
+        """
+        await self.click_element(self.LOCATORS["login_link"])
+
+    async def select_canvas_link(self):
+        """
+        Clicks the login link and then the Canvas link on the homepage.
+        """
+        await self.click_login()
+        await self.click_element(self.LOCATORS["canvas_link"])
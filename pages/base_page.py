@@ -2,7 +2,12 @@
 Base page class with common methods for all page objects.
 """
 
-from selenium.webdriver.support.ui import WebDriverWait
+import json
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
@@ -11,26 +16,149 @@ from selenium.common.exceptions import (
 )
 
 from config import Config
+from utils.dom_wait import (
+    CHECK_ELEMENT_JS,
+    SET_VALUES_JS,
+    dom_conditions_met,
+    wait_for_dom_condition,
+    wait_for_dom_conditions,
+    wait_for_network_idle,
+)
+from utils.instrumentation import CountingWait, instrumented, locator_name
+from utils.timeout_model import timeout_model
+
+logger = logging.getLogger(__name__)
+
+_STORAGE_DUMP_SCRIPT = """
+return {
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage),
+};
+"""
+
+_STORAGE_SEED_SCRIPT = """
+if (window.location.origin === %(origin)s) {
+    const state = %(state)s;
+    for (const [key, value] of Object.entries(state.local)) localStorage.setItem(key, value);
+    for (const [key, value] of Object.entries(state.session)) sessionStorage.setItem(key, value);
+}
+"""
+
+# Marks a checkpoint whose restore did not reproduce the page, see run_checkpointed()
+_UNUSABLE_CHECKPOINT = object()
+
+# Fields of a CDP Network.Cookie that are accepted back by Network.setCookies
+_CDP_COOKIE_FIELDS = (
+    "name",
+    "value",
+    "domain",
+    "path",
+    "secure",
+    "httpOnly",
+    "sameSite",
+    "expires",
+    "priority",
+    "sourceScheme",
+    "sourcePort",
+)
 
 
 class BasePage:
     """Base class for all page objects."""
 
-    def __init__(self, driver, timeout=None):
+    # Element locators of the page, keyed by name
+    LOCATORS = {}
+
+    # Browser state recorded after named journeys, shared by all pages of the process
+    _checkpoints = {}
+    _checkpoints_lock = threading.Lock()
+
+    # Wait engine used by this page: "polling" (WebDriverWait) or "observer" (in-page
+    # MutationObserver). None falls back to Config.WAIT_ENGINE.
+    WAIT_ENGINE = None
+
+    # What "ready" means for the page: the document.readyState to reach ("interactive" once
+    # the DOM is parsed, "complete" after the load event), an optional LOCATORS key of an
+    # element that must be visible, and an optional quiet network period in milliseconds.
+    READY_STATE = "interactive"
+    READY_LOCATOR = None
+    READY_NETWORK_IDLE_MS = None
+
+    # Reuse located elements while they are still attached to the document
+    CACHE_ELEMENTS = False
+
+    # Let fill_form() set the field values with a script instead of typing them. Faster, but
+    # no key events are fired, only input and change.
+    FAST_FILL = False
+
+    def __init__(self, driver, timeout=None, wait_engine=None, cache_elements=None):
         """
         Initialize the base page.
 
         Args:
             driver: WebDriver instance
             timeout (int): Default timeout for waiting operations
+            wait_engine (str, optional): "polling" or "observer", overrides WAIT_ENGINE
+            cache_elements (bool, optional): Overrides CACHE_ELEMENTS
         """
         self.driver = driver
         self.timeout = timeout or Config.EXPLICIT_WAIT
+        self.wait_engine = wait_engine or self.WAIT_ENGINE or Config.WAIT_ENGINE
+        if self.wait_engine not in ("polling", "observer"):
+            raise ValueError(f"Unsupported wait engine: {self.wait_engine}")
+        self.cache_elements = (
+            self.CACHE_ELEMENTS if cache_elements is None else cache_elements
+        )
+        self._element_cache = {}
 
+    def _cached_element(self, locator, condition):
+        """
+        Return the cached element of `locator` if it still meets `condition`.
+
+        A single script call checks the element: a detached element fails the check and a
+        stale reference raises, in both cases the entry is evicted and None is returned so
+        the caller resolves the locator again.
+        """
+        element = self._element_cache.get(locator)
+        if element is None:
+            return None
+        try:
+            if self.driver.execute_script(CHECK_ELEMENT_JS, element, condition):
+                return element
+        except StaleElementReferenceException:
+            pass
+        del self._element_cache[locator]
+        return None
+
+    def _remember_element(self, locator, element):
+        if self.cache_elements:
+            self._element_cache[locator] = element
+        return element
+
+    def clear_element_cache(self):
+        """Forget every cached element, e.g. after navigating away."""
+        self._element_cache.clear()
+
+    def _timeout_key(self, locator, condition):
+        """Key of a wait in the timeout model, e.g. "Homepage.login_link:visible"."""
+        name = locator_name(self, locator) if isinstance(locator, tuple) else locator
+        return f"{type(self).__name__}.{name}:{condition}"
+
+    @staticmethod
+    def _record_timeout(key, timeout, configured):
+        """Let the timeout model know a wait gave up early because of a learned timeout."""
+        if timeout < configured:
+            logger.warning(f"Wait {key} timed out after its learned timeout of {timeout:.1f}s")
+            timeout_model.record_timeout(key)
+
+    @instrumented
     def navigate_to(self, url):
-        """Navigate to the specified URL."""
+        """Navigate to the specified URL and wait until the page is ready."""
+        self.clear_element_cache()
         self.driver.get(url)
+        self.wait_until_ready()
 
+    @instrumented
     def wait_for_element_visible(self, locator):
         """
         Wait for an element to be visible.
@@ -44,13 +172,29 @@ class BasePage:
         Raises:
             TimeoutException: If the element is not visible within the timeout
         """
-        wait = WebDriverWait(
-            self.driver,
-            self.timeout,
-            ignored_exceptions=[StaleElementReferenceException],
-        )
-        return wait.until(EC.visibility_of_element_located(locator))
+        element = self._cached_element(locator, "visible")
+        if element is not None:
+            return element
+        key = self._timeout_key(locator, "visible")
+        timeout = timeout_model.timeout(key, self.timeout)
+        start = time.perf_counter()
+        try:
+            if self.wait_engine == "observer":
+                element = wait_for_dom_condition(self.driver, locator, "visible", timeout)
+            else:
+                wait = CountingWait(
+                    self.driver,
+                    timeout,
+                    ignored_exceptions=[StaleElementReferenceException],
+                )
+                element = wait.until(EC.visibility_of_element_located(locator))
+        except TimeoutException:
+            self._record_timeout(key, timeout, self.timeout)
+            raise
+        timeout_model.record(key, time.perf_counter() - start)
+        return self._remember_element(locator, element)
 
+    @instrumented
     def wait_for_element_clickable(self, locator):
         """
         Wait for an element to be clickable.
@@ -64,13 +208,29 @@ class BasePage:
         Raises:
             TimeoutException: If the element is not clickable within the timeout
         """
-        wait = WebDriverWait(
-            self.driver,
-            self.timeout,
-            ignored_exceptions=[StaleElementReferenceException],
-        )
-        return wait.until(EC.element_to_be_clickable(locator))
+        element = self._cached_element(locator, "clickable")
+        if element is not None:
+            return element
+        key = self._timeout_key(locator, "clickable")
+        timeout = timeout_model.timeout(key, self.timeout)
+        start = time.perf_counter()
+        try:
+            if self.wait_engine == "observer":
+                element = wait_for_dom_condition(self.driver, locator, "clickable", timeout)
+            else:
+                wait = CountingWait(
+                    self.driver,
+                    timeout,
+                    ignored_exceptions=[StaleElementReferenceException],
+                )
+                element = wait.until(EC.element_to_be_clickable(locator))
+        except TimeoutException:
+            self._record_timeout(key, timeout, self.timeout)
+            raise
+        timeout_model.record(key, time.perf_counter() - start)
+        return self._remember_element(locator, element)
 
+    @instrumented
     def click_element(self, locator):
         """
         Wait for an element to be clickable and then click it.
@@ -85,9 +245,16 @@ class BasePage:
             TimeoutException: If the element is not clickable within the timeout
         """
         web_element = self.wait_for_element_clickable(locator)
-        web_element.click()
+        try:
+            web_element.click()
+        except StaleElementReferenceException:
+            # The element was replaced between the check and the click, locate it again
+            self._element_cache.pop(locator, None)
+            web_element = self.wait_for_element_clickable(locator)
+            web_element.click()
         return web_element
 
+    @instrumented
     def fill_text_field(self, locator, text):
         """
         Fill a text field with the specified text.
@@ -103,10 +270,65 @@ class BasePage:
             TimeoutException: If the element is not visible within the timeout
         """
         element = self.wait_for_element_visible(locator)
-        element.clear()
+        try:
+            element.clear()
+        except StaleElementReferenceException:
+            # The element was replaced between the check and the typing, locate it again
+            self._element_cache.pop(locator, None)
+            element = self.wait_for_element_visible(locator)
+            element.clear()
         element.send_keys(text)
         return element
 
+    @instrumented
+    def fill_form(self, values, submit=None, fast_fill=None):
+        """
+        Fill several fields and optionally submit.
+
+        All fields (and the submit element) are waited for together: in a single in-page
+        wait with the "observer" wait engine, and with one script call per poll with the
+        "polling" engine. The text is typed with clear()/send_keys() unless fast fill is
+        enabled, which sets all the values with one script call and only fires input and
+        change events.
+
+        Args:
+            values (dict): LOCATORS keys of the fields mapped to the text to enter
+            submit (str, optional): LOCATORS key of the element to click once filled
+            fast_fill (bool, optional): Overrides FAST_FILL
+
+        Returns:
+            list: The field elements, followed by the submit element if any
+
+        Raises:
+            TimeoutException: If the elements are not ready within the timeout
+        """
+        fast_fill = self.FAST_FILL if fast_fill is None else fast_fill
+        specs = [(self.LOCATORS[key], "visible") for key in values]
+        if submit:
+            specs.append((self.LOCATORS[submit], "clickable"))
+        if self.wait_engine == "observer":
+            elements = wait_for_dom_conditions(self.driver, specs, self.timeout)
+        else:
+            wait = CountingWait(
+                self.driver,
+                self.timeout,
+                ignored_exceptions=[StaleElementReferenceException],
+            )
+            elements = wait.until(dom_conditions_met(specs))
+
+        fields = elements[: len(values)]
+        if fast_fill and fields:
+            self.driver.execute_script(SET_VALUES_JS, fields, list(values.values()))
+        else:
+            for element, text in zip(fields, values.values()):
+                element.clear()
+                element.send_keys(text)
+
+        if submit:
+            elements[-1].click()
+        return elements
+
+    @instrumented
     def get_element_text(self, locator):
         """
         Get the text of an element.
@@ -123,10 +345,15 @@ class BasePage:
         element = self.wait_for_element_visible(locator)
         return element.text
 
+    @instrumented
     def is_element_displayed(self, locator, timeout=None):
         """
         Check if an element is displayed.
 
+        A negative check waits for the whole timeout, so without a custom timeout it uses
+        the learned timeout of the element, or Config.NEGATIVE_CHECK_TIMEOUT when there is
+        no history yet (see utils/timeout_model.py).
+
         Args:
             locator (tuple): Element locator (By strategy, selector)
             timeout (int, optional): Custom timeout for this operation
@@ -134,17 +361,35 @@ class BasePage:
         Returns:
             bool: True if the element is displayed, False otherwise
         """
-        timeout = timeout if timeout is not None else self.timeout
+        key = self._timeout_key(locator, "visible")
+        if timeout is None:
+            timeout = self.timeout
+            if Config.ADAPTIVE_TIMEOUTS:
+                learned = timeout_model.learned_timeout(key)
+                timeout = min(timeout, learned or Config.NEGATIVE_CHECK_TIMEOUT)
+        start = time.perf_counter()
         try:
-            wait = WebDriverWait(
-                self.driver,
-                timeout,
-                ignored_exceptions=[StaleElementReferenceException],
-            )
-            return wait.until(EC.visibility_of_element_located(locator)).is_displayed()
+            if self.wait_engine == "observer":
+                # Visibility was already checked in the page, no need for another round-trip
+                displayed = bool(
+                    wait_for_dom_condition(self.driver, locator, "visible", timeout)
+                )
+            else:
+                wait = CountingWait(
+                    self.driver,
+                    timeout,
+                    ignored_exceptions=[StaleElementReferenceException],
+                )
+                displayed = wait.until(
+                    EC.visibility_of_element_located(locator)
+                ).is_displayed()
         except (TimeoutException, NoSuchElementException):
             return False
+        if displayed:
+            timeout_model.record(key, time.perf_counter() - start)
+        return displayed
 
+    @instrumented
     def wait_for_url_contains(self, text, timeout=None):
         """
         Wait for the URL to contain specific text.
@@ -156,27 +401,194 @@ class BasePage:
         Returns:
             bool: True if the URL contains the text, False otherwise
         """
-        timeout = timeout if timeout is not None else self.timeout
+        key = self._timeout_key(f"url~{text}", "loaded")
+        learned = timeout is None
+        if learned:
+            timeout = timeout_model.timeout(key, self.timeout)
+        start = time.perf_counter()
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            return wait.until(EC.url_contains(text))
+            wait = CountingWait(self.driver, timeout)
+            result = wait.until(EC.url_contains(text))
         except TimeoutException:
+            if learned:
+                self._record_timeout(key, timeout, self.timeout)
             return False
+        timeout_model.record(key, time.perf_counter() - start)
+        return result
 
+    @instrumented
     def wait_for_page_load(self, timeout=None):
-        """Wait for the page to fully load based on document.readyState."""
+        """Wait for the document to reach the page's READY_STATE."""
         timeout = timeout or Config.IMPLICIT_PAGE_TIMEOUT
-        wait = WebDriverWait(self.driver, timeout)
+        if self.READY_STATE == "interactive":
+            states = ("interactive", "complete")
+        else:
+            states = ("complete",)
+        wait = CountingWait(self.driver, timeout)
         wait.until(
             lambda driver: driver.execute_script("return document.readyState")
-            == "complete"
+            in states
         )
 
+    @instrumented
+    def wait_until_ready(self, timeout=None):
+        """
+        Wait until the page is usable as declared by READY_STATE, READY_NETWORK_IDLE_MS
+        and READY_LOCATOR.
+
+        Args:
+            timeout (int, optional): Custom timeout for the page load and network idle waits
+
+        Raises:
+            TimeoutException: If the page does not become ready within the timeout
+        """
+        key = self._timeout_key("page", "ready")
+        learned = not timeout
+        if learned:
+            timeout = timeout_model.timeout(key, Config.IMPLICIT_PAGE_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            self.wait_for_page_load(timeout)
+            if self.READY_NETWORK_IDLE_MS:
+                wait_for_network_idle(self.driver, self.READY_NETWORK_IDLE_MS, timeout)
+        except TimeoutException:
+            if learned:
+                self._record_timeout(key, timeout, Config.IMPLICIT_PAGE_TIMEOUT)
+            raise
+        timeout_model.record(key, time.perf_counter() - start)
+        if self.READY_LOCATOR:
+            self.wait_for_element_visible(self.LOCATORS[self.READY_LOCATOR])
+
+    @instrumented
     def scroll_to_element(self, locator):
         """Scroll element into view"""
+        # The wait already guarantees the element is displayed
         web_element = self.wait_for_element_visible(locator)
-        if web_element.is_displayed():
+        self.driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'end'});", web_element
+        )
+        return web_element
+
+    def capture_state(self):
+        """
+        Capture the browser state reached so far.
+
+        Returns:
+            dict: The current URL, cookies, localStorage and sessionStorage.
+        """
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            cookies = [
+                {
+                    field: cookie[field]
+                    for field in _CDP_COOKIE_FIELDS
+                    if field in cookie and not (field == "expires" and cookie.get("session"))
+                }
+                for cookie in self.driver.execute_cdp_cmd("Network.getAllCookies", {})[
+                    "cookies"
+                ]
+            ]
+        else:
+            cookies = self.driver.get_cookies()
+        storage = self.driver.execute_script(_STORAGE_DUMP_SCRIPT)
+        return {
+            "url": self.driver.current_url,
+            "cookies": cookies,
+            "local_storage": storage["local"],
+            "session_storage": storage["session"],
+        }
+
+    def restore_state(self, state):
+        """
+        Restore a state returned by capture_state() with a single page load where possible.
+
+        Args:
+            state (dict): The state to restore.
+        """
+        self.clear_element_cache()
+        url = state["url"]
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        has_storage = state["local_storage"] or state["session_storage"]
+
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            # Cookies and storage can only be set from a document of the same origin
+            self.driver.get(origin)
+            for cookie in state["cookies"]:
+                self.driver.add_cookie(cookie)
             self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'end'});", web_element
+                _STORAGE_SEED_SCRIPT
+                % {"origin": "window.location.origin", "state": "arguments[0]"},
+                {"local": state["local_storage"], "session": state["session_storage"]},
             )
-        return web_element
+            self.driver.get(url)
+            return
+
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": state["cookies"]})
+        script_id = None
+        if has_storage:
+            source = _STORAGE_SEED_SCRIPT % {
+                "origin": json.dumps(origin),
+                "state": json.dumps(
+                    {"local": state["local_storage"], "session": state["session_storage"]}
+                ),
+            }
+            script_id = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )["identifier"]
+        try:
+            self.driver.get(url)
+        finally:
+            if script_id is not None:
+                self.driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id}
+                )
+
+    def run_checkpointed(self, name, journey, ready_locator=None, resume=None):
+        """
+        Run a navigation journey once per session and restore its end state afterwards.
+
+        The first call runs the journey and records the reached state under `name`. Later
+        calls restore that state directly and check that `ready_locator` is displayed. A
+        checkpoint that fails this check is not used again for the rest of the session, so
+        only one test pays for the restore before falling back to the journey.
+
+        The URL, cookies and storage do not capture client-side state such as the selected
+        tab of a page. `resume` performs those steps: it runs after the journey, once its
+        state is recorded, and after every restore.
+
+        Args:
+            name (str): Name of the checkpoint.
+            journey (callable): Performs the navigation steps when no usable checkpoint exists.
+            ready_locator (tuple, optional): Element locator proving the state was restored.
+            resume (callable, optional): Client-side steps replayed on top of the state.
+
+        Returns:
+            bool: True if the checkpoint was restored, False if the journey was run.
+        """
+        state = self._checkpoints.get(name)
+        if state is not None and state is not _UNUSABLE_CHECKPOINT:
+            self.restore_state(state)
+            try:
+                if resume:
+                    resume()
+                restored = ready_locator is None or self.is_element_displayed(
+                    ready_locator, timeout=Config.CHECKPOINT_VERIFY_TIMEOUT
+                )
+            except TimeoutException:
+                restored = False
+            if restored:
+                logger.info(f"Restored checkpoint '{name}'")
+                return True
+            logger.warning(f"Checkpoint '{name}' did not restore the page, no longer using it")
+            with self._checkpoints_lock:
+                self._checkpoints[name] = _UNUSABLE_CHECKPOINT
+
+        journey()
+        if name not in self._checkpoints:
+            state = self.capture_state()
+            with self._checkpoints_lock:
+                self._checkpoints[name] = state
+            logger.info(f"Recorded checkpoint '{name}' at {state['url']}")
+        if resume:
+            resume()
+        return False
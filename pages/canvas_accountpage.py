@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.homepage import Homepage
 
 
 class CanvasAccountPage(BasePage):
@@ -15,8 +16,16 @@ class CanvasAccountPage(BasePage):
         "login_button": (By.ID, "edit-submit--2"),
     }
 
+    # The account page is reached by a click, click_canvas_network() waits for it to be ready
+    READY_LOCATOR = "canvas_network_button"
+
+    # The Canvas Network button is scrolled to and then clicked
+    CACHE_ELEMENTS = True
+
     CANVAS_ACCOUNT_URLPATH = "/canvas/login"
 
+    LOGIN_FORM_CHECKPOINT = "canvas_network_login_form"
+
     def __init__(self, driver, timeout=None):
         """
         Initializes the CanvasAccountPage.
@@ -32,13 +41,50 @@ class CanvasAccountPage(BasePage):
         """
         Clicks on the Canvas Network button on the account page.
 
-        This method waits until the URL contains the specified Canvas account URL path,
-        then clicks on the Canvas Network button using the locator defined in the LOCATORS dictionary.
+        This method waits until the URL contains the specified Canvas account URL path and the
+        page is ready (READY_LOCATOR, the Canvas Network button, is displayed), then clicks on
+        the Canvas Network button using the locator defined in the LOCATORS dictionary.
         """
         self.wait_for_url_contains(self.CANVAS_ACCOUNT_URLPATH)
+        self.wait_until_ready()
         self.scroll_to_element(self.LOCATORS["canvas_network_button"])
         self.click_element(self.LOCATORS["canvas_network_button"])
 
+    def open_login_form(self, app_url):
+        """
+        Opens the Canvas Network login form starting from the application homepage.
+
+        The navigation (homepage -> Canvas link) only runs once per session, later calls
+        restore the recorded checkpoint instead. The Canvas Network tab is selected in the
+        page, so it is clicked again after every restore.
+
+        Args:
+            app_url (str): The URL of the application homepage.
+
+        Returns:
+            bool: True if the account page was restored from its checkpoint.
+        """
+
+        def journey():
+            home_page = Homepage(self.driver, self.timeout)
+            home_page.navigate_to(app_url)
+            home_page.select_canvas_link()
+            self.wait_for_url_contains(self.CANVAS_ACCOUNT_URLPATH)
+
+        return self.run_checkpointed(
+            self.LOGIN_FORM_CHECKPOINT,
+            journey,
+            self.LOCATORS["email_textbox"],
+            resume=self.click_canvas_network,
+        )
+
+    def reset_login_form(self):
+        """
+        Resets the login form to its initial values without reloading the page.
+        """
+        email_textbox = self.wait_for_element_visible(self.LOCATORS["email_textbox"])
+        self.driver.execute_script("arguments[0].form.reset();", email_textbox)
+
     def enter_email(self, email):
         """
         Enters the provided email into the email text field.
@@ -68,8 +114,9 @@ class CanvasAccountPage(BasePage):
         Returns:
             None
         """
+        values = {}
         if email:
-            self.enter_email(email)
+            values["email_textbox"] = email
         if password:
-            self.enter_password(password)
-        self.click_element(self.LOCATORS["login_button"])
+            values["password_textbox"] = password
+        self.fill_form(values, submit="login_button")
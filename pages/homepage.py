@@ -26,6 +26,9 @@ class Homepage(BasePage):
         "canvas_link": (By.XPATH, "//a[contains(text(),'Canvas')]"),
     }
 
+    # The homepage is usable as soon as the login menu is displayed
+    READY_LOCATOR = "login_link"
+
     def __init__(self, driver, timeout=None):
         """
         Initialize the home page.
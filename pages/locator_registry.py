@@ -0,0 +1,331 @@
+"""
+Central registry of the LOCATORS of all page objects.
+
+The registry is built and validated at import time, so a malformed locator fails the test
+collection instead of surfacing as a timeout in the middle of a run. Locators using slow
+strategies (XPath, link text) are flagged, with a CSS equivalent when one can be derived.
+
+Run the benchmark against saved page snapshots (the stand-in pages by default) to measure
+how long driver.find_element takes for each locator, WebDriver round-trip included, and get
+CSS suggestions:
+
+    python -m pages.locator_registry benchmark [--snapshot page.html ...] [--repeat 200]
+"""
+
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from pages.canvas_accountpage import CanvasAccountPage
+from pages.canvas_loginpage import CanvasLoginPage
+from pages.homepage import Homepage
+
+PAGE_CLASSES = (Homepage, CanvasAccountPage, CanvasLoginPage)
+
+STRATEGIES = {
+    By.ID,
+    By.XPATH,
+    By.LINK_TEXT,
+    By.PARTIAL_LINK_TEXT,
+    By.NAME,
+    By.TAG_NAME,
+    By.CLASS_NAME,
+    By.CSS_SELECTOR,
+}
+
+# Strategies evaluated by walking the document in script instead of a native CSS lookup
+SLOW_STRATEGIES = {By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT}
+
+DEFAULT_SNAPSHOTS = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "utils", "standin_site", "*.html"
+)
+
+_XPATH_STEP = re.compile(
+    r"(?P<axis>//?)(?P<tag>[A-Za-z][\w-]*|\*)"
+    r"(?P<predicates>(?:\[(?:@[\w-]+=(?:'[^']*'|\"[^\"]*\")|\d+)\])*)"
+)
+_XPATH_PREDICATE = re.compile(
+    r"\[(?:@(?P<attr>[\w-]+)=(?:'(?P<sq>[^']*)'|\"(?P<dq>[^\"]*)\")|(?P<index>\d+))\]"
+)
+
+
+class LocatorError(ValueError):
+    """Raised when a page object declares an invalid locator."""
+
+
+def _balanced(selector):
+    """Check that brackets, parentheses and quotes of a selector are balanced."""
+    pairs = {")": "(", "]": "["}
+    stack = []
+    quote = None
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            stack.append(char)
+        elif char in pairs:
+            if not stack or stack.pop() != pairs[char]:
+                return False
+    return not stack and quote is None
+
+
+def validate_locator(name, locator):
+    """
+    Validate a single locator.
+
+    Args:
+        name (str): Qualified name of the locator, e.g. "Homepage.login_link".
+        locator (tuple): Element locator (By strategy, selector).
+
+    Raises:
+        LocatorError: If the locator is malformed.
+    """
+    if not isinstance(locator, tuple) or len(locator) != 2:
+        raise LocatorError(f"{name}: locator must be a (By strategy, selector) tuple")
+    strategy, selector = locator
+    if strategy not in STRATEGIES:
+        raise LocatorError(f"{name}: unknown locator strategy {strategy!r}")
+    if not isinstance(selector, str) or not selector.strip():
+        raise LocatorError(f"{name}: empty selector")
+    if strategy in (By.XPATH, By.CSS_SELECTOR) and not _balanced(selector):
+        raise LocatorError(f"{name}: unbalanced brackets or quotes in {selector!r}")
+    if strategy == By.XPATH and not selector.startswith(("/", "(", ".")):
+        raise LocatorError(f"{name}: XPath must start with '/', '(' or '.': {selector!r}")
+
+
+def _css_identifier(value):
+    """Return `value` if it is a valid CSS identifier, None if it needs to be quoted."""
+    if re.fullmatch(r"-?[A-Za-z_][\w-]*", value):
+        return value
+    return None
+
+
+def _xpath_to_css(selector):
+    """Translate simple XPath expressions (tags, @attr='value' and [n] predicates) to CSS."""
+    position = 0
+    parts = []
+    while position < len(selector):
+        step = _XPATH_STEP.match(selector, position)
+        if not step:
+            return None
+        css = "" if step.group("tag") == "*" else step.group("tag")
+        for predicate in _XPATH_PREDICATE.finditer(step.group("predicates")):
+            if predicate.group("index"):
+                css += f":nth-of-type({predicate.group('index')})"
+                continue
+            attr = predicate.group("attr")
+            value = predicate.group("sq")
+            if value is None:
+                value = predicate.group("dq")
+            if attr == "id" and _css_identifier(value):
+                css += f"#{value}"
+            else:
+                css += f'[{attr}="{value}"]'
+        if not css:
+            css = "*"
+        if parts:
+            parts.append(" > " if step.group("axis") == "/" else " ")
+        elif step.group("axis") == "/":
+            # An absolute path starts at the root element
+            css += ":root"
+        parts.append(css)
+        position = step.end()
+    return "".join(parts)
+
+
+def suggest_css(locator):
+    """
+    Derive an equivalent CSS selector from a locator without looking at the page.
+
+    Args:
+        locator (tuple): Element locator (By strategy, selector).
+
+    Returns:
+        str: The CSS selector, or None if it depends on text content or is too complex.
+    """
+    strategy, selector = locator
+    if strategy == By.ID:
+        identifier = _css_identifier(selector)
+        return f"#{identifier}" if identifier else f'[id="{selector}"]'
+    if strategy == By.NAME:
+        return f'[name="{selector}"]'
+    if strategy == By.CLASS_NAME:
+        return f".{selector}"
+    if strategy == By.TAG_NAME:
+        return selector
+    if strategy == By.XPATH:
+        return _xpath_to_css(selector)
+    return None
+
+
+def build_registry(page_classes=PAGE_CLASSES):
+    """
+    Collect and validate the LOCATORS of all page classes.
+
+    Returns:
+        dict: Locators keyed by qualified name, e.g. "Homepage.login_link".
+
+    Raises:
+        LocatorError: If a locator is malformed.
+    """
+    registry = {}
+    for page_class in page_classes:
+        for key, locator in page_class.LOCATORS.items():
+            name = f"{page_class.__name__}.{key}"
+            validate_locator(name, locator)
+            registry[name] = locator
+        ready_locator = getattr(page_class, "READY_LOCATOR", None)
+        if ready_locator and ready_locator not in page_class.LOCATORS:
+            raise LocatorError(
+                f"{page_class.__name__}.READY_LOCATOR: unknown LOCATORS key {ready_locator!r}"
+            )
+    return registry
+
+
+def slow_locators(registry):
+    """
+    List the locators using a slow strategy.
+
+    Returns:
+        list: (name, locator, suggested CSS or None) tuples.
+    """
+    return [
+        (name, locator, suggest_css(locator))
+        for name, locator in registry.items()
+        if locator[0] in SLOW_STRATEGIES
+    ]
+
+
+LOCATOR_REGISTRY = build_registry()
+
+
+# Derives a unique CSS selector for an element: its id, its href, or its position
+_UNIQUE_CSS_JS = """
+const element = arguments[0];
+function unique(css) {
+    return document.querySelector(css) === element;
+}
+if (element.id && unique(`#${CSS.escape(element.id)}`)) {
+    return `#${CSS.escape(element.id)}`;
+}
+if (element.getAttribute("href") && unique(`a[href="${element.getAttribute("href")}"]`)) {
+    return `a[href="${element.getAttribute("href")}"]`;
+}
+const path = [];
+for (let node = element; node && node !== document.documentElement; node = node.parentElement) {
+    const tag = node.tagName.toLowerCase();
+    const index = Array.from(node.parentElement.children)
+        .filter((sibling) => sibling.tagName === node.tagName)
+        .indexOf(node) + 1;
+    path.unshift(`${tag}:nth-of-type(${index})`);
+    if (unique(path.join(" > "))) break;
+}
+return path.join(" > ");
+"""
+
+
+def _time_find_element(driver, locator, repeat):
+    """
+    Time driver.find_element for a locator.
+
+    Returns:
+        tuple: (WebElement, median milliseconds per lookup), or (None, None) if nothing matches
+               or the selector is invalid.
+    """
+    try:
+        element = driver.find_element(*locator)
+    except (NoSuchElementException, InvalidSelectorException):
+        return None, None
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        driver.find_element(*locator)
+        timings.append((time.perf_counter() - start) * 1000)
+    return element, statistics.median(timings)
+
+
+def benchmark(snapshots, repeat=200, driver=None):
+    """
+    Measure how long WebDriver's find_element takes for each registered locator in saved
+    page snapshots, i.e. what a test pays for a lookup, round-trip included.
+
+    Args:
+        snapshots (list): Paths of HTML page snapshots.
+        repeat (int): Lookups per locator and snapshot.
+        driver (WebDriver, optional): Driver to use, a new one is started by default.
+
+    Returns:
+        list: Dicts with the locator name, snapshot, median milliseconds per lookup, and
+              for slow strategies a CSS selector matching the same element with its timing.
+    """
+    from utils.webdriver_factory import WebDriverFactory
+
+    own_driver = driver is None
+    driver = driver or WebDriverFactory.get_driver()
+    results = []
+    try:
+        for snapshot in snapshots:
+            driver.get(f"file://{os.path.abspath(snapshot)}")
+            for name, locator in LOCATOR_REGISTRY.items():
+                element, ms = _time_find_element(driver, locator, repeat)
+                if element is None:
+                    continue
+                result = {
+                    "locator": name,
+                    "snapshot": os.path.basename(snapshot),
+                    "ms": ms,
+                    "suggestion": None,
+                    "suggestion_ms": None,
+                }
+                if locator[0] in SLOW_STRATEGIES:
+                    css = suggest_css(locator) or driver.execute_script(_UNIQUE_CSS_JS, element)
+                    css_element, css_ms = _time_find_element(
+                        driver, (By.CSS_SELECTOR, css), repeat
+                    )
+                    if css_element == element:
+                        result["suggestion"] = css
+                        result["suggestion_ms"] = css_ms
+                results.append(result)
+    finally:
+        if own_driver:
+            driver.quit()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("validate", help="validate all locators and list slow ones")
+    bench = subparsers.add_parser("benchmark", help="time locators against page snapshots")
+    bench.add_argument("--snapshot", action="append", help="HTML page snapshot (repeatable)")
+    bench.add_argument("--repeat", type=int, default=200, help="lookups per locator")
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        print(f"{len(LOCATOR_REGISTRY)} locators are valid.")
+        for name, (strategy, selector), css in slow_locators(LOCATOR_REGISTRY):
+            hint = f" -> css: {css}" if css else " (run the benchmark for a CSS suggestion)"
+            print(f"SLOW {name}: {strategy}={selector!r}{hint}")
+        return 0
+
+    snapshots = args.snapshot or sorted(glob.glob(DEFAULT_SNAPSHOTS))
+    for result in benchmark(snapshots, args.repeat):
+        line = f"{result['snapshot']:<24} {result['locator']:<40} {result['ms']:.4f} ms"
+        if result["suggestion"]:
+            line += f"  -> css {result['suggestion']!r}: {result['suggestion_ms']:.4f} ms"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+In-memory browser behind a real Selenium Remote WebDriver, for tests that need no Chrome.
+
+FakeBrowser plays the command executor of selenium.webdriver.Remote: every command goes
+through Selenium's own WebDriver.execute (and so through count_commands() of
+utils/instrumentation.py, for counted drivers) and is answered here. Elements are located by id; the scripts of
+utils/dom_wait.py are answered as if every known element met its condition.
+"""
+
+import itertools
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class FakeBrowser:
+    """Command executor answering WebDriver commands from memory."""
+
+    def __init__(self, element_ids=()):
+        """
+        Initialize the browser.
+
+        Args:
+            element_ids (iterable): Ids of the elements present in the page.
+        """
+        self.element_ids = set(element_ids)
+        self.commands = []
+        self.values = {}
+        self.clicks = []
+        self.window_handles = ["window-0"]
+        self.current_window = "window-0"
+        # URL of each window
+        self.urls = {"window-0": "about:blank"}
+        # (window, URL) of every driver.get()
+        self.navigations = []
+        self._window_ids = itertools.count(1)
+
+    @property
+    def url(self):
+        """URL of the focused window."""
+        return self.urls[self.current_window]
+
+    def driver(self):
+        """Return a Selenium Remote WebDriver talking to this browser."""
+        return RemoteWebDriver(command_executor=self)
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        handler = getattr(self, f"_{command}", None)
+        value = handler(params) if handler else None
+        if isinstance(value, dict) and "error" in value:
+            return {"status": value["error"], "message": value["message"], "value": value}
+        return {"status": 0, "value": value}
+
+    def close(self):
+        """Called by WebDriver.quit(), like RemoteConnection.close()."""
+
+    def count(self, command):
+        return self.commands.count(command)
+
+    def _element(self, strategy, selector):
+        if strategy == By.ID:
+            element_id = selector
+        elif strategy == By.CSS_SELECTOR and selector.startswith('[id="'):
+            element_id = selector[5:-2]
+        else:
+            element_id = None
+        if element_id in self.element_ids:
+            return {ELEMENT_KEY: element_id}
+        return None
+
+    def _newSession(self, params):
+        return {"sessionId": "fake-session", "capabilities": {"browserName": "fake"}}
+
+    def _findElement(self, params):
+        element = self._element(params["using"], params["value"])
+        if element is None:
+            return {"error": "no such element", "message": params["value"]}
+        return element
+
+    def execute_dom_script(self, script, args):
+        """Answer a script of utils/dom_wait.py, or the isDisplayed atom, with every element met."""
+        if "meetsCondition" not in script or isinstance(args[0], dict):
+            # isDisplayed atom, or CHECK_ELEMENT_JS on an already located element
+            return True
+        if isinstance(args[0][0], str):
+            # A single [strategy, selector, condition] spec
+            return self._element(*args[0][:2])
+        elements = [self._element(strategy, selector) for strategy, selector, _ in args[0]]
+        return None if None in elements else elements
+
+    def _w3cExecuteScript(self, params):
+        return self.execute_dom_script(params["script"], params["args"])
+
+    def _w3cExecuteScriptAsync(self, params):
+        return self.execute_dom_script(params["script"], params["args"])
+
+    def _isElementEnabled(self, params):
+        return True
+
+    def _clearElement(self, params):
+        self.values[params["id"]] = ""
+
+    def _sendKeysToElement(self, params):
+        self.values[params["id"]] = self.values.get(params["id"], "") + params["text"]
+
+    def _clickElement(self, params):
+        self.clicks.append(params["id"])
+
+    def _get(self, params):
+        self.urls[self.current_window] = params["url"]
+        self.navigations.append((self.current_window, params["url"]))
+
+    def _getCurrentUrl(self, params):
+        return self.url
+
+    def _w3cGetCurrentWindowHandle(self, params):
+        return self.current_window
+
+    def _w3cGetWindowHandles(self, params):
+        return list(self.window_handles)
+
+    def _switchToWindow(self, params):
+        if params["handle"] not in self.window_handles:
+            return {"error": "no such window", "message": params["handle"]}
+        self.current_window = params["handle"]
+
+    def _newWindow(self, params):
+        handle = f"window-{next(self._window_ids)}"
+        self.window_handles.append(handle)
+        self.urls[handle] = "about:blank"
+        return {"handle": handle, "type": "tab"}
+
+    def _close(self, params):
+        self.window_handles.remove(self.current_window)
+        return list(self.window_handles)
@@ -0,0 +1,109 @@
+import gzip
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from utils.artifact_writer import ArtifactWriter
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def writer():
+    """Fixture to provide an artifact writer, closed after the test."""
+    artifact_writer = ArtifactWriter(max_pending=4)
+    yield artifact_writer
+
+    artifact_writer.close()
+
+
+def test_artifacts_are_written_in_the_background(writer, tmp_path):
+    """
+    Test that the artifacts of a failure are compressed and written by the writer thread.
+
+    Assertions:
+    - The screenshot is written as-is, the page source and details are gzipped.
+    - The details carry the URL, console logs and error message.
+    """
+    with pytest.raises(AssertionError) as excinfo:
+        assert False, "login failed"
+    base_path = str(tmp_path / "test_login")
+
+    assert writer.submit(
+        base_path,
+        "test_login",
+        screenshot=b"\x89PNG",
+        page_source="<html></html>",
+        url="https://www.example.com/login",
+        console_logs=[{"level": "SEVERE"}],
+        excinfo=excinfo,
+        nodeid="tests/test_login.py::test_login",
+    )
+    writer.flush()
+
+    assert (tmp_path / "test_login.png").read_bytes() == b"\x89PNG"
+    with gzip.open(f"{base_path}.html.gz", "rt", encoding="utf-8") as html_file:
+        assert html_file.read() == "<html></html>"
+    with gzip.open(f"{base_path}.json.gz", "rt", encoding="utf-8") as json_file:
+        details = json.load(json_file)
+    assert details["url"] == "https://www.example.com/login"
+    assert details["console"] == [{"level": "SEVERE"}]
+    assert "login failed" in details["error"]
+    assert writer.errors == []
+
+
+def test_failures_are_dropped_when_the_queue_is_full(monkeypatch, tmp_path):
+    """
+    Test that submit() never blocks the test thread, dropping artifacts when the queue is full.
+
+    Steps:
+    1. Block the writer thread on the first failure.
+    2. Submit more failures than the queue holds.
+
+    Assertions:
+    - The failures beyond the queue size are dropped and reported as such.
+    - The queued ones are written once the thread is unblocked.
+    """
+    unblock = threading.Event()
+    written = []
+
+    def slow_write(base_path, test_name, *args):
+        unblock.wait(5)
+        written.append(test_name)
+
+    monkeypatch.setattr(ArtifactWriter, "_write", staticmethod(slow_write))
+    writer = ArtifactWriter(max_pending=1)
+    try:
+        accepted = [writer.submit(str(tmp_path / "first"), "first")]
+        # Wait for the thread to take the first job, so that the queue is empty
+        while not writer._queue.empty():
+            time.sleep(0.01)
+        accepted += [writer.submit(str(tmp_path / name), name) for name in ("second", "third")]
+        unblock.set()
+        writer.flush()
+    finally:
+        unblock.set()
+        writer.close()
+
+    logger.info(f"Accepted: {accepted}, written: {written}")
+    assert accepted == [True, True, False]
+    assert written == ["first", "second"]
+
+
+def test_write_errors_are_kept_and_do_not_stop_the_writer(writer, tmp_path):
+    """
+    Test that an artifact that cannot be written is reported and the next ones still are.
+
+    Assertions:
+    - The error is kept with the test name.
+    - The artifacts of the next failure are written.
+    """
+    writer.submit(str(tmp_path / "missing" / "broken"), "broken", screenshot=b"png")
+    writer.submit(str(tmp_path / "next"), "next", screenshot=b"png")
+    writer.flush()
+
+    assert [test_name for test_name, _ in writer.errors] == ["broken"]
+    assert (tmp_path / "next.png").exists()
@@ -0,0 +1,73 @@
+import logging
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import chromedriver_resolver
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def fake_chromedriver(tmp_path, monkeypatch):
+    """Fixture to make a fake chromedriver for Chrome 120 the only one found on PATH."""
+    binary = tmp_path / "bin" / chromedriver_resolver.DRIVER_NAME
+    binary.parent.mkdir()
+    binary.write_text("#!/bin/sh\necho 'ChromeDriver 120.0.6099.109'\n")
+    binary.chmod(binary.stat().st_mode | stat.S_IXUSR)
+
+    monkeypatch.setattr(chromedriver_resolver.Config, "CHROMEDRIVER_PATH", None)
+    monkeypatch.setattr(chromedriver_resolver.Config, "DRIVER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(chromedriver_resolver, "detect_chrome_major_version", lambda: 120)
+    monkeypatch.setattr(chromedriver_resolver.shutil, "which", lambda name: str(binary))
+    monkeypatch.setattr(chromedriver_resolver, "_resolved_path", None)
+    return binary
+
+
+def test_concurrent_first_calls_resolve_once(fake_chromedriver, monkeypatch):
+    """
+    Test that drivers launched concurrently on a cold cache resolve chromedriver only once.
+
+    Steps:
+    1. Slow down the copy into the cache.
+    2. Resolve chromedriver from several threads at the same time.
+
+    Assertions:
+    - The binary was copied into the cache once.
+    - Every thread got the cached binary, complete and executable.
+    """
+    copies = []
+    store_in_cache = chromedriver_resolver._store_in_cache
+
+    def slow_store_in_cache(path, major_version):
+        copies.append(threading.get_ident())
+        time.sleep(0.2)
+        return store_in_cache(path, major_version)
+
+    monkeypatch.setattr(chromedriver_resolver, "_store_in_cache", slow_store_in_cache)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        paths = list(executor.map(lambda _: chromedriver_resolver.resolve_chromedriver(), range(4)))
+
+    cached_path = chromedriver_resolver._cached_driver_path(120)
+    logger.info(f"Resolved paths: {paths}")
+    assert len(copies) == 1
+    assert paths == [cached_path] * 4
+    assert os.access(cached_path, os.X_OK)
+    assert open(cached_path).read() == fake_chromedriver.read_text()
+
+
+def test_cache_leaves_no_temporary_file(fake_chromedriver):
+    """
+    Test that storing chromedriver in the cache moves a complete copy into place.
+
+    Assertions:
+    - Only the cached binary is left in the version directory.
+    """
+    cached_path = chromedriver_resolver._store_in_cache(str(fake_chromedriver), 120)
+
+    assert os.listdir(os.path.dirname(cached_path)) == [chromedriver_resolver.DRIVER_NAME]
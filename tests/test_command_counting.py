@@ -0,0 +1,73 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from tests.fake_webdriver import FakeBrowser
+from utils.driver_pool import DriverPool
+from utils.instrumentation import _command_count, count_commands
+
+logger = logging.getLogger(__name__)
+
+
+def test_commands_are_counted_per_driver():
+    """
+    Test that each counted driver has its own count and the WebDriver class is left untouched.
+
+    Steps:
+    1. Count the commands of one driver, and not of another.
+    2. Send commands through both.
+
+    Assertions:
+    - Only the commands of the counted driver are counted.
+    - Counting the same driver again keeps its count.
+    """
+    counted = count_commands(FakeBrowser().driver())
+    uncounted = FakeBrowser().driver()
+
+    counted.get("about:blank")
+    counted.current_url
+    uncounted.get("about:blank")
+
+    assert _command_count(counted) == 2
+    assert _command_count(uncounted) == 0
+    assert count_commands(counted) is counted
+    assert _command_count(counted) == 2
+    assert "execute" not in vars(uncounted)
+    assert RemoteWebDriver.execute is type(uncounted).execute
+
+
+def test_commands_from_several_threads_are_all_counted():
+    """
+    Test that a driver used from several threads counts every command.
+
+    Assertions:
+    - The count is the number of commands sent by all the threads.
+    """
+    driver = count_commands(FakeBrowser().driver())
+
+    def send_commands(_):
+        for _ in range(500):
+            driver.current_url
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(send_commands, range(8)))
+
+    assert _command_count(driver) == 8 * 500
+
+
+def test_pool_counts_commands_of_its_drivers():
+    """
+    Test that the drivers launched by the pool are counted, whatever their factory.
+
+    Assertions:
+    - The commands of a pooled driver are counted.
+    """
+    pool = DriverPool(size=1, max_uses=10, factory=lambda: FakeBrowser().driver()).start()
+    driver = pool.acquire()
+    driver.get("about:blank")
+
+    logger.info(f"Commands of the pooled driver: {_command_count(driver)}")
+    assert _command_count(driver) >= 1
+    pool.release(driver)
+    pool.close()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.async_base_page import AsyncBasePage
+from pages.base_page import BasePage
+from utils.dom_wait import wait_for_dom_condition
+
+logger = logging.getLogger(__name__)
+
+LOCATOR = (By.ID, "email")
+
+
+class ScriptedDriver:
+    """Driver answering execute_async_script with the given outcomes, in turn."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.script_timeouts = []
+        self.scripts = 0
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.scripts += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class AsyncScriptedDriver(ScriptedDriver):
+    """ScriptedDriver with the coroutine interface of AsyncWebDriver."""
+
+    async def set_script_timeout(self, seconds, force=False):
+        super().set_script_timeout(seconds)
+
+    async def execute_async_script(self, script, *args):
+        return super().execute_async_script(script, *args)
+
+
+def test_script_timeout_set_elsewhere_is_restored():
+    """
+    Test that a script timeout lowered by other code does not end the wait early.
+
+    Steps:
+    1. Wait once, which sets the driver's script timeout.
+    2. Wait again while the driver reports a script timeout, as it does after someone
+       else lowered it, then finds the element.
+
+    Assertions:
+    - The element is returned and the script timeout was set again.
+    """
+    driver = ScriptedDriver(["first"])
+    wait_for_dom_condition(driver, LOCATOR, "visible", 2)
+    driver.outcomes = [TimeoutException("script timeout"), ["second"]]
+
+    assert wait_for_dom_condition(driver, LOCATOR, "visible", 2) == "second"
+    assert len(driver.script_timeouts) == 2
+
+
+def test_navigation_error_is_retried():
+    """
+    Test that a script interrupted by a navigation keeps waiting on the new document.
+
+    Assertions:
+    - The element found after the navigation is returned.
+    """
+    driver = ScriptedDriver(JavascriptException("javascript error: document unloaded"), ["form"])
+
+    assert wait_for_dom_condition(driver, LOCATOR, "visible", 2) == "form"
+
+
+def test_script_error_is_raised_at_once():
+    """
+    Test that a script error unrelated to navigation is raised instead of waiting.
+
+    Assertions:
+    - The JavascriptException is raised after a single attempt.
+    """
+    driver = ScriptedDriver(JavascriptException("javascript error: invalid XPath"))
+
+    with pytest.raises(JavascriptException):
+        wait_for_dom_condition(driver, LOCATOR, "visible", 2)
+    assert driver.scripts == 1
+
+
+def test_negative_check_with_script_timeouts_returns_false():
+    """
+    Test that a negative check returns False when every attempt hits the script timeout.
+
+    Assertions:
+    - is_element_displayed returns False instead of raising.
+    """
+    driver = ScriptedDriver(TimeoutException("script timeout"))
+    page = BasePage(driver, wait_engine="observer")
+
+    assert page.is_element_displayed(LOCATOR, timeout=0.2) is False
+    logger.info(f"Attempts before giving up: {driver.scripts}")
+
+
+def test_async_wait_retries_the_same_errors():
+    """
+    Test that AsyncBasePage retries and fails on the same errors as the sync wait.
+
+    Steps:
+    1. Wait while the driver reports a navigation, then a script timeout, then the element.
+    2. Wait while the script fails for another reason.
+
+    Assertions:
+    - The element is returned and the script timeout was set again.
+    - The unrelated script error is raised after a single attempt.
+    """
+    driver = AsyncScriptedDriver(
+        JavascriptException("javascript error: document unloaded"),
+        TimeoutException("script timeout"),
+        ["form"],
+    )
+    page = AsyncBasePage(driver, timeout=2)
+
+    assert asyncio.run(page.wait_for_element_visible(LOCATOR)) == "form"
+    assert driver.scripts == 3
+    assert len(driver.script_timeouts) == 2
+
+    driver = AsyncScriptedDriver(JavascriptException("javascript error: invalid XPath"))
+    with pytest.raises(JavascriptException):
+        asyncio.run(AsyncBasePage(driver, timeout=2).wait_for_element_visible(LOCATOR))
+    assert driver.scripts == 1
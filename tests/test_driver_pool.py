@@ -0,0 +1,226 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from tests.fake_webdriver import FakeBrowser
+from utils import driver_pool
+from utils.driver_pool import DriverPool, DriverPoolLauncher
+from utils.webdriver_factory import WebDriverFactory
+
+logger = logging.getLogger(__name__)
+
+
+class FakeBrowserFactory:
+    """Launches drivers of fake browsers, failing the launch attempts listed in `failures`."""
+
+    def __init__(self):
+        self.browsers = []
+        self.failures = set()
+        self.attempts = 0
+
+    def __call__(self):
+        attempt = self.attempts
+        self.attempts += 1
+        if attempt in self.failures:
+            raise RuntimeError("Chrome failed to start")
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser.driver()
+
+
+@pytest.fixture
+def launches():
+    """Fixture to provide the fake browser factory of the pool under test."""
+    return FakeBrowserFactory()
+
+
+def test_driver_is_recycled_after_max_uses(launches):
+    """
+    Test that a pooled driver is quit and replaced once it has been used max_uses times.
+
+    Assertions:
+    - The same driver is handed out until max_uses is reached.
+    - The worn driver is quit and a new one is handed out.
+    """
+    pool = DriverPool(size=1, max_uses=2, factory=launches).start()
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+
+    replacement = pool.acquire()
+    pool.release(replacement)
+    pool.close()
+
+    assert replacement is not first
+    assert launches.browsers[0].count("quit") == 1
+    assert len(launches.browsers) == 2
+
+
+def test_broken_and_unresponsive_drivers_are_replaced(launches):
+    """
+    Test that a driver released as broken, or that stopped answering while idle, is replaced.
+
+    Assertions:
+    - A new driver is launched in both cases.
+    """
+    pool = DriverPool(size=1, max_uses=10, factory=launches).start()
+    pool.release(pool.acquire(), broken=True)
+    assert len(launches.browsers) == 2
+
+    launches.browsers[1]._getCurrentUrl = lambda params: {
+        "error": "invalid session id",
+        "message": "session deleted",
+    }
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.close()
+
+    assert driver.command_executor is launches.browsers[2]
+
+
+def test_failed_relaunch_keeps_the_slot(launches):
+    """
+    Test that a slot whose driver could not be relaunched stays in the pool and is launched
+    again by a later acquire().
+
+    Steps:
+    1. Recycle a driver while the browser fails to start.
+    2. Acquire while it still fails, then once it starts again.
+
+    Assertions:
+    - The failing acquire raises the launch error instead of waiting for a driver.
+    - The next acquire launches a driver in the same slot.
+    """
+    pool = DriverPool(size=1, max_uses=1, factory=launches).start()
+    launches.failures = {1, 2}
+    pool.release(pool.acquire())
+    assert pool._idle.queue[0] is driver_pool._EMPTY_SLOT
+
+    with pytest.raises(RuntimeError, match="Chrome failed to start"):
+        pool.acquire(timeout=1)
+    driver = pool.acquire(timeout=1)
+    pool.release(driver)
+    pool.close()
+
+    assert driver.command_executor is launches.browsers[1]
+
+
+def test_peak_memory_is_logged_when_a_driver_quits(monkeypatch, caplog, launches):
+    """
+    Test that the memory of a driver is sampled at every release and its peak logged on quit.
+
+    Assertions:
+    - The largest sample is logged with the number of uses.
+    """
+    samples = iter([300 * 1024 * 1024, 500 * 1024 * 1024])
+    monkeypatch.setattr(WebDriverFactory, "get_driver_memory", lambda driver: next(samples))
+    pool = DriverPool(size=1, max_uses=10, factory=launches).start()
+    pool.release(pool.acquire())
+    pool.release(pool.acquire())
+
+    with caplog.at_level(logging.INFO, logger=driver_pool.__name__):
+        pool.close()
+
+    assert "Driver peak PSS: 500 MiB over 2 use(s)." in caplog.text
+
+
+def test_launcher_retries_a_failed_background_launch(caplog, launches):
+    """
+    Test that take() starts the pool again when its background launch failed.
+
+    Assertions:
+    - The failure is logged as soon as it happens.
+    - take() returns a pool started by the retry.
+    """
+    launches.failures = {0}
+    launcher = DriverPoolLauncher(lambda: DriverPool(size=1, max_uses=10, factory=launches))
+    with caplog.at_level(logging.ERROR, logger=driver_pool.__name__):
+        launcher._future.exception()
+    assert "Background browser pool launch failed." in caplog.text
+
+    pool = launcher.take()
+    launcher.shutdown()
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.close()
+
+    assert launches.attempts == 2
+    assert driver.command_executor is launches.browsers[0]
+
+
+def test_discarded_launch_is_closed_once_started(launches):
+    """
+    Test that a pool discarded while its browsers are still launching is closed once started.
+
+    Steps:
+    1. Hold the launch, discard the pool, then let the launch finish.
+
+    Assertions:
+    - The launched browser is quit by shutdown().
+    - Discarding a pool that was taken leaves it open.
+    """
+    launching = threading.Event()
+    proceed = threading.Event()
+
+    def held_launch():
+        launching.set()
+        proceed.wait(5)
+        return launches()
+
+    launcher = DriverPoolLauncher(lambda: DriverPool(size=1, max_uses=10, factory=held_launch))
+    launching.wait(5)
+    launcher.discard()
+    proceed.set()
+    launcher.shutdown()
+    assert launches.browsers[0].count("quit") == 1
+
+    launcher = DriverPoolLauncher(lambda: DriverPool(size=1, max_uses=10, factory=launches))
+    pool = launcher.take()
+    launcher.shutdown()
+    assert launches.browsers[1].count("quit") == 0
+    pool.close()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="Reads /proc")
+def test_driver_memory_covers_its_process_tree(monkeypatch):
+    """
+    Test that the memory of a local driver adds up its process and every descendant.
+
+    Assertions:
+    - The child process of the driver process is visited.
+    - Remote drivers, without a local process, have no memory.
+    """
+    script = "import subprocess, sys, time; subprocess.Popen(['sleep', '30']); time.sleep(30)"
+    process = subprocess.Popen([sys.executable, "-c", script])
+    visited = []
+    process_memory = WebDriverFactory._process_memory
+
+    def recording_process_memory(pid):
+        visited.append(pid)
+        return process_memory(pid)
+
+    monkeypatch.setattr(WebDriverFactory, "_process_memory", recording_process_memory)
+    driver = SimpleNamespace(service=SimpleNamespace(process=process))
+    try:
+        for _ in range(50):
+            if WebDriverFactory._child_pids(process.pid):
+                break
+            time.sleep(0.1)
+        memory = WebDriverFactory.get_driver_memory(driver)
+    finally:
+        for child in WebDriverFactory._child_pids(process.pid):
+            os.kill(child, 9)
+        process.kill()
+        process.wait()
+
+    logger.info(f"Visited processes: {visited}, PSS: {memory} bytes")
+    assert len(visited) == 2
+    assert memory > 0
+    assert WebDriverFactory.get_driver_memory(SimpleNamespace()) is None
@@ -0,0 +1,117 @@
+import logging
+from types import SimpleNamespace
+
+from utils.test_scheduling import DurationHistory, order_items
+
+logger = logging.getLogger(__name__)
+
+NODEIDS = [
+    "tests/test_a.py::test_short",
+    "tests/test_a.py::test_long",
+    "tests/test_b.py::test_medium[1]",
+    "tests/test_b.py::test_medium[2]",
+    "tests/test_c.py::test_tiny",
+]
+
+
+def history_with(tmp_path, durations, failed=()):
+    """Return a DurationHistory holding the given durations and failures."""
+    history = DurationHistory(str(tmp_path / "test_durations.json"))
+    history.durations = dict(durations)
+    history.failed = set(failed)
+    return history
+
+
+def report(nodeid, failed=False):
+    return SimpleNamespace(nodeid=nodeid, duration=1.0, failed=failed)
+
+
+def ordered(history, mode):
+    items = [SimpleNamespace(nodeid=nodeid) for nodeid in NODEIDS]
+    order_items(items, history, mode)
+    return [item.nodeid for item in items]
+
+
+def test_modules_run_longest_first_and_stay_together(tmp_path):
+    """
+    Test that modules are ordered by their total duration without interleaving their tests.
+
+    Steps:
+    1. Give test_a the longest test but test_b the longest total.
+    2. Order the tests by duration.
+
+    Assertions:
+    - test_b runs first, then test_a, then test_c.
+    - The tests of each module keep their collection order.
+    """
+    history = history_with(
+        tmp_path,
+        {
+            NODEIDS[0]: 1,
+            NODEIDS[1]: 10,
+            NODEIDS[2]: 6,
+            NODEIDS[3]: 6,
+            NODEIDS[4]: 0.5,
+        },
+    )
+
+    order = ordered(history, "duration")
+
+    logger.info(f"Order: {order}")
+    assert order == [NODEIDS[2], NODEIDS[3], NODEIDS[0], NODEIDS[1], NODEIDS[4]]
+
+
+def test_modules_with_failures_run_first(tmp_path):
+    """
+    Test that failed-first moves the whole module of a failed test to the front.
+
+    Assertions:
+    - test_c runs first, followed by the other modules longest first.
+    """
+    history = history_with(
+        tmp_path, {NODEIDS[1]: 10, NODEIDS[2]: 1, NODEIDS[4]: 0.5}, failed=[NODEIDS[4]]
+    )
+
+    order = ordered(history, "failed-first")
+
+    assert order == [NODEIDS[4], NODEIDS[0], NODEIDS[1], NODEIDS[2], NODEIDS[3]]
+
+
+def test_no_schedule_keeps_the_collection_order(tmp_path):
+    """
+    Test that --schedule none leaves the collected items alone.
+
+    Assertions:
+    - The collection order is kept.
+    """
+    history = history_with(tmp_path, {NODEIDS[4]: 100})
+
+    assert ordered(history, "none") == NODEIDS
+
+
+def test_filtered_run_keeps_the_failures_of_other_tests(tmp_path):
+    """
+    Test that saving a run of a subset of the tests only updates the failures of that subset.
+
+    Steps:
+    1. Save a run where two tests failed.
+    2. Save a run of only one of them, which now passes, and of a new failure.
+
+    Assertions:
+    - The failure of the test that did not run is kept.
+    - The fixed test is no longer failed and the new failure is added.
+    - The history is read back from disk.
+    """
+    history = history_with(tmp_path, {})
+    history.pytest_runtest_logreport(report(NODEIDS[0], failed=True))
+    history.pytest_runtest_logreport(report(NODEIDS[2], failed=True))
+    history.save()
+
+    history = DurationHistory(history.path)
+    history.pytest_runtest_logreport(report(NODEIDS[0]))
+    history.pytest_runtest_logreport(report(NODEIDS[4], failed=True))
+    history.save()
+
+    saved = DurationHistory(history.path)
+    assert saved.failed == {NODEIDS[2], NODEIDS[4]}
+    assert set(saved.durations) == {NODEIDS[0], NODEIDS[2], NODEIDS[4]}
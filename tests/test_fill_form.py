@@ -0,0 +1,62 @@
+import logging
+
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage
+from tests.fake_webdriver import FakeBrowser
+from utils.instrumentation import _command_count, count_commands
+
+logger = logging.getLogger(__name__)
+
+
+class LoginFormPage(BasePage):
+    LOCATORS = {
+        "email_textbox": (By.ID, "email"),
+        "password_textbox": (By.ID, "password"),
+        "login_button": (By.ID, "submit"),
+    }
+
+
+VALUES = {"email_textbox": "user@example.com", "password_textbox": "secret"}
+
+
+def commands_sent(fill):
+    """Run `fill` on a polling-engine login form page and return the commands it sent."""
+    browser = FakeBrowser(["email", "password", "submit"])
+    driver = count_commands(browser.driver())
+    page = LoginFormPage(driver, timeout=2, wait_engine="polling")
+    before = _command_count(driver)
+    fill(page)
+    assert browser.values == {"email": "user@example.com", "password": "secret"}
+    assert browser.clicks == ["submit"]
+    return _command_count(driver) - before
+
+
+def test_fill_form_waits_for_all_fields_at_once():
+    """
+    Test that fill_form with the default polling engine and native typing checks every field
+    and the submit button in a single command, instead of one wait per element.
+
+    Steps:
+    1. Fill and submit the form field by field, counting the commands sent.
+    2. Fill and submit it with fill_form, counting the commands sent.
+
+    Assertions:
+    - fill_form sends one check, a clear and a send_keys per field, and the click.
+    - That is fewer commands than the field by field version.
+    """
+
+    def field_by_field(page):
+        for key, text in VALUES.items():
+            page.fill_text_field(page.LOCATORS[key], text)
+        page.click_element(page.LOCATORS["login_button"])
+
+    def batched(page):
+        page.fill_form(VALUES, submit="login_button")
+
+    separate = commands_sent(field_by_field)
+    together = commands_sent(batched)
+
+    logger.info(f"Commands field by field: {separate}, with fill_form: {together}")
+    assert together == 1 + 2 * len(VALUES) + 1
+    assert together < separate
@@ -0,0 +1,114 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from config import Config
+from utils.instrumentation import ACTION_LOGGER_NAME
+from utils.log_pipeline import JsonLinesFormatter, LogPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def read_json_lines(path):
+    with open(path, encoding="utf-8") as json_file:
+        return [json.loads(line) for line in json_file]
+
+
+@pytest.fixture
+def start_pipeline():
+    """Fixture to start log pipelines, stopped after the test."""
+    pipelines = []
+
+    def start(*args, **kwargs):
+        pipeline = LogPipeline(*args, **kwargs).start()
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield start
+
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def test_records_are_formatted_as_json_lines():
+    """
+    Test that a record is formatted as a single-line JSON object with its context fields.
+
+    Assertions:
+    - The message, level and set context fields are written, unset ones are left out.
+    - The traceback of an exception is written on the same line.
+    """
+    try:
+        raise ValueError("bad locator")
+    except ValueError:
+        record = logging.LogRecord(
+            "pages", logging.ERROR, __file__, 1, "Click %s", ("login",), sys.exc_info()
+        )
+    record.nodeid = "tests/test_login_feature.py::test_login"
+    record.duration = 0.25
+
+    line = JsonLinesFormatter().format(record)
+
+    logger.info(f"JSON line: {line}")
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert entry["message"] == "Click login"
+    assert entry["level"] == "ERROR"
+    assert entry["nodeid"] == "tests/test_login_feature.py::test_login"
+    assert entry["duration"] == 0.25
+    assert "page" not in entry
+    assert "ValueError: bad locator" in entry["exc"]
+
+
+def test_flush_waits_for_the_queued_records(start_pipeline, tmp_path):
+    """
+    Test that flush() returns once every record logged before it has been written.
+
+    Steps:
+    1. Start a pipeline writing JSON lines and a text log.
+    2. Log a record and a page action timing, then flush.
+
+    Assertions:
+    - Both records are in the JSON lines, tagged with the worker.
+    - The text log has the record but not the page action timing.
+    """
+    json_path = tmp_path / "log.jsonl"
+    text_path = tmp_path / "log.txt"
+    pipeline = start_pipeline(
+        str(json_path), worker="gw1", text_path=str(text_path), text_format="%(message)s"
+    )
+
+    logging.getLogger("tests.login").info("Entered credentials")
+    logging.getLogger(ACTION_LOGGER_NAME).info("click", extra={"duration": 0.1})
+    pipeline.flush()
+
+    entries = read_json_lines(json_path)
+    assert [entry["message"] for entry in entries] == ["Entered credentials", "click"]
+    assert {entry["worker"] for entry in entries} == {"gw1"}
+    assert text_path.read_text(encoding="utf-8") == "Entered credentials\n"
+
+
+def test_json_lines_are_rotated_by_size(start_pipeline, monkeypatch, tmp_path):
+    """
+    Test that the JSON lines file is rotated once it reaches Config.LOG_JSON_MAX_BYTES.
+
+    Assertions:
+    - At most Config.LOG_JSON_BACKUPS rotated files are kept next to the current one.
+    - No file exceeds the maximum size by more than one record.
+    """
+    monkeypatch.setattr(Config, "LOG_JSON_MAX_BYTES", 1000)
+    monkeypatch.setattr(Config, "LOG_JSON_BACKUPS", 2)
+    json_path = tmp_path / "log.jsonl"
+    pipeline = start_pipeline(str(json_path))
+
+    for index in range(100):
+        logging.getLogger("tests.login").info(f"Record {index}")
+    pipeline.flush()
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    logger.info(f"Log files: {files}")
+    assert files == ["log.jsonl", "log.jsonl.1", "log.jsonl.2"]
+    assert all((tmp_path / name).stat().st_size < 1200 for name in files)
+    assert read_json_lines(json_path)[-1]["message"] == "Record 99"
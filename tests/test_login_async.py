@@ -0,0 +1,50 @@
+import logging
+import os
+
+import pytest
+
+from config import Config
+from utils.login_matrix import load_scenarios, login_async
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS_CSV = os.path.join(os.path.dirname(__file__), "data", "login_scenarios.csv")
+
+# Rows replayed by the concurrent runners, which only need to prove the interleaving works:
+# the login tests of test_login_feature.py and test_rule_feature.py cover every row
+SMOKE_SCENARIO_IDS = ("invalid_uname_valid_password", "empty_uname_empty_password")
+
+
+def smoke_scenarios():
+    return [
+        scenario
+        for scenario in load_scenarios(SCENARIOS_CSV)
+        if scenario.id in SMOKE_SCENARIO_IDS
+    ]
+
+
+# The async browsers are launched for this test, with the blocklist of its marker
+@pytest.mark.block_requests(extension_groups=["image", "font", "media"])
+def test_login_scenarios_async(async_scenarios):
+    """
+    Test the login functionality with the SMOKE_SCENARIO_IDS rows of
+    tests/data/login_scenarios.csv at once, each on an async driver, concurrently on one
+    event loop.
+
+    Assertions:
+    - The error message of each scenario contains its expected message.
+    """
+    scenarios = smoke_scenarios()
+    messages = async_scenarios(
+        [
+            lambda driver, scenario=scenario: login_async(driver, scenario, Config.APP_URL)
+            for scenario in scenarios
+        ],
+        drivers=Config.ASYNC_DRIVERS,
+    )
+
+    for scenario, actual_error_message in zip(scenarios, messages):
+        logger.info(f"Login scenario {scenario.id}: {actual_error_message}")
+        assert (
+            scenario.expected_message in actual_error_message
+        ), f"{scenario.id}: expected '{scenario.expected_message}',but got '{actual_error_message}'"
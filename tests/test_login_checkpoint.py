@@ -0,0 +1,26 @@
+import logging
+
+from config import Config
+from pages.canvas_accountpage import CanvasAccountPage
+
+logger = logging.getLogger(__name__)
+
+
+def test_login_form_checkpoint_restores_form(driver):
+    """
+    Test that the Canvas Network login form checkpoint restores the form itself, not only
+    the account page.
+
+    Assertions:
+    - Opening the login form a second time restores the checkpoint instead of replaying
+      the navigation.
+    - The email field of the form is displayed after the restore.
+    """
+    account_page = CanvasAccountPage(driver)
+    account_page.open_login_form(Config.APP_URL)
+    driver.get("about:blank")
+
+    assert account_page.open_login_form(Config.APP_URL), "The checkpoint was not restored"
+    assert account_page.is_element_displayed(
+        CanvasAccountPage.LOCATORS["email_textbox"], timeout=Config.CHECKPOINT_VERIFY_TIMEOUT
+    ), "The restored checkpoint does not show the login form"
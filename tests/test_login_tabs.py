@@ -0,0 +1,39 @@
+import logging
+import os
+
+from config import Config
+from utils.login_matrix import load_scenarios, run_in_tabs
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS_CSV = os.path.join(os.path.dirname(__file__), "data", "login_scenarios.csv")
+
+# Rows run at once, which only need to prove the interleaving works: the login tests of
+# test_login_feature.py and test_rule_feature.py cover every row
+SMOKE_SCENARIO_IDS = ("invalid_uname_valid_password", "empty_uname_empty_password")
+
+
+def smoke_scenarios():
+    return [
+        scenario
+        for scenario in load_scenarios(SCENARIOS_CSV)
+        if scenario.id in SMOKE_SCENARIO_IDS
+    ]
+
+
+def test_login_scenarios_in_tabs(driver):
+    """
+    Test the login functionality with the SMOKE_SCENARIO_IDS rows of
+    tests/data/login_scenarios.csv at once, interleaved across the tabs of a single browser.
+
+    Assertions:
+    - The error message of each scenario contains its expected message.
+    """
+    scenarios = smoke_scenarios()
+    messages = run_in_tabs(driver, scenarios, Config.APP_URL, Config.TABS_PER_DRIVER)
+
+    for scenario, actual_error_message in zip(scenarios, messages):
+        logger.info(f"Login scenario {scenario.id}: {actual_error_message}")
+        assert (
+            scenario.expected_message in actual_error_message
+        ), f"{scenario.id}: expected '{scenario.expected_message}',but got '{actual_error_message}'"
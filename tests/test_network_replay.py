@@ -0,0 +1,112 @@
+import logging
+import os
+
+import pytest
+
+from utils.network_replay import NetworkArchive, normalize_url, request_key
+
+logger = logging.getLogger(__name__)
+
+PAGE_URL = "https://www.example.com/login?lang=en"
+PAGE_BODY = b"<html>login</html>"
+HEADERS = [["Content-Type", "text/html"]]
+
+
+@pytest.fixture
+def recorded_archive(tmp_path):
+    """Fixture to record a page and a beacon sharing the page's body, and save the archive."""
+    archive = NetworkArchive(str(tmp_path / "archive"), ignored_params=["_", "ts"])
+    archive.record("GET", PAGE_URL, b"", 200, HEADERS, PAGE_BODY)
+    archive.record("POST", "https://stats.example.com/beacon?ts=1", b"{}", 204, [], PAGE_BODY)
+    archive.save()
+    archive.close()
+    return archive.path
+
+
+def test_ignored_params_are_left_out_of_the_key():
+    """
+    Test that cache busters do not change the request key while other parameters do.
+
+    Assertions:
+    - A URL with an ignored parameter has the key of the URL without it.
+    - A different value of a kept parameter gives another key.
+    """
+    ignored = ["_", "ts"]
+    key = request_key("GET", PAGE_URL, b"", ignored)
+
+    assert request_key("GET", f"{PAGE_URL}&_=1718000000", b"", ignored) == key
+    with_timestamp = "https://www.example.com/login?ts=5&lang=en#top"
+    assert request_key("GET", with_timestamp, b"", ignored) == key
+    assert request_key("GET", "https://www.example.com/login?lang=fr", b"", ignored) != key
+    assert request_key("POST", PAGE_URL, b"x", ignored) != key
+    assert normalize_url("https://www.example.com/?_=1", ignored) == "https://www.example.com/"
+
+
+def test_saved_archive_replays_the_recorded_responses(recorded_archive):
+    """
+    Test the record, save and replay round-trip of an archive.
+
+    Steps:
+    1. Record two responses with the same body, and save the archive.
+    2. Open it for replay and look the requests up, one with a new cache buster.
+
+    Assertions:
+    - The recorded status, headers and body are returned.
+    - The shared body is stored once and the journal is folded into the index.
+    - An unrecorded request is not found.
+    """
+    archive = NetworkArchive(recorded_archive, ignored_params=["_", "ts"]).open_for_replay()
+    try:
+        status, headers, body = archive.lookup("GET", f"{PAGE_URL}&_=42", b"")
+        body = bytes(body)
+        beacon_status = archive.lookup("POST", "https://stats.example.com/beacon?ts=2", b"{}")[0]
+        missing = archive.lookup("GET", "https://www.example.com/other", b"")
+    finally:
+        archive.close()
+
+    assert (status, headers, body) == (200, HEADERS, PAGE_BODY)
+    assert beacon_status == 204
+    assert missing is None
+    assert os.path.getsize(os.path.join(recorded_archive, "bodies.bin")) == len(PAGE_BODY)
+    assert sorted(os.listdir(recorded_archive)) == ["bodies.bin", "index.json"]
+
+
+def test_journal_of_a_killed_recording_is_recovered(tmp_path):
+    """
+    Test that responses recorded before a crash are replayed from the journal.
+
+    Steps:
+    1. Record two responses without saving, and cut the last journal line in half as a
+       killed process would.
+    2. Open the archive for replay.
+
+    Assertions:
+    - The complete entry is replayed and the cut one is ignored.
+    """
+    archive = NetworkArchive(str(tmp_path / "archive"), ignored_params=[])
+    archive.record("GET", PAGE_URL, b"", 200, HEADERS, PAGE_BODY)
+    archive.record("GET", "https://www.example.com/app.js", b"", 200, [], b"app()")
+    archive.close()
+    with open(archive.journal_path, "rb+") as journal:
+        journal.truncate(os.path.getsize(archive.journal_path) - 20)
+
+    replay = NetworkArchive(archive.path, ignored_params=[]).open_for_replay()
+    try:
+        page_body = bytes(replay.lookup("GET", PAGE_URL, b"")[2])
+        script = replay.lookup("GET", "https://www.example.com/app.js", b"")
+    finally:
+        replay.close()
+
+    assert page_body == PAGE_BODY
+    assert script is None
+
+
+def test_empty_archive_cannot_be_replayed(tmp_path):
+    """
+    Test that replaying an archive without recordings fails at once.
+
+    Assertions:
+    - FileNotFoundError is raised.
+    """
+    with pytest.raises(FileNotFoundError):
+        NetworkArchive(str(tmp_path / "missing")).open_for_replay()
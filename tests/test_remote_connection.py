@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+
+from config import Config
+from utils.standin_server import StandInGrid
+from utils.webdriver_factory import WebDriverFactory
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def standin_grid(monkeypatch):
+    """Fixture to point Config.GRID_URL at a local stand-in Grid endpoint."""
+    grid = StandInGrid().start()
+    monkeypatch.setattr(Config, "GRID_URL", grid.url)
+    yield grid
+
+    WebDriverFactory.close_remote_connections(grid.url)
+    grid.stop()
+
+
+def test_remote_quit_keeps_shared_connection(standin_grid):
+    """
+    Test that quitting a remote driver leaves the keep-alive connection it shares with the
+    other remote drivers open.
+
+    Steps:
+    1. Start two remote drivers on the stand-in Grid.
+    2. Quit the first one.
+    3. Send a command with the second one.
+
+    Assertions:
+    - Both drivers use the same command connection.
+    - The second driver still works after the first one quit, on the same socket.
+    """
+    first = WebDriverFactory.get_driver("remote")
+    second = WebDriverFactory.get_driver("remote")
+    try:
+        assert first.command_executor is second.command_executor
+
+        first.quit()
+        assert second.current_url == "about:blank"
+        logger.info(f"Stand-in Grid accepted {standin_grid.connections} connection(s)")
+        assert standin_grid.connections == 1, "Quitting a driver closed the shared connection"
+    finally:
+        second.quit()
@@ -0,0 +1,118 @@
+import logging
+import re
+
+import pytest
+
+from utils import request_blocking
+from utils.request_blocking import (
+    THIRD_PARTY_PATTERNS,
+    apply_request_blocking,
+    blocked_url_patterns,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def is_blocked(url, patterns):
+    """Match `url` like Network.setBlockedURLs, where only "*" is a wildcard."""
+    return any(
+        re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) for pattern in patterns
+    )
+
+
+@pytest.fixture
+def no_configured_blocklist(monkeypatch):
+    """Fixture to clear the blocklist configured through the environment."""
+    monkeypatch.setattr(request_blocking.Config, "BLOCKED_URL_PATTERNS", [])
+    monkeypatch.setattr(request_blocking.Config, "BLOCKED_EXTENSION_GROUPS", [])
+    monkeypatch.setattr(request_blocking.Config, "BLOCK_THIRD_PARTY", 0)
+
+
+@pytest.mark.parametrize(
+    "url, blocked",
+    [
+        ("https://cdn.example.com/logo.png", True),
+        ("https://cdn.example.com/logo.png?v=3", True),
+        ("https://cdn.example.com/fonts/lato.woff2", True),
+        ("https://www.example.com/docs.png-guide", False),
+        ("https://www.example.com/png/index.html", False),
+        ("https://www.example.com/login", False),
+    ],
+)
+def test_extension_groups_match_the_end_of_the_path(no_configured_blocklist, url, blocked):
+    """
+    Test that extension groups only block URLs whose path ends with one of their extensions.
+
+    Assertions:
+    - URLs ending with an image or font extension, with or without a query string, are blocked.
+    - URLs only containing the extension elsewhere are not.
+    """
+    patterns = blocked_url_patterns(extension_groups=["image", "font"])
+
+    assert is_blocked(url, patterns) is blocked
+
+
+def test_defaults_come_from_config(no_configured_blocklist, monkeypatch):
+    """
+    Test that the configured patterns, extension groups and third party switch are used
+    when no argument is given, and that the result has no duplicates.
+
+    Assertions:
+    - Every configured pattern is blocked once, in order.
+    """
+    monkeypatch.setattr(request_blocking.Config, "BLOCKED_URL_PATTERNS", ["*.css", "*.css"])
+    monkeypatch.setattr(request_blocking.Config, "BLOCKED_EXTENSION_GROUPS", ["stylesheet"])
+    monkeypatch.setattr(request_blocking.Config, "BLOCK_THIRD_PARTY", 1)
+
+    patterns = blocked_url_patterns()
+
+    assert patterns == ["*.css", "*.css?*"] + list(THIRD_PARTY_PATTERNS)
+
+
+def test_arguments_override_config(no_configured_blocklist, monkeypatch):
+    """
+    Test that explicit arguments, empty ones included, replace the configured blocklist.
+
+    Assertions:
+    - Nothing is blocked when every argument is empty.
+    """
+    monkeypatch.setattr(request_blocking.Config, "BLOCKED_EXTENSION_GROUPS", ["image"])
+    monkeypatch.setattr(request_blocking.Config, "BLOCK_THIRD_PARTY", 1)
+
+    assert blocked_url_patterns(patterns=[], extension_groups=[], third_party=False) == []
+
+
+def test_unknown_extension_group_is_rejected(no_configured_blocklist):
+    """
+    Test that a misspelled extension group fails instead of blocking nothing.
+
+    Assertions:
+    - ValueError is raised.
+    """
+    with pytest.raises(ValueError, match="images"):
+        blocked_url_patterns(extension_groups=["images"])
+
+
+def test_blocklist_is_sent_through_cdp(no_configured_blocklist):
+    """
+    Test that the blocklist is applied with Network.setBlockedURLs on Chromium drivers.
+
+    Assertions:
+    - The network domain is enabled and the patterns are sent.
+    """
+
+    class ChromiumDriver:
+        def __init__(self):
+            self.commands = []
+
+        def execute_cdp_cmd(self, command, params):
+            self.commands.append((command, params))
+
+    driver = ChromiumDriver()
+    apply_request_blocking(driver, patterns=["*.mp4"])
+
+    logger.info(f"CDP commands: {driver.commands}")
+    assert driver.commands == [
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": ["*.mp4"]}),
+    ]
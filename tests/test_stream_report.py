@@ -0,0 +1,114 @@
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from utils.stream_report import StreamReport
+
+logger = logging.getLogger(__name__)
+
+NODEID = "tests/test_login_feature.py::test_invalid_uname_invalid_password"
+
+
+def report(when, outcome="passed", nodeid=NODEID, user_properties=(), longreprtext=""):
+    return SimpleNamespace(
+        nodeid=nodeid,
+        when=when,
+        duration=0.5,
+        passed=outcome == "passed",
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        longreprtext=longreprtext,
+        user_properties=list(user_properties),
+    )
+
+
+def read_results(directory):
+    with open(directory / "results.jsonl", encoding="utf-8") as jsonl_file:
+        return [json.loads(line) for line in jsonl_file]
+
+
+@pytest.fixture
+def stream_report(tmp_path):
+    """Fixture to provide a streaming report in a temporary directory, closed after the test."""
+    report_plugin = StreamReport(str(tmp_path / "run"))
+    yield report_plugin
+
+    report_plugin.close()
+
+
+def test_result_is_written_when_the_test_finishes(stream_report, tmp_path):
+    """
+    Test that a result is appended to results.jsonl and results.js after its teardown.
+
+    Steps:
+    1. Report the setup and call of a failed test.
+    2. Report its teardown.
+
+    Assertions:
+    - Nothing is written before the teardown.
+    - The result has the outcome, total duration, error, artifact paths and action summary.
+    - results.js pushes the same result for the viewer.
+    """
+    run = tmp_path / "run"
+    artifacts = str(tmp_path / "screenshots" / "test_invalid_uname")
+    stream_report.pytest_runtest_logreport(report("setup"))
+    stream_report.pytest_runtest_logreport(
+        report(
+            "call",
+            "failed",
+            user_properties=[("artifacts", artifacts), ("actions", {"click": 2})],
+            longreprtext="AssertionError: Expected message",
+        )
+    )
+    assert read_results(run) == []
+
+    stream_report.pytest_runtest_logreport(report("teardown"))
+
+    (result,) = read_results(run)
+    logger.info(f"Result: {result}")
+    assert result["outcome"] == "failed"
+    assert result["duration"] == 1.5
+    assert result["error"] == "AssertionError: Expected message"
+    assert result["artifacts"]["screenshot"] == "../screenshots/test_invalid_uname.png"
+    assert result["actions"] == {"click": 2}
+    assert (run / "index.html").exists()
+    assert f"RESULTS.push({json.dumps(result)});" in (run / "results.js").read_text()
+
+
+def test_setup_failure_is_an_error(stream_report, tmp_path):
+    """
+    Test that a failure outside of the test call is reported as an error.
+
+    Assertions:
+    - The outcome is "error" and the test without failure is "passed".
+    """
+    stream_report.pytest_runtest_logreport(report("setup", "failed", nodeid="a"))
+    stream_report.pytest_runtest_logreport(report("teardown", nodeid="a"))
+    for when in ("setup", "call", "teardown"):
+        stream_report.pytest_runtest_logreport(report(when, nodeid="b"))
+
+    outcomes = {result["nodeid"]: result["outcome"] for result in read_results(tmp_path / "run")}
+    assert outcomes == {"a": "error", "b": "passed"}
+
+
+def test_close_writes_unfinished_tests_and_summary_is_replaced(tmp_path):
+    """
+    Test that close() writes the tests that never reached their teardown and that the
+    session summary replaces the empty one written at start.
+
+    Assertions:
+    - summary.js holds null until the summary is written, then the summary.
+    - The interrupted test is written on close.
+    """
+    run = tmp_path / "run"
+    stream_report = StreamReport(str(run))
+    assert (run / "summary.js").read_text() == "window.ACTION_SUMMARY = null;\n"
+
+    stream_report.pytest_runtest_logreport(report("setup"))
+    stream_report.write_summary({"slowest": []})
+    stream_report.close()
+
+    assert (run / "summary.js").read_text() == 'window.ACTION_SUMMARY = {"slowest": []};\n'
+    assert [result["nodeid"] for result in read_results(run)] == [NODEID]
@@ -0,0 +1,113 @@
+import logging
+
+from pages.base_page import BasePage
+from tests.fake_webdriver import FakeBrowser
+from utils.tab_scheduler import TabScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class WindowTracker:
+    """Minimal driver keeping track of the focused window, like a browser with several tabs."""
+
+    def __init__(self):
+        self.handles = ["tab-0"]
+        self.current_window_handle = "tab-0"
+        self.switch_to = self
+        self.actions = []
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def new_window(self, type_hint):
+        handle = f"tab-{len(self.handles)}"
+        self.handles.append(handle)
+        self.current_window_handle = handle
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+    def act(self, tab):
+        self.actions.append((tab.handle, self.current_window_handle))
+
+
+def met(driver):
+    return True
+
+
+def test_scenarios_act_on_their_own_tab():
+    """
+    Test that every step of an interleaved scenario acts on the window of its own tab, even
+    after a step moved the focus to another window.
+
+    Steps:
+    1. Run two scenarios in two tabs; the second one focuses the first tab in one of its
+       steps and keeps running after the first scenario has finished.
+    2. Record the focused window at every step.
+
+    Assertions:
+    - Each step ran with its own tab focused.
+    """
+    driver = WindowTracker()
+
+    def steady(tab):
+        driver.act(tab)
+        yield met
+        driver.act(tab)
+
+    def focus_thief(tab):
+        driver.act(tab)
+        yield met
+        other = next(handle for handle in driver.handles if handle != tab.handle)
+        driver.switch_to.window(other)
+        yield met
+        driver.act(tab)
+
+    TabScheduler(driver, tabs=2, timeout=1, poll_interval=0).run([steady, focus_thief])
+
+    logger.info(f"Steps (tab, focused window): {driver.actions}")
+    assert len(driver.actions) == 4
+    assert all(
+        tab == focused for tab, focused in driver.actions
+    ), f"Steps ran in another tab's window: {driver.actions}"
+
+
+def test_page_objects_drive_their_own_tab():
+    """
+    Test that a page object created for a tab acts on that tab even when another window is
+    focused, including when it is used from another tab's scenario.
+
+    Steps:
+    1. In the first tab, create a page object and keep it; the scenario then switches the
+       focus to the other tab and navigates with the page object.
+    2. In the second tab, navigate with the first tab's page object, then with its own driver.
+
+    Assertions:
+    - Every navigation landed in the window of the page object's or driver's tab.
+    """
+    browser = FakeBrowser()
+    driver = browser.driver()
+    pages = {}
+
+    def keeps_page(tab):
+        pages[tab.handle] = page = tab.page(BasePage)
+        yield met
+        other = next(handle for handle in browser.window_handles if handle != tab.handle)
+        tab.driver.switch_to.window(other)
+        page.driver.get("https://first.example/step-2")
+
+    def borrows_page(tab):
+        yield met
+        first_page = next(page for handle, page in pages.items() if handle != tab.handle)
+        first_page.driver.get("https://first.example/from-second-tab")
+        tab.driver.get("https://second.example/")
+
+    TabScheduler(driver, tabs=2, timeout=1, poll_interval=0).run([keeps_page, borrows_page])
+
+    logger.info(f"Navigations (window, URL): {browser.navigations}")
+    first, second = list(browser.urls)
+    assert sorted(browser.navigations) == [
+        (first, "https://first.example/from-second-tab"),
+        (first, "https://first.example/step-2"),
+        (second, "https://second.example/"),
+    ]
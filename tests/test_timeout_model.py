@@ -0,0 +1,130 @@
+import logging
+
+import pytest
+
+from config import Config
+from utils.timeout_model import TimeoutModel, history_target
+
+logger = logging.getLogger(__name__)
+
+KEY = "CanvasAccountPage:email_textbox:visible"
+
+
+@pytest.fixture
+def model(monkeypatch, tmp_path):
+    """Fixture to provide a timeout model with adaptive timeouts on and an empty history."""
+    monkeypatch.setattr(Config, "ADAPTIVE_TIMEOUTS", 1)
+    monkeypatch.setattr(Config, "TIMEOUT_PERCENTILE", 95)
+    monkeypatch.setattr(Config, "TIMEOUT_FACTOR", 1.5)
+    monkeypatch.setattr(Config, "TIMEOUT_MARGIN", 2)
+    monkeypatch.setattr(Config, "TIMEOUT_MIN_SAMPLES", 5)
+    timeout_model = TimeoutModel()
+    timeout_model.load(str(tmp_path / "timeout_history.json"))
+    return timeout_model
+
+
+def record_and_save(model, durations):
+    for duration in durations:
+        model.record(KEY, duration)
+    model.save()
+
+
+def test_timeout_is_learned_from_a_percentile_of_the_samples(model):
+    """
+    Test that the learned timeout is the percentile of the samples times the factor plus the
+    margin, once there are enough samples.
+
+    Steps:
+    1. Save fewer samples than TIMEOUT_MIN_SAMPLES.
+    2. Save enough samples, one of them an outlier above the 95th percentile.
+
+    Assertions:
+    - The configured timeout is used without enough samples.
+    - The learned timeout ignores the outlier and is read back from disk.
+    """
+    record_and_save(model, [0.2] * 4)
+    assert model.timeout(KEY, 20) == 20
+
+    record_and_save(model, [0.2] * 15 + [1.0] * 5 + [9.0])
+    assert model.timeout(KEY, 20) == pytest.approx(1.0 * 1.5 + 2)
+
+    reloaded = TimeoutModel()
+    reloaded.load(model.path)
+    assert reloaded.timeout(KEY, 20) == pytest.approx(3.5)
+
+
+def test_configured_timeout_is_the_ceiling(model, monkeypatch):
+    """
+    Test that a learned timeout never exceeds the configured one and is ignored when adaptive
+    timeouts are off.
+
+    Assertions:
+    - Slow samples give the configured timeout.
+    - With ADAPTIVE_TIMEOUTS off, the configured timeout is used whatever the history.
+    """
+    record_and_save(model, [30.0] * 5)
+    assert model.timeout(KEY, 20) == 20
+
+    record_and_save(model, [0.1] * 200)
+    assert model.timeout(KEY, 20) < 20
+    monkeypatch.setattr(Config, "ADAPTIVE_TIMEOUTS", 0)
+    assert model.timeout(KEY, 20) == 20
+
+
+def test_timeout_resets_the_history_of_its_key(model):
+    """
+    Test that a wait giving up after its learned timeout discards the history of its key.
+
+    Steps:
+    1. Learn a timeout, then record a timeout.
+    2. Record new samples after it and save.
+
+    Assertions:
+    - The configured timeout is used again for the rest of the run.
+    - Only the samples recorded after the timeout are saved.
+    """
+    record_and_save(model, [0.2] * 5)
+    assert model.timeout(KEY, 20) < 20
+
+    model.record(KEY, 0.3)
+    model.record_timeout(KEY)
+    assert model.timeout(KEY, 20) == 20
+
+    model.record(KEY, 0.4)
+    model.save()
+    logger.info(f"History after the timeout: {model.history}")
+    assert model.history[history_target()][KEY] == [0.4]
+
+
+def test_history_is_kept_per_target(model, monkeypatch):
+    """
+    Test that the latencies of a replayed run do not shorten the waits of a live run.
+
+    Assertions:
+    - The timeout learned in replay mode is not used in live mode.
+    """
+    monkeypatch.setattr(Config, "NETWORK_MODE", "replay")
+    record_and_save(model, [0.2] * 5)
+    assert model.timeout(KEY, 20) < 20
+
+    monkeypatch.setattr(Config, "NETWORK_MODE", "live")
+    assert model.timeout(KEY, 20) == 20
+
+
+def test_worker_samples_are_merged_by_the_controller(model, tmp_path):
+    """
+    Test that the samples written by xdist workers are merged into the saved history.
+
+    Assertions:
+    - The samples of both workers are saved and the worker files removed.
+    """
+    for worker in ("gw0", "gw1"):
+        worker_model = TimeoutModel()
+        worker_model.record(KEY, 0.5)
+        worker_model.write_samples(str(tmp_path / f"timeout_samples_{worker}.json"))
+
+    model.merge_samples(str(tmp_path / "timeout_samples_*.json"))
+    model.save()
+
+    assert model.history[history_target()][KEY] == [0.5, 0.5]
+    assert not list(tmp_path.glob("timeout_samples_*.json"))
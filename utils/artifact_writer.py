@@ -0,0 +1,147 @@
+"""
+Background writer for failure artifacts.
+
+The test thread only grabs the raw bytes from the browser (screenshot, page source, console
+logs, URL); compressing and writing them, as well as formatting and logging the traceback,
+happens on a background thread. The queue is bounded so a failure storm cannot grow memory
+without limit: when it is full, the artifacts of further failures are dropped and logged.
+
+The background thread logs to the "failure_artifacts" logger, which does not propagate to
+the root logger: pytest would otherwise capture its records into whichever test is running
+at the time. The structured log pipeline writes them, tagged with the failed test's nodeid,
+and the errors of the writer are kept in ArtifactWriter.errors for the end of the session.
+"""
+
+import gzip
+import json
+import logging
+import queue
+import threading
+import traceback
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Logger of the background thread, only written by the structured log pipeline
+ARTIFACT_LOGGER_NAME = "failure_artifacts"
+_writer_logger = logging.getLogger(ARTIFACT_LOGGER_NAME)
+_writer_logger.propagate = False
+
+_STOP = object()
+
+
+class ArtifactWriter:
+    """Writes failure artifacts from a bounded queue on a background thread."""
+
+    def __init__(self, max_pending=None):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            max_pending (int, optional): Failures that can wait to be written before new ones
+                                         are dropped. Defaults to Config.ARTIFACT_QUEUE_SIZE.
+        """
+        self._queue = queue.Queue(maxsize=max_pending or Config.ARTIFACT_QUEUE_SIZE)
+        # Artifacts that could not be written, as (test name, error message) pairs
+        self.errors = []
+        self._thread = threading.Thread(
+            target=self._run, name="artifact-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        base_path,
+        test_name,
+        screenshot=None,
+        page_source=None,
+        url=None,
+        console_logs=None,
+        excinfo=None,
+        nodeid=None,
+    ):
+        """
+        Queue the artifacts of a failed test without blocking.
+
+        Args:
+            base_path (str): Path prefix of the artifact files, without extension.
+            test_name (str): Name of the failed test.
+            screenshot (bytes, optional): PNG screenshot, written as-is to <base_path>.png.
+            page_source (str, optional): Page HTML, written to <base_path>.html.gz.
+            url (str, optional): Current URL, stored in <base_path>.json.gz.
+            console_logs (list, optional): Browser console entries, stored in <base_path>.json.gz.
+            excinfo (pytest.ExceptionInfo, optional): The failure, formatted and logged in the background.
+            nodeid (str, optional): Nodeid of the failed test, attached to the logged records.
+
+        Returns:
+            bool: False if the queue was full and the artifacts were dropped.
+        """
+        job = (base_path, test_name, screenshot, page_source, url, console_logs, excinfo, nodeid)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            logger.warning(f"Artifact queue full, dropping artifacts of {test_name}")
+            return False
+        return True
+
+    def flush(self):
+        """Block until every queued artifact has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the remaining artifacts and stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._write(*job)
+            except Exception as error:
+                test_name, nodeid = job[1], job[-1]
+                _writer_logger.exception(
+                    f"Failed to write failure artifacts of {test_name}",
+                    extra={"nodeid": nodeid},
+                )
+                self.errors.append((test_name, repr(error)))
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(
+        base_path, test_name, screenshot, page_source, url, console_logs, excinfo, nodeid
+    ):
+        extra = {"nodeid": nodeid}
+        error_message = traceback_info = None
+        if excinfo is not None:
+            error_message = str(excinfo.value)
+            traceback_info = "".join(
+                traceback.format_exception(None, excinfo.value, excinfo.tb)
+            )
+            _writer_logger.error(f"Test failed: {test_name}", extra=extra)
+            _writer_logger.error(f"Error message: {error_message}", extra=extra)
+            _writer_logger.error(f"Traceback:\n{traceback_info}", extra=extra)
+        if base_path is None:
+            return
+
+        if screenshot is not None:
+            with open(f"{base_path}.png", "wb") as png_file:
+                png_file.write(screenshot)
+        if page_source is not None:
+            with gzip.open(f"{base_path}.html.gz", "wt", encoding="utf-8") as html_file:
+                html_file.write(page_source)
+        if url is not None or console_logs is not None:
+            details = {
+                "test": test_name,
+                "url": url,
+                "console": console_logs,
+                "error": error_message,
+                "traceback": traceback_info,
+            }
+            with gzip.open(f"{base_path}.json.gz", "wt", encoding="utf-8") as json_file:
+                json.dump(details, json_file)
+        _writer_logger.info(f"Wrote failure artifacts: {base_path}.*", extra=extra)
@@ -0,0 +1,346 @@
+"""
+Minimal asyncio WebDriver client for local Chrome.
+
+Each AsyncWebDriver starts its own chromedriver and talks the W3C WebDriver protocol to it
+over a keep-alive HTTP/1.1 connection on asyncio streams, so one event loop can drive many
+browsers without a thread per driver. Chrome DevTools commands go through chromedriver's
+goog/cdp/execute endpoint. The browsers are launched with the options of the sync drivers
+(WebDriverFactory.get_local_chrome_options(), record/replay proxy included) and block the
+same requests.
+
+Only the commands used by AsyncBasePage are implemented. The sync Selenium driver remains
+the default for tests; use this client for scenarios that run concurrently, see
+run_concurrently() and the async_scenarios fixture.
+"""
+
+import asyncio
+import json
+import logging
+import socket
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+from config import Config
+from utils.chromedriver_resolver import resolve_chromedriver
+from utils.request_blocking import blocked_url_patterns
+from utils.webdriver_factory import WebDriverFactory
+
+logger = logging.getLogger(__name__)
+
+# Key of a web element reference in W3C WebDriver payloads
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Seconds to wait for a new chromedriver to accept connections
+STARTUP_TIMEOUT = 10
+
+ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "script timeout": TimeoutException,
+    "timeout": TimeoutException,
+    "javascript error": JavascriptException,
+}
+
+
+def _w3c_locator(strategy, selector):
+    """Translate the locator strategies W3C WebDriver does not support to CSS, as Selenium does."""
+    if strategy == By.ID:
+        return By.CSS_SELECTOR, f'[id="{selector}"]'
+    if strategy == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{selector}"]'
+    if strategy == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{selector}"
+    if strategy == By.TAG_NAME:
+        return By.CSS_SELECTOR, selector
+    return strategy, selector
+
+
+class AsyncWebElement:
+    """Reference to an element of the page of an AsyncWebDriver."""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def to_json(self):
+        return {ELEMENT_KEY: self.id}
+
+    async def click(self):
+        await self.driver.execute("POST", f"/element/{self.id}/click")
+
+    async def clear(self):
+        await self.driver.execute("POST", f"/element/{self.id}/clear")
+
+    async def send_keys(self, text):
+        await self.driver.execute("POST", f"/element/{self.id}/value", {"text": text})
+
+    async def text(self):
+        return await self.driver.execute("GET", f"/element/{self.id}/text")
+
+
+class AsyncWebDriver:
+    """A local Chrome session driven through asyncio streams."""
+
+    def __init__(self, headless=None, blocking=None):
+        """
+        Initialize the driver; call start() to launch the browser.
+
+        Args:
+            headless (bool, optional): Run Chrome headless. Defaults to Config.HEADLESS.
+            blocking (dict, optional): Keyword arguments of blocked_url_patterns(), e.g. those
+                                       of a block_requests marker. Defaults to the configured blocklist.
+        """
+        self.headless = headless or Config.HEADLESS
+        self.blocking = blocking or {}
+        self.session_id = None
+        self._process = None
+        self._port = None
+        self._reader = None
+        self._writer = None
+        # One request at a time on the keep-alive connection
+        self._lock = asyncio.Lock()
+        self._script_timeout = 0
+
+    async def start(self):
+        """Launch chromedriver and Chrome, and return the driver."""
+        loop = asyncio.get_running_loop()
+        chromedriver = await loop.run_in_executor(None, resolve_chromedriver)
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self._port = probe.getsockname()[1]
+        self._process = await asyncio.create_subprocess_exec(
+            chromedriver,
+            f"--port={self._port}",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await self._wait_until_listening()
+
+        # Same browser setup as the sync drivers, replay proxy included
+        options = await loop.run_in_executor(
+            None, WebDriverFactory.get_local_chrome_options, self.headless
+        )
+        capabilities = options.to_capabilities()
+        session = await self._request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}}
+        )
+        self.session_id = session["sessionId"]
+
+        patterns = blocked_url_patterns(**self.blocking)
+        if patterns:
+            await self.execute_cdp_cmd("Network.enable", {})
+            await self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"Async driver started on port {self._port}")
+        return self
+
+    async def _wait_until_listening(self):
+        deadline = asyncio.get_running_loop().time() + STARTUP_TIMEOUT
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_connection(
+                    "127.0.0.1", self._port
+                )
+                return
+            except OSError:
+                if asyncio.get_running_loop().time() > deadline:
+                    raise WebDriverException(
+                        f"chromedriver did not listen on port {self._port}"
+                    ) from None
+                await asyncio.sleep(0.05)
+
+    async def _request(self, method, path, payload=None):
+        """Send a WebDriver request and return the "value" of its response."""
+        body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+        if method in ("GET", "DELETE"):
+            body = b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{self._port}\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                await self._wait_until_listening()
+            self._writer.write(head.encode("ascii") + body)
+            await self._writer.drain()
+            status, data = await self._read_response()
+
+        value = json.loads(data or b"null")
+        value = value.get("value") if isinstance(value, dict) else value
+        if status >= 400:
+            error = value.get("error", "") if isinstance(value, dict) else ""
+            message = value.get("message", "") if isinstance(value, dict) else str(value)
+            raise ERRORS.get(error, WebDriverException)(message)
+        return value
+
+    async def _read_response(self):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise WebDriverException("chromedriver closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = (await self._reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            data = b"".join(chunks)
+        else:
+            data = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self._writer.close()
+        return status, data
+
+    async def execute(self, method, path, payload=None):
+        """Send a command of the current session, e.g. execute("POST", "/url", {...})."""
+        return self._unwrap(
+            await self._request(method, f"/session/{self.session_id}{path}", payload)
+        )
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return value.to_json()
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        return value
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def find_element(self, strategy, selector):
+        using, value = _w3c_locator(strategy, selector)
+        return await self.execute("POST", "/element", {"using": using, "value": value})
+
+    async def execute_script(self, script, *args):
+        return await self.execute(
+            "POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))}
+        )
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute(
+            "POST", "/execute/async", {"script": script, "args": self._wrap(list(args))}
+        )
+
+    async def set_script_timeout(self, seconds, force=False):
+        """
+        Set the async script timeout, skipping the round-trip if it is already as long.
+
+        `force` sends it anyway, e.g. after a script timed out before the timeout set here.
+        """
+        if force or self._script_timeout < seconds:
+            await self.execute("POST", "/timeouts", {"script": int(seconds * 1000)})
+            self._script_timeout = seconds
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def execute_cdp_cmd(self, cmd, params):
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params})
+
+    async def quit(self):
+        """End the session and stop chromedriver."""
+        try:
+            if self.session_id is not None:
+                await self._request("DELETE", f"/session/{self.session_id}")
+        except (WebDriverException, OSError):
+            logger.warning("Async driver did not quit cleanly.")
+        finally:
+            self.session_id = None
+            if self._writer is not None:
+                self._writer.close()
+            if self._process is not None and self._process.returncode is None:
+                self._process.terminate()
+                await self._process.wait()
+
+
+async def run_concurrently(scenarios, drivers=None, headless=None, blocking=None):
+    """
+    Run async scenarios concurrently on a few browsers of one event loop.
+
+    Each scenario gets a driver for itself while it runs; the drivers are shared in turn when
+    there are more scenarios than drivers and reset (cookies, about:blank) in between.
+
+    Args:
+        scenarios (list): Coroutine functions taking an AsyncWebDriver.
+        drivers (int, optional): Number of browsers. Defaults to Config.ASYNC_DRIVERS.
+        headless (bool, optional): Run Chrome headless. Defaults to Config.HEADLESS.
+        blocking (dict, optional): Blocklist of the browsers, see AsyncWebDriver.
+
+    Returns:
+        list: The results of the scenarios, in the order of `scenarios`.
+
+    Raises:
+        Exception: The first error raised by a scenario, once all of them have finished.
+    """
+    count = min(drivers or Config.ASYNC_DRIVERS, len(scenarios))
+    if not count:
+        return []
+    started = await asyncio.gather(
+        *(AsyncWebDriver(headless, blocking).start() for _ in range(count)),
+        return_exceptions=True,
+    )
+    idle = asyncio.Queue()
+    for driver in started:
+        if isinstance(driver, AsyncWebDriver):
+            idle.put_nowait(driver)
+
+    async def run(scenario):
+        driver = await idle.get()
+        try:
+            return await scenario(driver)
+        finally:
+            try:
+                await driver.delete_all_cookies()
+                await driver.get("about:blank")
+            finally:
+                idle.put_nowait(driver)
+
+    try:
+        for error in started:
+            if isinstance(error, BaseException):
+                raise error
+        outcomes = await asyncio.gather(
+            *(run(scenario) for scenario in scenarios), return_exceptions=True
+        )
+    finally:
+        await asyncio.gather(
+            *(driver.quit() for driver in started if isinstance(driver, AsyncWebDriver))
+        )
+
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes
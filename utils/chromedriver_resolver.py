@@ -0,0 +1,148 @@
+"""
+Offline resolution of the chromedriver binary matching the installed Chrome.
+
+Lookup order: CHROMEDRIVER_PATH, the local versioned cache, PATH and finally
+webdriver-manager, whose download is copied into the cache for the next run.
+
+The pool launches its drivers from several threads: the first resolution holds a lock so
+that it runs once, and the cached binary is written to a temporary file and moved into
+place, so no thread ever runs a partially copied chromedriver.
+"""
+
+import functools
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+_VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+")
+
+_resolve_lock = threading.Lock()
+_resolved_path = None
+
+
+def _major_version(binary):
+    """Return the major version reported by `binary --version`, or None if it cannot be run."""
+    try:
+        output = subprocess.run(
+            [binary, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_PATTERN.search(output)
+    return int(match.group(1)) if match else None
+
+
+@functools.lru_cache(maxsize=None)
+def detect_chrome_major_version():
+    """
+    Detect the major version of the locally installed Chrome without touching the network.
+
+    Returns:
+        int: The Chrome major version, or None if Chrome could not be found.
+    """
+    candidates = [Config.CHROME_BINARY] if Config.CHROME_BINARY else []
+    candidates += CHROME_BINARIES
+    for candidate in candidates:
+        binary = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if binary:
+            version = _major_version(binary)
+            if version:
+                return version
+    return None
+
+
+def _cached_driver_path(major_version):
+    return os.path.join(Config.DRIVER_CACHE_DIR, str(major_version), DRIVER_NAME)
+
+
+def _is_usable(path, major_version):
+    """Check that `path` is an executable chromedriver matching the Chrome major version."""
+    if not path or not os.access(path, os.X_OK):
+        return False
+    return major_version is None or _major_version(path) == major_version
+
+
+def _store_in_cache(path, major_version):
+    if major_version is None:
+        return path
+    cached_path = _cached_driver_path(major_version)
+    directory = os.path.dirname(cached_path)
+    temp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{DRIVER_NAME}.")
+        os.close(descriptor)
+        shutil.copy2(path, temp_path)
+        os.replace(temp_path, cached_path)
+    except OSError:
+        logger.warning(f"Could not cache chromedriver at {cached_path}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return path
+    return cached_path
+
+
+def resolve_chromedriver():
+    """
+    Resolve the chromedriver binary to use, memoized for the lifetime of the process.
+
+    Concurrent first calls wait for a single resolution instead of each resolving (and
+    possibly downloading) chromedriver.
+
+    Returns:
+        str: Path to a chromedriver executable.
+    """
+    global _resolved_path
+    with _resolve_lock:
+        if _resolved_path is None:
+            _resolved_path = _resolve()
+        return _resolved_path
+
+
+def _resolve():
+    major_version = detect_chrome_major_version()
+    logger.info(f"Detected Chrome major version: {major_version}")
+
+    if Config.CHROMEDRIVER_PATH:
+        if _is_usable(Config.CHROMEDRIVER_PATH, None):
+            logger.info(f"Using chromedriver from CHROMEDRIVER_PATH: {Config.CHROMEDRIVER_PATH}")
+            return Config.CHROMEDRIVER_PATH
+        logger.warning(f"CHROMEDRIVER_PATH is not executable: {Config.CHROMEDRIVER_PATH}")
+
+    if major_version is not None:
+        cached_path = _cached_driver_path(major_version)
+        if _is_usable(cached_path, None):
+            logger.info(f"Using cached chromedriver: {cached_path}")
+            return cached_path
+
+    path_driver = shutil.which(DRIVER_NAME)
+    if _is_usable(path_driver, major_version):
+        logger.info(f"Using chromedriver from PATH: {path_driver}")
+        return _store_in_cache(path_driver, major_version)
+
+    logger.info("No local chromedriver found, falling back to webdriver-manager.")
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return _store_in_cache(ChromeDriverManager().install(), major_version)
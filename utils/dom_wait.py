@@ -0,0 +1,395 @@
+"""
+Event-driven element waits executed inside the page.
+
+Instead of polling the browser over the wire, a single execute_async_script call installs a
+MutationObserver (plus requestAnimationFrame and a slow interval for hidden tabs) that
+resolves as soon as the element satisfies the requested condition.
+"""
+
+import time
+import weakref
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from utils.instrumentation import count_poll
+
+try:
+    from selenium.common.exceptions import ScriptTimeoutException
+except ImportError:
+    # Selenium 4.1 reports script timeouts as a plain TimeoutException
+    ScriptTimeoutException = TimeoutException
+
+# Resolves a Selenium (strategy, selector) locator to the first matching element, or null
+FIND_ELEMENT_JS = """
+function findElement(strategy, selector) {
+    switch (strategy) {
+        case "id":
+            return document.getElementById(selector);
+        case "css selector":
+            return document.querySelector(selector);
+        case "xpath":
+            return document.evaluate(
+                selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        case "link text":
+            return Array.from(document.querySelectorAll("a")).find(
+                (link) => link.innerText.trim() === selector
+            ) || null;
+        case "partial link text":
+            return Array.from(document.querySelectorAll("a")).find(
+                (link) => link.innerText.includes(selector)
+            ) || null;
+        case "name":
+            return document.querySelector(`[name="${CSS.escape(selector)}"]`);
+        case "tag name":
+            return document.getElementsByTagName(selector)[0] || null;
+        case "class name":
+            return document.getElementsByClassName(selector)[0] || null;
+    }
+    throw new Error(`Unsupported locator strategy: ${strategy}`);
+}
+
+function isVisible(element) {
+    if (!element.isConnected || element.getClientRects().length === 0) {
+        return false;
+    }
+    const style = window.getComputedStyle(element);
+    return style.visibility !== "hidden" && Number(style.opacity) !== 0;
+}
+
+function meetsCondition(element, condition) {
+    if (!element) {
+        return false;
+    }
+    if (condition === "present") {
+        return true;
+    }
+    if (!isVisible(element)) {
+        return false;
+    }
+    return condition !== "clickable" || !element.disabled;
+}
+"""
+
+WAIT_FOR_ELEMENTS_JS = (
+    FIND_ELEMENT_JS
+    + """
+const [specs, timeoutMs, done] = arguments;
+
+// Returns the elements of all [strategy, selector, condition] specs once every one is met
+function check() {
+    const elements = [];
+    for (const [strategy, selector, condition] of specs) {
+        const element = findElement(strategy, selector);
+        if (!meetsCondition(element, condition)) return null;
+        elements.push(element);
+    }
+    return elements;
+}
+
+const found = check();
+if (found) {
+    done(found);
+} else {
+    let finished = false;
+    const observer = new MutationObserver(() => {
+        const elements = check();
+        if (elements) finish(elements);
+    });
+    const finish = (result) => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        clearInterval(interval);
+        done(result);
+    };
+    observer.observe(document.documentElement || document, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        characterData: true,
+    });
+    // Layout-only changes (e.g. CSS transitions) do not mutate the DOM
+    const tick = () => {
+        if (finished) return;
+        const elements = check();
+        if (elements) return finish(elements);
+        window.requestAnimationFrame(tick);
+    };
+    window.requestAnimationFrame(tick);
+    // requestAnimationFrame does not fire in background tabs
+    const interval = setInterval(() => {
+        const elements = check();
+        if (elements) finish(elements);
+    }, 100);
+    const timer = setTimeout(() => finish(null), timeoutMs);
+}
+"""
+)
+
+# Sets the value of each element the way typing would, firing input and change events
+SET_VALUES_JS = """
+const [elements, values] = arguments;
+elements.forEach((element, index) => {
+    const prototype = Object.getPrototypeOf(element);
+    const setter = Object.getOwnPropertyDescriptor(prototype, "value").set;
+    element.focus();
+    setter.call(element, values[index]);
+    element.dispatchEvent(new Event("input", { bubbles: true }));
+    element.dispatchEvent(new Event("change", { bubbles: true }));
+    element.blur();
+});
+"""
+
+# Returns the elements of all [strategy, selector, condition] specs if every one is met right
+# now, or null
+CHECK_ELEMENTS_JS = FIND_ELEMENT_JS + """
+const elements = [];
+for (const [strategy, selector, condition] of arguments[0]) {
+    const element = findElement(strategy, selector);
+    if (!meetsCondition(element, condition)) return null;
+    elements.push(element);
+}
+return elements;
+"""
+
+# Checks whether an already located element still meets a condition, in one round-trip
+CHECK_ELEMENT_JS = FIND_ELEMENT_JS + """
+return meetsCondition(arguments[0], arguments[1]);
+"""
+
+# Resolves once no resource has finished loading for idleMs, or false on timeout
+NETWORK_IDLE_JS = """
+const [idleMs, timeoutMs, done] = arguments;
+let idleTimer = null;
+const observer = new PerformanceObserver(() => restart());
+const timer = setTimeout(() => finish(false), timeoutMs);
+function finish(result) {
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(timer);
+    done(result);
+}
+function restart() {
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => finish(true), idleMs);
+}
+observer.observe({ type: "resource", buffered: false });
+restart();
+"""
+
+# Extra seconds granted to the WebDriver script timeout over the in-page timer
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# Script errors reported by chromedriver when a navigation replaces the document of a script
+NAVIGATION_ERRORS = (
+    "document unloaded",
+    "execution context was destroyed",
+    "cannot find context with specified id",
+    "inspected target navigated or closed",
+)
+
+
+def is_navigation_error(error):
+    """Return True if a JavascriptException was caused by the document being replaced."""
+    message = (getattr(error, "msg", None) or str(error)).lower()
+    return any(fragment in message for fragment in NAVIGATION_ERRORS)
+
+
+# Async script timeout last set on each driver by this module. Anything else may change it
+# behind our back, a script timeout before the deadline therefore resets the entry.
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _ensure_script_timeout(driver, timeout):
+    """Raise the driver's async script timeout if needed, skipping the round-trip otherwise."""
+    required = timeout + SCRIPT_TIMEOUT_MARGIN
+    if _script_timeouts.get(driver, 0) < required:
+        driver.set_script_timeout(required)
+        _script_timeouts[driver] = required
+
+
+def dom_conditions_met(specs):
+    """
+    Build a WebDriverWait condition checking every element of `specs` in one script call.
+
+    Args:
+        specs (list): (locator, condition) pairs, condition being "present", "visible"
+            or "clickable".
+
+    Returns:
+        callable: Takes the driver and returns the elements, in the order of `specs`, or
+            None if any condition is not met yet.
+    """
+    js_specs = [[strategy, selector, condition] for (strategy, selector), condition in specs]
+
+    def check(driver):
+        return driver.execute_script(CHECK_ELEMENTS_JS, js_specs)
+
+    return check
+
+
+class DomConditionsWait:
+    """
+    Deadline, script arguments and error classification of an in-page wait.
+
+    The wait loop of wait_for_dom_conditions() and of AsyncBasePage only differ by how they
+    run WAIT_FOR_ELEMENTS_JS, sleep and set the script timeout. Everything else is decided
+    here, so that both retry and fail on the same errors.
+    """
+
+    # What to do after an attempt failed with an error that does not end the wait
+    RETRY_AFTER_NAVIGATION = "navigation"
+    RETRY_WITH_SCRIPT_TIMEOUT = "script_timeout"
+
+    # Pause before watching the document that replaced the previous one
+    NAVIGATION_RETRY_DELAY = 0.05
+
+    def __init__(self, specs, timeout, clock):
+        """
+        Start the wait.
+
+        Args:
+            specs (list): (locator, condition) pairs, condition being "present", "visible"
+                or "clickable".
+            timeout (float): Maximum time to wait in seconds.
+            clock (callable): Monotonic clock of the caller, in seconds.
+        """
+        self.specs = specs
+        self.timeout = timeout
+        self.js_specs = [
+            [strategy, selector, condition] for (strategy, selector), condition in specs
+        ]
+        self._clock = clock
+        self._deadline = clock() + timeout
+
+    def script_args(self):
+        """
+        Return the arguments of WAIT_FOR_ELEMENTS_JS for the next attempt.
+
+        Returns:
+            tuple: The specs and the remaining time in milliseconds, or None once the
+                deadline has passed.
+        """
+        remaining = self._deadline - self._clock()
+        if remaining <= 0:
+            return None
+        return self.js_specs, int(remaining * 1000)
+
+    def retry_reason(self, error):
+        """
+        Classify the error raised by an attempt.
+
+        Args:
+            error (WebDriverException): The error raised by the script.
+
+        Returns:
+            str: RETRY_AFTER_NAVIGATION if the document was replaced while waiting,
+                RETRY_WITH_SCRIPT_TIMEOUT if the script timeout was lowered by someone else
+                and must be set again.
+
+        Raises:
+            WebDriverException: The error itself, if it ends the wait, e.g. an invalid XPath
+                or an unsupported locator strategy.
+        """
+        if isinstance(error, JavascriptException):
+            if is_navigation_error(error):
+                return self.RETRY_AFTER_NAVIGATION
+        elif isinstance(error, (ScriptTimeoutException, TimeoutException)):
+            return self.RETRY_WITH_SCRIPT_TIMEOUT
+        raise error
+
+    def timeout_error(self):
+        """Return the TimeoutException raised when the conditions are not met in time."""
+        return TimeoutException(f"Elements {self.specs} not ready after {self.timeout} seconds")
+
+
+def wait_for_dom_conditions(driver, specs, timeout):
+    """
+    Wait inside the page until every element of `specs` meets its condition.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        specs (list): (locator, condition) pairs, condition being "present", "visible"
+            or "clickable".
+        timeout (float): Maximum time to wait in seconds.
+
+    Returns:
+        list: The found elements, in the order of `specs`.
+
+    Raises:
+        TimeoutException: If the conditions are not all met within the timeout.
+        JavascriptException: If the script fails for another reason than a navigation,
+            e.g. an invalid XPath or an unsupported locator strategy.
+    """
+    wait = DomConditionsWait(specs, timeout, time.monotonic)
+    _ensure_script_timeout(driver, timeout)
+
+    while True:
+        args = wait.script_args()
+        if args is None:
+            raise wait.timeout_error()
+        count_poll()
+        try:
+            elements = driver.execute_async_script(WAIT_FOR_ELEMENTS_JS, *args)
+        except WebDriverException as error:
+            if wait.retry_reason(error) == wait.RETRY_AFTER_NAVIGATION:
+                time.sleep(wait.NAVIGATION_RETRY_DELAY)
+            else:
+                _script_timeouts.pop(driver, None)
+                _ensure_script_timeout(driver, timeout)
+            continue
+        if elements:
+            return elements
+        raise wait.timeout_error()
+
+
+def wait_for_dom_condition(driver, locator, condition, timeout):
+    """
+    Wait inside the page until the element located by `locator` meets `condition`.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        locator (tuple): Element locator (By strategy, selector).
+        condition (str): One of "present", "visible" or "clickable".
+        timeout (float): Maximum time to wait in seconds.
+
+    Returns:
+        WebElement: The found element.
+
+    Raises:
+        TimeoutException: If the condition is not met within the timeout.
+    """
+    try:
+        return wait_for_dom_conditions(driver, [(locator, condition)], timeout)[0]
+    except TimeoutException:
+        raise TimeoutException(
+            f"Element {locator} not {condition} after {timeout} seconds"
+        ) from None
+
+
+def wait_for_network_idle(driver, idle_ms, timeout):
+    """
+    Wait until no resource has finished loading in the page for `idle_ms` milliseconds.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        idle_ms (int): Quiet period in milliseconds.
+        timeout (float): Maximum time to wait in seconds.
+
+    Raises:
+        TimeoutException: If the network does not become idle within the timeout.
+    """
+    _ensure_script_timeout(driver, timeout)
+    try:
+        idle = driver.execute_async_script(NETWORK_IDLE_JS, idle_ms, int(timeout * 1000))
+    except (ScriptTimeoutException, TimeoutException):
+        _script_timeouts.pop(driver, None)
+        idle = False
+    if not idle:
+        raise TimeoutException(f"Network not idle for {idle_ms}ms after {timeout} seconds")
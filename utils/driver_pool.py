@@ -0,0 +1,269 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from config import Config
+from utils.instrumentation import count_commands
+from utils.webdriver_factory import WebDriverFactory
+
+logger = logging.getLogger(__name__)
+
+# Idle slot whose driver could not be relaunched, launched again by the next acquire()
+_EMPTY_SLOT = object()
+
+
+class DriverPool:
+    """
+    Keeps a fixed number of pre-launched WebDriver instances warm and hands them out on demand.
+
+    Drivers are reset between uses (cookies, storage, extra windows, about:blank) and are
+    recycled once they reach the configured number of uses or stop responding. If a
+    replacement fails to launch, its slot stays in the pool and the launch is retried by the
+    next acquire(). The peak memory (PSS) of each local driver, sampled at every release, is
+    logged when it quits.
+    """
+
+    def __init__(self, size=None, max_uses=None, factory=None):
+        """
+        Initialize the driver pool.
+
+        Args:
+            size (int, optional): Number of drivers kept warm. Defaults to Config.DRIVER_POOL_SIZE.
+            max_uses (int, optional): Uses after which a driver is recycled. Defaults to Config.DRIVER_MAX_USES.
+            factory (callable, optional): Callable returning a new WebDriver. Defaults to WebDriverFactory.get_driver.
+        """
+        self.size = size or Config.DRIVER_POOL_SIZE
+        self.max_uses = max_uses or Config.DRIVER_MAX_USES
+        self.factory = factory or WebDriverFactory.get_driver
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._peak_memory = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """
+        Launch all drivers of the pool concurrently and return the pool.
+
+        Raises:
+            Exception: The first launch error; the drivers that did launch are quit.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._launch) for _ in range(self.size)]
+        errors = [future.exception() for future in futures if future.exception()]
+        if errors:
+            for future in futures:
+                if not future.exception():
+                    self._quit(future.result())
+            raise errors[0]
+        for future in futures:
+            self._idle.put(future.result())
+        logger.info(f"Driver pool started with {self.size} warm browser(s).")
+        return self
+
+    def acquire(self, timeout=None):
+        """
+        Take a driver out of the pool, replacing it first if it is no longer responsive.
+
+        Args:
+            timeout (int, optional): Seconds to wait for an idle driver. Defaults to Config.EXPLICIT_WAIT.
+
+        Returns:
+            WebDriver: A clean driver ready for use.
+
+        Raises:
+            RuntimeError: If the pool is closed or no driver became available in time.
+            WebDriverException: If the driver of an empty slot could not be launched.
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        try:
+            driver = self._idle.get(timeout=timeout or Config.EXPLICIT_WAIT)
+        except queue.Empty:
+            raise RuntimeError("No idle driver available in the pool") from None
+
+        if driver is not _EMPTY_SLOT and not self._is_alive(driver):
+            logger.warning("Pooled driver is unresponsive, launching a replacement.")
+            self._quit(driver)
+            driver = _EMPTY_SLOT
+        if driver is _EMPTY_SLOT:
+            try:
+                driver = self._launch()
+            except Exception:
+                # Keep the slot so that the pool does not shrink for the rest of the session
+                self._idle.put(_EMPTY_SLOT)
+                raise
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        """
+        Return a driver to the pool after resetting it.
+
+        Args:
+            driver (WebDriver): The driver previously obtained through acquire().
+            broken (bool, optional): Force the driver to be recycled. Defaults to False.
+        """
+        self._sample_memory(driver)
+        if self._closed:
+            self._quit(driver)
+            return
+
+        if broken or self._uses[id(driver)] >= self.max_uses:
+            logger.info("Recycling pooled driver.")
+            driver = self._replace(driver)
+        else:
+            try:
+                self.reset(driver)
+            except WebDriverException:
+                logger.warning("Failed to reset pooled driver, recycling it.")
+                driver = self._replace(driver)
+        self._idle.put(driver)
+
+    @staticmethod
+    def reset(driver):
+        """Bring a driver back to a blank state: single window, no cookies, no storage, about:blank."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script(
+                "window.localStorage.clear(); window.sessionStorage.clear();"
+            )
+        except WebDriverException:
+            # Storage is not accessible on opaque origins such as about:blank
+            pass
+        driver.get("about:blank")
+
+    def close(self):
+        """Quit every driver held by the pool."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not _EMPTY_SLOT:
+                self._quit(driver)
+        logger.info("Driver pool closed.")
+
+    def _launch(self):
+        # Drivers of a custom factory are counted too, counting twice is a no-op
+        driver = count_commands(self.factory())
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _replace(self, driver):
+        self._quit(driver)
+        try:
+            return self._launch()
+        except Exception:
+            logger.exception("Failed to launch a replacement driver, retrying on next acquire.")
+            return _EMPTY_SLOT
+
+    def _sample_memory(self, driver):
+        memory = WebDriverFactory.get_driver_memory(driver)
+        if memory is None:
+            return
+        with self._lock:
+            self._peak_memory[id(driver)] = max(memory, self._peak_memory.get(id(driver), 0))
+
+    def _quit(self, driver):
+        with self._lock:
+            uses = self._uses.pop(id(driver), None)
+            peak_memory = self._peak_memory.pop(id(driver), None)
+        if peak_memory is not None:
+            logger.info(
+                f"Driver peak PSS: {peak_memory / (1024 * 1024):.0f} MiB over {uses} use(s)."
+            )
+        try:
+            driver.quit()
+        except WebDriverException:
+            logger.warning("Driver did not quit cleanly.")
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+        except WebDriverException:
+            return False
+        return True
+
+
+class DriverPoolLauncher:
+    """
+    Starts a DriverPool on a background thread, so the browsers launch while pytest collects.
+
+    The session fixture takes the pool once it is needed; if no selected test uses a driver
+    the launch is cancelled, or the pool closed as soon as it has started. A failed launch is
+    logged as soon as it happens and retried once, synchronously, by take().
+    """
+
+    def __init__(self, factory=DriverPool):
+        """
+        Start launching the pool.
+
+        Args:
+            factory (callable, optional): Callable returning a new, not yet started, pool.
+        """
+        self._factory = factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="driver-pool-launcher"
+        )
+        self._future = self._executor.submit(lambda: factory().start())
+        self._future.add_done_callback(self._log_failure)
+        self._claimed = False
+
+    def take(self):
+        """
+        Wait for the pool to be started and hand it over; the caller closes it.
+
+        Returns:
+            DriverPool: The started pool.
+
+        Raises:
+            Exception: The error raised while starting the pool again after a failed
+                       background launch.
+        """
+        self._claimed = True
+        if self._future.exception() is None:
+            return self._future.result()
+        logger.warning("Starting the browser pool again after the failed background launch.")
+        return self._factory().start()
+
+    def discard(self):
+        """Cancel the launch, or close the pool once it has started, unless it was taken."""
+        if self._claimed:
+            return
+        self._claimed = True
+        if self._future.cancel():
+            logger.info("Cancelled the browser pre-launch, no selected test needs a driver.")
+            return
+        self._future.add_done_callback(self._close_started_pool)
+
+    def shutdown(self):
+        """Discard the pool if nobody took it and wait for the launcher thread to finish."""
+        self.discard()
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(
+                "Background browser pool launch failed.", exc_info=future.exception()
+            )
+
+    @staticmethod
+    def _close_started_pool(future):
+        if future.exception() is None:
+            future.result().close()
+            logger.info("Closed the pre-launched browser pool, it was not used.")
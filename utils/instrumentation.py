@@ -0,0 +1,415 @@
+"""
+Timing instrumentation for page object actions.
+
+Every decorated BasePage call records its wall time, the number of WebDriver commands it
+sent and the number of wait polls it made, tagged with the page class, the LOCATORS key
+and the nodeid of the running test.
+
+Only the records of the running test are kept. Top-level actions are folded into
+per page/action/locator statistics (the percentiles use the last MAX_DURATIONS samples of
+each group) and a short list of the slowest actions, so memory does not grow with the
+session. The individual records are also written by the structured log pipeline.
+"""
+
+import collections
+import functools
+import glob
+import heapq
+import html
+import itertools
+import json
+import logging
+import math
+import threading
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+_local = threading.local()
+
+# Logger of the per-action records, only written by the structured log pipeline
+ACTION_LOGGER_NAME = "page_actions"
+_action_logger = logging.getLogger(ACTION_LOGGER_NAME)
+
+# Durations kept per page/action/locator for the percentiles of the summary
+MAX_DURATIONS = 1000
+
+# Slowest top-level actions kept for the summary
+SLOWEST_ACTIONS = 10
+
+
+class ActionRecorder:
+    """Collects the action records of the current process."""
+
+    def __init__(self):
+        self.records = []
+        self.nodeid = None
+        self._groups = {}
+        self._slowest = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def start_test(self, nodeid):
+        """Tag the records added from now on with `nodeid` and forget the previous test's."""
+        with self._lock:
+            self.nodeid = nodeid
+            self.records = []
+
+    def finish_test(self):
+        """Forget the records of the test that just finished."""
+        with self._lock:
+            self.nodeid = None
+            self.records = []
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            if record["nested"]:
+                return
+            _fold(self._groups, record)
+            entry = (record["duration"], next(self._sequence), record)
+            if len(self._slowest) < SLOWEST_ACTIONS:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    def test_summary(self, slowest=3):
+        """
+        Summarize the top-level actions of the running test.
+
+        Args:
+            slowest (int): Number of slowest actions to include.
+
+        Returns:
+            dict: Number of actions, their total seconds, commands and polls, and the slowest
+                  actions; None if the test did not record any.
+        """
+        with self._lock:
+            top_level = [record for record in self.records if not record["nested"]]
+        if not top_level:
+            return None
+        return {
+            "count": len(top_level),
+            "total": round(sum(record["duration"] for record in top_level), 3),
+            "commands": sum(record["commands"] for record in top_level),
+            "polls": sum(record["polls"] for record in top_level),
+            "slowest": [
+                {
+                    field: record[field]
+                    for field in ("page", "action", "locator", "duration", "commands")
+                }
+                for record in heapq.nlargest(
+                    slowest, top_level, key=lambda record: record["duration"]
+                )
+            ],
+        }
+
+    def has_records(self):
+        """Return True if any top-level action was recorded in this process."""
+        return bool(self._groups)
+
+    def summary(self, slowest=SLOWEST_ACTIONS):
+        """
+        Summarize the top-level actions (actions not called from another action).
+
+        Args:
+            slowest (int): Number of slowest actions to include.
+
+        Returns:
+            dict: The slowest actions and duration percentiles per page/action/locator.
+        """
+        with self._lock:
+            return summarize(
+                self._groups.values(), [record for _, _, record in self._slowest], slowest
+            )
+
+    def write_json(self, path):
+        """Write the per-locator statistics and the slowest actions to a JSON file."""
+        with self._lock:
+            _write_statistics(
+                path, self._groups.values(), [record for _, _, record in self._slowest]
+            )
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _fold(groups, record):
+    """Add a top-level action record to the statistics of its page/action/locator."""
+    key = (record["page"], record["action"], record["locator"])
+    group = groups.get(key)
+    if group is None:
+        group = groups[key] = {
+            "page": record["page"],
+            "action": record["action"],
+            "locator": record["locator"],
+            "count": 0,
+            "total": 0.0,
+            "commands": 0,
+            "polls": 0,
+            "durations": collections.deque(maxlen=MAX_DURATIONS),
+        }
+    group["count"] += 1
+    group["total"] += record["duration"]
+    group["commands"] += record["commands"]
+    group["polls"] += record["polls"]
+    group["durations"].append(record["duration"])
+
+
+def _write_statistics(path, groups, slowest):
+    groups = [dict(group, durations=list(group["durations"])) for group in groups]
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump({"groups": groups, "slowest": slowest}, json_file)
+
+
+def summarize(groups, slowest_records, slowest=SLOWEST_ACTIONS):
+    """
+    Build the summary of the top-level actions.
+
+    Args:
+        groups (iterable): Per page/action/locator statistics, as folded by ActionRecorder.
+        slowest_records (list): Candidate records for the slowest actions.
+        slowest (int): Number of slowest actions to include.
+
+    Returns:
+        dict: "slowest" actions and "per_locator" statistics.
+    """
+    per_locator = [
+        {
+            "page": group["page"],
+            "action": group["action"],
+            "locator": group["locator"],
+            "count": group["count"],
+            "p50": percentile(group["durations"], 50),
+            "p95": percentile(group["durations"], 95),
+            "total": group["total"],
+            "commands": group["commands"],
+            "polls": group["polls"],
+        }
+        for group in groups
+    ]
+    per_locator.sort(key=lambda row: row["total"], reverse=True)
+
+    return {
+        "slowest": sorted(slowest_records, key=lambda r: r["duration"], reverse=True)[
+            :slowest
+        ],
+        "per_locator": per_locator,
+    }
+
+
+def merge_action_files(pattern, path):
+    """
+    Merge the action statistics of several processes (e.g. xdist workers) into one JSON file.
+
+    Args:
+        pattern (str): Glob pattern of the per-process JSON files.
+        path (str): Path of the merged JSON file.
+
+    Returns:
+        dict: The summary of the merged statistics, or None if there was nothing to merge.
+    """
+    groups = {}
+    slowest = []
+    for source in sorted(glob.glob(pattern)):
+        with open(source, encoding="utf-8") as json_file:
+            statistics = json.load(json_file)
+        slowest.extend(statistics["slowest"])
+        for group in statistics["groups"]:
+            key = (group["page"], group["action"], group["locator"])
+            merged = groups.setdefault(
+                key,
+                dict(
+                    group,
+                    count=0,
+                    total=0.0,
+                    commands=0,
+                    polls=0,
+                    durations=collections.deque(maxlen=MAX_DURATIONS),
+                ),
+            )
+            for field in ("count", "total", "commands", "polls"):
+                merged[field] += group[field]
+            merged["durations"].extend(group["durations"])
+    if not groups:
+        return None
+    slowest = sorted(slowest, key=lambda r: r["duration"], reverse=True)[:SLOWEST_ACTIONS]
+    _write_statistics(path, groups.values(), slowest)
+    return summarize(groups.values(), slowest)
+
+
+def render_summary_html(summary, rows=20):
+    """Render an action summary as HTML tables for the pytest-html report."""
+
+    def table(headers, lines):
+        head = "".join(f"<th>{header}</th>" for header in headers)
+        body = "".join(
+            "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in line) + "</tr>"
+            for line in lines
+        )
+        return f"<table><tr>{head}</tr>{body}</table>"
+
+    slowest = table(
+        ["Test", "Page", "Action", "Locator", "Seconds", "Commands", "Polls"],
+        [
+            (
+                r["nodeid"],
+                r["page"],
+                r["action"],
+                r["locator"],
+                f"{r['duration']:.3f}",
+                r["commands"],
+                r["polls"],
+            )
+            for r in summary["slowest"]
+        ],
+    )
+    per_locator = table(
+        ["Page", "Action", "Locator", "Count", "p50 (s)", "p95 (s)", "Total (s)", "Commands"],
+        [
+            (
+                r["page"],
+                r["action"],
+                r["locator"],
+                r["count"],
+                f"{r['p50']:.3f}",
+                f"{r['p95']:.3f}",
+                f"{r['total']:.3f}",
+                r["commands"],
+            )
+            for r in summary["per_locator"][:rows]
+        ],
+    )
+    return (
+        f"<h2>Slowest page actions</h2>{slowest}"
+        f"<h2>Page actions per locator</h2>{per_locator}"
+    )
+
+
+recorder = ActionRecorder()
+
+
+class _CommandCounter:
+    """Replaces the `execute` method of one driver, counting the commands sent through it."""
+
+    def __init__(self, execute):
+        self._execute = execute
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        # Pooled drivers are used from several threads over their lifetime
+        with self._lock:
+            self.count += 1
+        return self._execute(*args, **kwargs)
+
+
+def count_commands(driver):
+    """
+    Count the commands sent by `driver` from now on, see _command_count().
+
+    Only this instance is wrapped, the WebDriver class is left untouched. Counting a driver
+    that is already counted does nothing.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        WebDriver: The same driver.
+    """
+    if not isinstance(driver.execute, _CommandCounter):
+        driver.execute = _CommandCounter(driver.execute)
+    return driver
+
+
+def _command_count(driver):
+    """Return the number of commands sent by `driver` since count_commands(), or 0."""
+    execute = getattr(driver, "execute", None)
+    return execute.count if isinstance(execute, _CommandCounter) else 0
+
+
+def count_poll():
+    """Count one wait poll for the actions currently running on this thread."""
+    _local.polls = getattr(_local, "polls", 0) + 1
+
+
+class CountingWait(WebDriverWait):
+    """WebDriverWait that reports each evaluation of its condition to the recorder."""
+
+    def until(self, method, message=""):
+        def counted(driver):
+            count_poll()
+            return method(driver)
+
+        return super().until(counted, message)
+
+
+def locator_name(page, locator):
+    """Return the LOCATORS key of `locator` on `page`, or "strategy=selector" if it has none."""
+    for key, value in page.LOCATORS.items():
+        if value == locator:
+            return key
+    return f"{locator[0]}={locator[1]}"
+
+
+def current_action():
+    """Return the (page, action) of the innermost action running on this thread, or (None, None)."""
+    actions = getattr(_local, "actions", None)
+    return actions[-1] if actions else (None, None)
+
+
+def _locator_key(page, args, kwargs):
+    locator = kwargs.get("locator", args[0] if args else None)
+    if isinstance(locator, dict):
+        return ",".join(locator)
+    if not isinstance(locator, tuple):
+        return None
+    return locator_name(page, locator)
+
+
+def instrumented(method):
+    """Decorator recording the duration, commands and polls of a BasePage method."""
+
+    @functools.wraps(method)
+    def wrapper(page, *args, **kwargs):
+        depth = getattr(_local, "depth", 0)
+        polls_before = getattr(_local, "polls", 0)
+        commands_before = _command_count(page.driver)
+        _local.depth = depth + 1
+        if depth == 0:
+            _local.actions = []
+        _local.actions.append((type(page).__name__, method.__name__))
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = method(page, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            _local.depth = depth
+            _local.actions.pop()
+            record = {
+                "nodeid": recorder.nodeid,
+                "page": type(page).__name__,
+                "action": method.__name__,
+                "locator": _locator_key(page, args, kwargs),
+                "duration": duration,
+                "commands": _command_count(page.driver) - commands_before,
+                "polls": getattr(_local, "polls", 0) - polls_before,
+                "nested": depth > 0,
+                "ok": ok,
+            }
+            recorder.add(record)
+            if _action_logger.handlers:
+                _action_logger.info(
+                    f"{record['page']}.{record['action']} "
+                    f"{'ok' if ok else 'failed'} in {duration:.3f}s",
+                    extra=record,
+                )
+
+    return wrapper
@@ -0,0 +1,174 @@
+"""
+Non-blocking logging for the test session.
+
+Log records are put on an in-memory queue by the logging call and written by a background
+listener thread, so formatting (including tracebacks) and file I/O stay off the test's
+critical path. Each process writes:
+
+- logs/log_<timestamp><suffix>.jsonl: one compact JSON object per record, rotated by size,
+  carrying the test nodeid, xdist worker and, for page actions, the page, action, locator
+  and duration;
+- the usual text log (when the log file name is generated by conftest.py), in the format of
+  pytest.ini, in place of pytest's own synchronous file handler.
+
+Query the JSON lines with any JSON tool, e.g. the slowest actions of a test:
+
+    jq -c 'select(.nodeid == "tests/test_login_tabs.py::test_login_scenarios_in_tabs"
+                  and .duration) | [.duration, .page, .action]' logs/log_<timestamp>.jsonl
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+
+from config import Config
+from utils.artifact_writer import ARTIFACT_LOGGER_NAME
+from utils.instrumentation import ACTION_LOGGER_NAME, current_action, recorder
+
+# Record attributes copied into the JSON object when they are set
+CONTEXT_FIELDS = ("nodeid", "worker", "page", "action", "locator", "duration")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object."""
+
+    def format(self, record):
+        entry = {
+            "ts": f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Tags records with the running test, the worker and the page action being performed."""
+
+    def __init__(self, worker=None):
+        super().__init__()
+        self.worker = worker
+
+    def filter(self, record):
+        if getattr(record, "nodeid", None) is None:
+            record.nodeid = recorder.nodeid
+        record.worker = self.worker
+        if getattr(record, "page", None) is None:
+            record.page, record.action = current_action()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records as they are; the traceback is formatted by the listener."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _Flush:
+    """Queue marker set once every record queued before it has been written."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _Listener(logging.handlers.QueueListener):
+    def handle(self, record):
+        if isinstance(record, _Flush):
+            for handler in self.handlers:
+                handler.flush()
+            record.done.set()
+            return
+        super().handle(record)
+
+
+class LogPipeline:
+    """Root logger handler writing JSON lines (and optionally text) from a background thread."""
+
+    def __init__(
+        self,
+        json_path,
+        worker=None,
+        text_path=None,
+        text_format=None,
+        date_format=None,
+        level=logging.INFO,
+    ):
+        """
+        Initialize the pipeline; call start() to install it.
+
+        Args:
+            json_path (str): Path of the JSON lines file, rotated by Config.LOG_JSON_MAX_BYTES.
+            worker (str, optional): xdist worker id written in every record.
+            text_path (str, optional): Path of a text log to write as well.
+            text_format (str, optional): Format of the text log records.
+            date_format (str, optional): Date format of the text log records.
+            level (int): Minimum level of the records written.
+        """
+        self.level = level
+        self._queue = queue.SimpleQueue()
+        self._handler = _QueueHandler(self._queue)
+        self._handler.addFilter(ContextFilter(worker))
+
+        json_handler = logging.handlers.RotatingFileHandler(
+            json_path,
+            maxBytes=Config.LOG_JSON_MAX_BYTES,
+            backupCount=Config.LOG_JSON_BACKUPS,
+            encoding="utf-8",
+        )
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers = [json_handler]
+        if text_path:
+            text_handler = logging.FileHandler(text_path, mode="w", encoding="utf-8")
+            text_handler.setFormatter(logging.Formatter(text_format, date_format))
+            text_handler.addFilter(lambda record: record.name != ACTION_LOGGER_NAME)
+            handlers.append(text_handler)
+        self._listener = _Listener(self._queue, *handlers)
+        self._previous_root_level = None
+
+    def start(self):
+        """Start the listener thread and install the queue handler, and return the pipeline."""
+        self._listener.start()
+        root = logging.getLogger()
+        self._previous_root_level = root.level
+        if root.level == logging.NOTSET or root.level > self.level:
+            root.setLevel(self.level)
+        root.addHandler(self._handler)
+
+        # Page action timings only go to the pipeline, not to the console or text log
+        action_logger = logging.getLogger(ACTION_LOGGER_NAME)
+        action_logger.propagate = False
+        action_logger.setLevel(logging.INFO)
+        action_logger.addHandler(self._handler)
+
+        # Records of the artifact writer thread, kept away from pytest's per-test capture
+        logging.getLogger(ARTIFACT_LOGGER_NAME).addHandler(self._handler)
+        return self
+
+    def flush(self):
+        """Block until every record logged so far has been written."""
+        marker = _Flush()
+        self._queue.put(marker)
+        marker.done.wait()
+
+    def stop(self):
+        """Uninstall the handler, write the remaining records and close the files."""
+        logging.getLogger().removeHandler(self._handler)
+        logging.getLogger(ACTION_LOGGER_NAME).removeHandler(self._handler)
+        logging.getLogger(ARTIFACT_LOGGER_NAME).removeHandler(self._handler)
+        logging.getLogger().setLevel(self._previous_root_level)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
@@ -0,0 +1,222 @@
+"""
+Data-driven login scenarios run against a single Canvas Network login form.
+
+Scenarios are read from a CSV table with the columns id, username, password and
+expected_message. Credentials naming one of
+the CREDENTIAL_KEYS (e.g. INVALID_USERNAME) are resolved from Config, other values that look
+like a Config key are rejected, and empty ones are not typed.
+
+The runner navigates to the login form once, then for every scenario resets the form,
+submits it and reads the flash message, going back in history to the form afterwards. The
+form is only reopened (from its checkpoint) when going back does not show it.
+
+run_in_tabs() runs the scenarios interleaved in several tabs of the same browser instead,
+see utils/tab_scheduler.py, and login_async() runs one on an AsyncWebDriver.
+"""
+
+import csv
+import logging
+import re
+
+from config import Config
+from pages.async_canvas_accountpage import AsyncCanvasAccountPage
+from pages.async_canvas_loginpage import AsyncCanvasLoginPage
+from pages.async_homepage import AsyncHomepage
+from pages.canvas_accountpage import CanvasAccountPage
+from pages.canvas_loginpage import CanvasLoginPage
+from utils.tab_scheduler import TabScheduler
+
+logger = logging.getLogger(__name__)
+
+# Config attributes a scenario may name as its username or password
+CREDENTIAL_KEYS = ("VALID_USERNAME", "VALID_PASSWORD", "INVALID_USERNAME", "INVALID_PASSWORD")
+
+_CONFIG_KEY = re.compile(r"[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+")
+
+
+class LoginScenario:
+    """A row of the login scenario table."""
+
+    def __init__(self, id, username, password, expected_message):
+        self.id = id
+        self.username = username
+        self.password = password
+        self.expected_message = expected_message
+
+    def __repr__(self):
+        return f"LoginScenario({self.id!r})"
+
+
+def _credential(value):
+    value = value.strip()
+    if not value:
+        return None
+    if value in CREDENTIAL_KEYS:
+        return getattr(Config, value)
+    if _CONFIG_KEY.fullmatch(value):
+        raise ValueError(
+            f"Unknown credential key {value!r}, expected one of {', '.join(CREDENTIAL_KEYS)}"
+        )
+    return value
+
+
+def load_scenarios(path):
+    """
+    Load the login scenarios of a CSV table.
+
+    Args:
+        path (str): Path of the CSV file.
+
+    Returns:
+        list: LoginScenario instances, in file order.
+
+    Raises:
+        ValueError: If a credential names a Config key outside CREDENTIAL_KEYS.
+    """
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        return [
+            LoginScenario(
+                row["id"],
+                _credential(row["username"]),
+                _credential(row["password"]),
+                row["expected_message"],
+            )
+            for row in csv.DictReader(csv_file)
+        ]
+
+
+class LoginMatrixRunner:
+    """Runs login scenarios one after another in the same browser."""
+
+    def __init__(self, driver, app_url, timeout=None):
+        """
+        Initialize the runner.
+
+        Args:
+            driver (WebDriver): The WebDriver instance shared by all scenarios.
+            app_url (str): The URL of the application homepage.
+            timeout (int, optional): Timeout of the page objects. Defaults to Config.EXPLICIT_WAIT.
+        """
+        self.driver = driver
+        self.app_url = app_url
+        self.timeout = timeout or Config.EXPLICIT_WAIT
+        self.account_page = CanvasAccountPage(driver, self.timeout)
+        self._form_opened = False
+
+    def _ensure_login_form(self):
+        email_textbox = CanvasAccountPage.LOCATORS["email_textbox"]
+        if self._form_opened and self.account_page.is_element_displayed(
+            email_textbox, timeout=Config.CHECKPOINT_VERIFY_TIMEOUT
+        ):
+            self.account_page.reset_login_form()
+            return
+        logger.info("Opening the Canvas Network login form")
+        self.account_page.open_login_form(self.app_url)
+        self._form_opened = True
+
+    def run(self, scenario):
+        """
+        Submit the login form with the credentials of a scenario.
+
+        Args:
+            scenario (LoginScenario): The scenario to run.
+
+        Returns:
+            str: The flash message displayed after the submission.
+        """
+        self._ensure_login_form()
+        self.account_page.click_login_button(scenario.username, scenario.password)
+        logger.info(f"Submitted login scenario {scenario.id}")
+        message = CanvasLoginPage(self.driver, self.timeout).get_flash_error_message()
+
+        # The form page is usually restored from the back-forward cache without a reload
+        self.driver.back()
+        return message
+
+
+def login_steps(tab, scenario, form_url, timeout=None):
+    """
+    Run a login scenario in a tab of a TabScheduler.
+
+    Args:
+        tab (Tab): The tab to run in.
+        scenario (LoginScenario): The scenario to run.
+        form_url (str): URL of the account page holding the Canvas Network login form.
+        timeout (int, optional): Timeout of the page objects. Defaults to Config.EXPLICIT_WAIT.
+
+    Returns:
+        str: The flash message displayed after the submission.
+    """
+    tab.load(form_url)
+    # The login form is a client-side tab of the account page, the URL alone does not show it
+    network_button = yield tab.condition(
+        CanvasAccountPage.LOCATORS["canvas_network_button"], "clickable"
+    )
+    network_button.click()
+    yield tab.condition(CanvasAccountPage.LOCATORS["email_textbox"])
+
+    values = {}
+    if scenario.username:
+        values["email_textbox"] = scenario.username
+    if scenario.password:
+        values["password_textbox"] = scenario.password
+    if values:
+        tab.page(CanvasAccountPage, timeout).fill_form(values)
+    tab.click(CanvasAccountPage.LOCATORS["login_button"])
+    logger.info(f"Submitted login scenario {scenario.id} in tab {tab.handle}")
+
+    flash_message = yield tab.condition(CanvasLoginPage.LOCATORS["flash_message"])
+    return flash_message.text.strip()
+
+
+def run_in_tabs(driver, scenarios, app_url, tabs=None, timeout=None):
+    """
+    Run login scenarios interleaved across the tabs of one browser.
+
+    The login form is opened once (or restored from its checkpoint) to learn its URL, the
+    cookies of that journey are shared by all the tabs of the browser.
+
+    Args:
+        driver (WebDriver): The WebDriver instance owning the tabs.
+        scenarios (list): LoginScenario instances.
+        app_url (str): The URL of the application homepage.
+        tabs (int, optional): Maximum number of tabs. Defaults to Config.TABS_PER_DRIVER.
+        timeout (int, optional): Timeout of the page objects and scenario steps.
+
+    Returns:
+        list: The flash message of each scenario, in the order of `scenarios`.
+    """
+    timeout = timeout or Config.EXPLICIT_WAIT
+    CanvasAccountPage(driver, timeout).open_login_form(app_url)
+    form_url = driver.current_url
+
+    def steps(scenario):
+        return lambda tab: login_steps(tab, scenario, form_url, timeout)
+
+    scheduler = TabScheduler(driver, tabs, timeout)
+    return scheduler.run([steps(scenario) for scenario in scenarios])
+
+
+async def login_async(driver, scenario, app_url, timeout=None):
+    """
+    Run a login scenario from the homepage on an AsyncWebDriver.
+
+    Args:
+        driver (AsyncWebDriver): The async driver to run on.
+        scenario (LoginScenario): The scenario to run.
+        app_url (str): The URL of the application homepage.
+        timeout (int, optional): Timeout of the waits. Defaults to Config.EXPLICIT_WAIT.
+
+    Returns:
+        str: The flash message displayed after the submission.
+    """
+    home_page = AsyncHomepage(driver, timeout)
+    await home_page.navigate_to(app_url)
+    await home_page.select_canvas_link()
+
+    account_page = AsyncCanvasAccountPage(driver, timeout)
+    await account_page.click_canvas_network()
+    await account_page.click_login_button(scenario.username, scenario.password)
+    logger.info(f"Submitted login scenario {scenario.id} on an async driver")
+
+    return await AsyncCanvasLoginPage(driver, timeout).get_flash_error_message()
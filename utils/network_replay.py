@@ -0,0 +1,416 @@
+"""
+Record/replay network layer for deterministic, low-latency runs.
+
+In record mode a local proxy forwards every browser request to the real site and stores the
+responses in an archive directory. In replay mode the same proxy answers from the archive
+only, without touching the network. HTTPS is intercepted with a self-signed certificate,
+which Chrome accepts through --ignore-certificate-errors.
+
+Archive layout:
+    index.json   - response metadata keyed by a hash of method, URL and request body
+    index.jsonl  - entries recorded since index.json was last written, one per line, so a
+                   crashed or killed recording keeps its responses; folded in on save
+    bodies.bin   - response bodies, byte-identical to what was received, deduplicated by content
+
+Query parameters that change on every request without changing the response (cache
+busters, timestamps, campaign tags) are left out of the key, see Config.NETWORK_IGNORED_PARAMS.
+Changing that list takes a new recording.
+
+Requests that cannot be forwarded while recording (connection, TLS or HTTP errors) are
+answered with a 502 and not recorded.
+
+Bodies are served from a memory map of bodies.bin, so a replayed page load costs local-disk
+time only. Recording is meant to run in a single process (no xdist).
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import mmap
+import os
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Headers that only apply to a single connection and must not be replayed or forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def normalize_url(url, ignored_params=None):
+    """
+    Drop the ignored query parameters and the fragment of a URL.
+
+    Args:
+        url (str): The request URL.
+        ignored_params (iterable, optional): Names of the query parameters to drop.
+                                             Defaults to Config.NETWORK_IGNORED_PARAMS.
+
+    Returns:
+        str: The URL with the remaining parameters in their original order.
+    """
+    ignored = set(Config.NETWORK_IGNORED_PARAMS if ignored_params is None else ignored_params)
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in ignored
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query), fragment=""))
+
+
+def request_key(method, url, body, ignored_params=None):
+    """Return the archive key of a request, see normalize_url() for `ignored_params`."""
+    body_hash = hashlib.sha256(body or b"").hexdigest()
+    url = normalize_url(url, ignored_params)
+    return hashlib.sha256(f"{method} {url} {body_hash}".encode("utf-8")).hexdigest()
+
+
+class NetworkArchive:
+    """On-disk archive of recorded responses."""
+
+    def __init__(self, path, ignored_params=None):
+        """
+        Initialize the archive.
+
+        Args:
+            path (str): Directory of the archive, created when recording.
+            ignored_params (iterable, optional): Query parameters left out of the request keys.
+                                                 Defaults to Config.NETWORK_IGNORED_PARAMS.
+        """
+        self.path = path
+        self.ignored_params = (
+            Config.NETWORK_IGNORED_PARAMS if ignored_params is None else list(ignored_params)
+        )
+        self.index_path = os.path.join(path, "index.json")
+        self.journal_path = os.path.join(path, "index.jsonl")
+        self.bodies_path = os.path.join(path, "bodies.bin")
+        self._lock = threading.Lock()
+        self._bodies_file = None
+        self._bodies_map = None
+        self._journal = None
+        self._offsets = {}
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as index_file:
+                self.index = json.load(index_file)
+        if os.path.exists(self.journal_path):
+            self._load_journal()
+        for entry in self.index.values():
+            self._offsets[entry["sha256"]] = (entry["offset"], entry["length"])
+
+    def _load_journal(self):
+        with open(self.journal_path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line of a killed recording may be incomplete
+                    break
+                self.index[entry.pop("key")] = entry
+
+    def open_for_replay(self):
+        """Memory-map the recorded bodies and return the archive."""
+        if not self.index:
+            raise FileNotFoundError(f"No recorded responses in {self.path}")
+        self._bodies_file = open(self.bodies_path, "rb")
+        if os.path.getsize(self.bodies_path):
+            self._bodies_map = mmap.mmap(
+                self._bodies_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self
+
+    def lookup(self, method, url, body):
+        """
+        Find the recorded response of a request.
+
+        Returns:
+            tuple: (status, headers, body memoryview), or None if the request was not recorded.
+        """
+        entry = self.index.get(request_key(method, url, body, self.ignored_params))
+        if entry is None:
+            return None
+        if self._bodies_map is None:
+            return entry["status"], entry["headers"], memoryview(b"")
+        start = entry["offset"]
+        body = memoryview(self._bodies_map)[start : start + entry["length"]]
+        return entry["status"], entry["headers"], body
+
+    def record(self, method, url, request_body, status, headers, body):
+        """Store a response received from the real site."""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            if digest not in self._offsets:
+                os.makedirs(self.path, exist_ok=True)
+                with open(self.bodies_path, "ab") as bodies_file:
+                    offset = bodies_file.tell()
+                    bodies_file.write(body)
+                self._offsets[digest] = (offset, len(body))
+            offset, length = self._offsets[digest]
+            key = request_key(method, url, request_body, self.ignored_params)
+            entry = {
+                "method": method,
+                "url": url,
+                "status": status,
+                "headers": headers,
+                "sha256": digest,
+                "offset": offset,
+                "length": length,
+            }
+            self.index[key] = entry
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(json.dumps(dict(entry, key=key)) + "\n")
+            self._journal.flush()
+
+    def save(self):
+        """Write the index to disk and fold the journal into it."""
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as index_file:
+                json.dump(self.index, index_file)
+            os.replace(temp_path, self.index_path)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+        if self._bodies_map is not None:
+            self._bodies_map.close()
+        if self._bodies_file is not None:
+            self._bodies_file.close()
+
+
+def ensure_certificate(directory):
+    """
+    Create the self-signed certificate used to intercept HTTPS, if it does not exist yet.
+
+    Returns:
+        tuple: Paths of the certificate and private key files.
+
+    Raises:
+        RuntimeError: If openssl is not available to generate the certificate.
+    """
+    cert_path = os.path.join(directory, "proxy-cert.pem")
+    key_path = os.path.join(directory, "proxy-key.pem")
+    if os.path.exists(cert_path) and os.path.exists(key_path):
+        return cert_path, key_path
+
+    os.makedirs(directory, exist_ok=True)
+    try:
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key_path, "-out", cert_path, "-days", "3650",
+                "-subj", "/CN=network-replay-proxy",
+            ],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as error:
+        raise RuntimeError("openssl is required to intercept HTTPS traffic") from error
+    return cert_path, key_path
+
+
+class ReplayProxyHandler(BaseHTTPRequestHandler):
+    """Proxy request handler recording or replaying responses depending on the server mode."""
+
+    protocol_version = "HTTP/1.1"
+
+    _tunnel = None
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(":")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            connection = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        self.connection = connection
+        self.rfile = connection.makefile("rb", self.rbufsize)
+        self.wfile = connection.makefile("wb", self.wbufsize)
+        self._tunnel = (host, int(port or 443))
+
+        # Serve the requests sent through the tunnel until the browser closes it
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def do_GET(self):
+        self._proxy()
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET
+
+    def _url(self):
+        if self._tunnel is None:
+            return self.path
+        host, port = self._tunnel
+        netloc = host if port == 443 else f"{host}:{port}"
+        return f"https://{netloc}{self.path}"
+
+    def _proxy(self):
+        url = self._url()
+        length = int(self.headers.get("Content-Length", 0))
+        request_body = self.rfile.read(length) if length else b""
+
+        if self.server.mode == "replay":
+            response = self.server.archive.lookup(self.command, url, request_body)
+            if response is None:
+                logger.warning(f"Not in the network archive: {self.command} {url}")
+                self._respond(404, [("X-Replay-Miss", "1")], b"")
+                return
+            self._respond(*response)
+            return
+
+        try:
+            status, headers, body = self._forward(url, request_body)
+        except (OSError, http.client.HTTPException) as error:
+            # ssl.SSLError and socket timeouts are OSErrors too
+            logger.warning(f"Could not record {self.command} {url}: {error!r}")
+            self._respond(502, [("X-Record-Error", type(error).__name__)], b"")
+            return
+        self.server.archive.record(self.command, url, request_body, status, headers, body)
+        self._respond(status, headers, body)
+
+    def _forward(self, url, request_body):
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(parts.netloc, timeout=Config.EXPLICIT_WAIT)
+        else:
+            connection = http.client.HTTPConnection(parts.netloc, timeout=Config.EXPLICIT_WAIT)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = {
+            name: value
+            for name, value in self.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        try:
+            connection.request(self.command, path, body=request_body or None, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            response_headers = [
+                [name, value]
+                for name, value in response.getheaders()
+                if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != "content-length"
+            ]
+            return response.status, response_headers, body
+        finally:
+            connection.close()
+
+    def _respond(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != "content-length":
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Network replay proxy: {format % args}")
+
+
+class ReplayProxy:
+    """Local proxy recording responses into, or replaying them from, a NetworkArchive."""
+
+    def __init__(self, archive_path=None, mode=None):
+        """
+        Initialize the proxy.
+
+        Args:
+            archive_path (str, optional): Archive directory. Defaults to Config.NETWORK_ARCHIVE.
+            mode (str, optional): "record" or "replay". Defaults to Config.NETWORK_MODE.
+
+        Raises:
+            ValueError: If the mode is not supported.
+        """
+        mode = mode or Config.NETWORK_MODE
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported network mode: {mode}")
+        archive = NetworkArchive(archive_path or Config.NETWORK_ARCHIVE)
+        if mode == "replay":
+            archive.open_for_replay()
+
+        cert_path, key_path = ensure_certificate(archive.path)
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(cert_path, key_path)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), ReplayProxyHandler)
+        self._server.daemon_threads = True
+        self._server.mode = mode
+        self._server.archive = archive
+        self._server.ssl_context = ssl_context
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def mode(self):
+        return self._server.mode
+
+    def start(self):
+        """Start serving in a background thread and return the proxy."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Network {self.mode} proxy running at {self.address}")
+        return self
+
+    def stop(self):
+        """Stop the proxy, saving the archive when recording."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self.mode == "record":
+            self._server.archive.save()
+            logger.info(f"Saved network archive to {self._server.archive.path}")
+        self._server.archive.close()
+
+
+_proxy = None
+_proxy_lock = threading.Lock()
+
+
+def get_replay_proxy():
+    """Return the record/replay proxy of this process, starting it on first use."""
+    global _proxy
+    with _proxy_lock:
+        if _proxy is None:
+            _proxy = ReplayProxy().start()
+        return _proxy
+
+
+def stop_replay_proxy():
+    """Stop the proxy of this process if it was started."""
+    global _proxy
+    with _proxy_lock:
+        if _proxy is not None:
+            _proxy.stop()
+            _proxy = None
@@ -0,0 +1,119 @@
+"""
+Helpers for running the suite in parallel with pytest-xdist.
+"""
+
+import glob
+import heapq
+import json
+import os
+import re
+
+_RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+_WORKER_LOG = re.compile(r"_(gw\d+)\.log$")
+
+
+def worker_id(config):
+    """
+    Return the xdist worker id of the current process.
+
+    Args:
+        config (pytest.Config): The pytest config object.
+
+    Returns:
+        str: The worker id (e.g. "gw0"), or None when not running as an xdist worker.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+
+def is_distributed(config):
+    """Return True if this process is the xdist controller distributing tests to workers."""
+    return worker_id(config) is None and getattr(config.option, "dist", "no") != "no"
+
+
+def worker_suffix(config):
+    """Return the suffix appended to per-process artifact names, e.g. "_gw0"."""
+    worker = worker_id(config)
+    if worker:
+        return f"_{worker}"
+    if is_distributed(config):
+        return "_controller"
+    return ""
+
+
+def _read_records(path, tag):
+    """Yield (timestamp, record) pairs, joining continuation lines (tracebacks) to their record."""
+    record = []
+    with open(path, encoding="utf-8", errors="replace") as log_file:
+        for line in log_file:
+            if _RECORD_START.match(line) and record:
+                yield record[0][:19], "".join(record)
+                record = []
+            if not record and _RECORD_START.match(line):
+                line = f"{line[:19]} [{tag}]{line[19:]}"
+            record.append(line)
+    if record:
+        yield record[0][:19], "".join(record)
+
+
+def merge_worker_logs(logs_dir, timestamp):
+    """
+    Merge the per-worker log files of a run into a single chronologically ordered log.
+
+    Args:
+        logs_dir (str): Directory containing the worker log files.
+        timestamp (str): Run timestamp shared by the controller and its workers.
+
+    Returns:
+        str: Path of the combined log file, or None if there was nothing to merge.
+    """
+    pattern = os.path.join(logs_dir, f"log_{timestamp}_*.log")
+    sources = sorted(glob.glob(pattern))
+    if not sources:
+        return None
+
+    streams = []
+    for path in sources:
+        match = _WORKER_LOG.search(path)
+        tag = match.group(1) if match else "controller"
+        streams.append(_read_records(path, tag))
+
+    combined_path = os.path.join(logs_dir, f"log_{timestamp}.log")
+    with open(combined_path, "w", encoding="utf-8") as combined:
+        for _, record in heapq.merge(*streams, key=lambda item: item[0]):
+            combined.write(record)
+    return combined_path
+
+
+def _read_json_records(path):
+    """Yield (timestamp, line) pairs of a JSON lines log."""
+    with open(path, encoding="utf-8", errors="replace") as log_file:
+        for line in log_file:
+            try:
+                yield json.loads(line)["ts"], line
+            except (ValueError, KeyError):
+                continue
+
+
+def merge_worker_json_logs(logs_dir, timestamp):
+    """
+    Merge the per-worker JSON lines logs of a run, rotated files included, into a single
+    chronologically ordered file. Records already carry their worker id.
+
+    Args:
+        logs_dir (str): Directory containing the worker log files.
+        timestamp (str): Run timestamp shared by the controller and its workers.
+
+    Returns:
+        str: Path of the combined JSON lines file, or None if there was nothing to merge.
+    """
+    sources = sorted(glob.glob(os.path.join(logs_dir, f"log_{timestamp}_*.jsonl*")))
+    if not sources:
+        return None
+
+    combined_path = os.path.join(logs_dir, f"log_{timestamp}.jsonl")
+    with open(combined_path, "w", encoding="utf-8") as combined:
+        streams = [_read_json_records(path) for path in sources]
+        for _, line in heapq.merge(*streams, key=lambda item: item[0]):
+            combined.write(line)
+    return combined_path
@@ -0,0 +1,136 @@
+"""
+Request blocking for page loads through the Chrome DevTools Protocol.
+
+Blocked URLs are matched by Chrome against wildcard patterns (e.g. "*.woff2",
+"*googletagmanager.com*"). Network.setBlockedURLs only matches URLs, so images,
+fonts and media are blocked by the file extension at the end of their path
+(extension groups), not by the resource type Chrome sees. Resources served without
+an extension (data URLs, image CDNs with query parameters only) are not blocked,
+and a query string ending in an extension (e.g. "?file=logo.png") is. Filtering on
+the real type would take Fetch interception, which needs a DevTools event listener
+answering every paused request; the sync WebDriver only sends commands.
+"""
+
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Analytics, advertising, consent and video hosts our tests never assert on. Keep auth/SSO
+# providers and CDNs serving login assets out of this list: tests opt into it as a whole.
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googleadservices.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*hotjar.com*",
+    "*linkedin.com/px*",
+    "*licdn.com*",
+    "*bing.com/bat*",
+    "*clarity.ms*",
+    "*hubspot.com*",
+    "*hs-scripts.com*",
+    "*hs-analytics.net*",
+    "*marketo.net*",
+    "*mktoresp.com*",
+    "*onetrust.com*",
+    "*cookielaw.org*",
+    "*drift.com*",
+    "*vimeo.com*",
+    "*youtube.com*",
+    "*ytimg.com*",
+)
+
+EXTENSION_GROUPS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m3u8"),
+    "stylesheet": ("css",),
+}
+
+
+def extension_patterns(extension):
+    """
+    Build the URL patterns matching paths that end with `extension`.
+
+    Args:
+        extension (str): File extension, without the dot.
+
+    Returns:
+        tuple: Patterns for the extension at the end of the URL and before a query string.
+    """
+    return (f"*.{extension}", f"*.{extension}?*")
+
+
+def blocked_url_patterns(patterns=None, extension_groups=None, third_party=None):
+    """
+    Build the list of URL patterns to block.
+
+    Args:
+        patterns (list, optional): URL wildcard patterns. Defaults to Config.BLOCKED_URL_PATTERNS.
+        extension_groups (list, optional): Groups of file extensions from EXTENSION_GROUPS.
+                                           Defaults to Config.BLOCKED_EXTENSION_GROUPS.
+        third_party (bool, optional): Also block THIRD_PARTY_PATTERNS. Defaults to Config.BLOCK_THIRD_PARTY.
+
+    Returns:
+        list: The URL patterns, without duplicates.
+
+    Raises:
+        ValueError: If an extension group is not supported.
+    """
+    patterns = Config.BLOCKED_URL_PATTERNS if patterns is None else patterns
+    extension_groups = (
+        Config.BLOCKED_EXTENSION_GROUPS if extension_groups is None else extension_groups
+    )
+    third_party = Config.BLOCK_THIRD_PARTY if third_party is None else third_party
+
+    blocked = list(patterns)
+    for group in extension_groups:
+        if group not in EXTENSION_GROUPS:
+            raise ValueError(f"Unsupported extension group: {group}")
+        for extension in EXTENSION_GROUPS[group]:
+            blocked.extend(extension_patterns(extension))
+    if third_party:
+        blocked.extend(THIRD_PARTY_PATTERNS)
+    return list(dict.fromkeys(blocked))
+
+
+def apply_request_blocking(driver, patterns=None, extension_groups=None, third_party=None):
+    """
+    Block matching requests in the browser until the blocklist is applied again.
+
+    Only Chromium based drivers support this, other drivers are left untouched.
+
+    Args:
+        driver (WebDriver): The WebDriver instance.
+        patterns (list, optional): URL wildcard patterns, see blocked_url_patterns().
+        extension_groups (list, optional): Extension groups, see blocked_url_patterns().
+        third_party (bool, optional): Block third party hosts, see blocked_url_patterns().
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return
+    urls = blocked_url_patterns(patterns, extension_groups, third_party)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+    logger.info(f"Blocking {len(urls)} URL pattern(s)")
+
+
+def host_allowlist_argument(hosts):
+    """
+    Build the Chrome argument that makes every host but `hosts` unresolvable.
+
+    Network.setBlockedURLs cannot express an allowlist, so it is applied at browser launch
+    through the host resolver instead. Local hosts are always allowed.
+
+    Args:
+        hosts (list): Host names (wildcards allowed, e.g. "*.instructure.com") to allow.
+
+    Returns:
+        str: The --host-resolver-rules argument.
+    """
+    allowed = list(hosts) + ["localhost", "127.0.0.1"]
+    rules = ["MAP * ~NOTFOUND"] + [f"EXCLUDE {host}" for host in allowed]
+    return f"--host-resolver-rules={', '.join(rules)}"
@@ -0,0 +1,190 @@
+"""
+Local stand-in for the Instructure and Canvas pages used by the tests.
+
+Serves static replicas of the homepage, the Canvas account page and the /login/canvas
+flash message flow with the same element IDs and link texts as the page LOCATORS, so the
+suite can run hermetically with millisecond page loads.
+
+StandInGrid answers the few WebDriver commands needed to exercise the remote driver path
+(new session, current URL, quit) and counts the connections it accepts.
+"""
+
+import html
+import itertools
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SITE_DIR = os.path.join(os.path.dirname(__file__), "standin_site")
+
+PAGES = {
+    "/": "index.html",
+    "/canvas/login": "canvas_login.html",
+}
+
+INVALID_CREDENTIALS_MESSAGE = (
+    'Please verify your username or password and try again. <a href="#">Trouble logging in?</a>'
+)
+NO_PASSWORD_MESSAGE = "No password was given"
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Serves the stand-in pages and answers login attempts with the real flash messages."""
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path not in PAGES:
+            self._send(404, b"Not Found", "text/plain")
+            return
+        with open(os.path.join(SITE_DIR, PAGES[path]), "rb") as page:
+            self._send(200, page.read())
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/login/canvas":
+            self._send(404, b"Not Found", "text/plain")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        password = form.get("password", [""])[0]
+
+        message = INVALID_CREDENTIALS_MESSAGE if password else html.escape(NO_PASSWORD_MESSAGE)
+        with open(os.path.join(SITE_DIR, "login_canvas.html"), encoding="utf-8") as page:
+            body = page.read().replace("{message}", message)
+        self._send(400, body.encode("utf-8"))
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Stand-in server: {format % args}")
+
+
+class StandInServer:
+    """Runs the stand-in site on a local port in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=None):
+        """
+        Initialize the stand-in server.
+
+        Args:
+            host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind, 0 picks a free one. Defaults to Config.STANDIN_PORT.
+        """
+        self._server = ThreadingHTTPServer(
+            (host, Config.STANDIN_PORT if port is None else port), StandInRequestHandler
+        )
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the running server, with a trailing slash like Config.APP_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """Start serving in a background thread and return the server."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stand-in server running at {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        logger.info("Stand-in server stopped.")
+
+
+class StandInGridRequestHandler(BaseHTTPRequestHandler):
+    """Answers new session, get current URL and delete session like a Grid would."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if urlsplit(self.path).path != "/session":
+            self._send(404, {"error": "unknown command", "message": self.path})
+            return
+        session_id = f"standin-session-{next(self.server.session_ids)}"
+        self._send(
+            200, {"sessionId": session_id, "capabilities": {"browserName": "chrome"}}
+        )
+
+    def do_GET(self):
+        if not urlsplit(self.path).path.endswith("/url"):
+            self._send(404, {"error": "unknown command", "message": self.path})
+            return
+        self._send(200, "about:blank")
+
+    def do_DELETE(self):
+        self._send(200, None)
+
+    def _send(self, status, value):
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Stand-in Grid: {format % args}")
+
+
+class StandInGrid:
+    """Runs a minimal WebDriver endpoint on a local port in a background thread."""
+
+    def __init__(self, host="127.0.0.1"):
+        """
+        Initialize the stand-in Grid on a free port.
+
+        Args:
+            host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        """
+        self._server = ThreadingHTTPServer((host, 0), StandInGridRequestHandler)
+        self._server.daemon_threads = True
+        self._server.lock = threading.Lock()
+        self._server.connections = 0
+        self._server.session_ids = itertools.count(1)
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL of the endpoint, usable as Config.GRID_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self):
+        """Number of TCP connections accepted so far."""
+        return self._server.connections
+
+    def start(self):
+        """Start serving in a background thread and return the Grid."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stand-in Grid running at {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,126 @@
+"""
+Streaming test report.
+
+Instead of rendering one self-contained HTML file at the end of the session, each test result
+is appended to the report directory as soon as the test finishes:
+
+    reports/run_<timestamp>/
+        results.jsonl  - one JSON object per test (outcome, duration, error, artifact paths)
+        results.js     - the same objects as RESULTS.push(...) statements for the viewer
+        summary.js     - page action summary of the session (slowest actions, per-locator
+                         timings), written at the end of the session
+        index.html     - static viewer, loads results.js and summary.js and shows
+                         screenshots on demand
+
+Each result also carries the page action summary of its test (see ActionRecorder.test_summary),
+taken from the "actions" user property.
+
+Failure artifacts (screenshots, page sources) stay in their own files and are referenced by
+relative path, so neither the report nor the time and memory to write it grow with them.
+Open index.html directly from disk, no server is needed.
+"""
+
+import json
+import os
+import shutil
+
+VIEWER_PATH = os.path.join(os.path.dirname(__file__), "report_viewer", "index.html")
+
+# Artifact files written by ArtifactWriter for a failed test, by kind
+ARTIFACT_EXTENSIONS = {"screenshot": ".png", "page_source": ".html.gz", "details": ".json.gz"}
+
+
+class StreamReport:
+    """
+    Appends test results to the report directory as they arrive.
+
+    Registered as a pytest plugin on the controller, which receives the reports of all xdist
+    workers. Only the phases of the tests still running are kept in memory.
+    """
+
+    def __init__(self, directory):
+        """
+        Create the report directory and its viewer.
+
+        Args:
+            directory (str): Directory of the report.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        shutil.copyfile(VIEWER_PATH, os.path.join(directory, "index.html"))
+        self._jsonl = open(os.path.join(directory, "results.jsonl"), "w", encoding="utf-8")
+        self._js = open(os.path.join(directory, "results.js"), "w", encoding="utf-8")
+        self._js.write("window.RESULTS = window.RESULTS || [];\n")
+        self._js.flush()
+        self.write_summary(None)
+        self._phases = {}
+
+    def pytest_runtest_logreport(self, report):
+        """Collect the phases of a test and write its result after the teardown."""
+        self._phases.setdefault(report.nodeid, []).append(report)
+        if report.when == "teardown":
+            self.write(self._phases.pop(report.nodeid))
+
+    def write(self, reports):
+        """Write the result of a test from its setup, call and teardown reports."""
+        failed = [report for report in reports if report.failed]
+        skipped = [report for report in reports if report.skipped]
+        if failed:
+            outcome = "error" if failed[0].when != "call" else "failed"
+        elif skipped:
+            outcome = "skipped"
+        else:
+            outcome = "passed"
+        worker = getattr(getattr(getattr(reports[0], "node", None), "gateway", None), "id", None)
+
+        result = {
+            "nodeid": reports[0].nodeid,
+            "outcome": outcome,
+            "duration": round(sum(report.duration for report in reports), 3),
+            "worker": worker,
+            "error": (failed or skipped)[0].longreprtext if failed or skipped else None,
+            "artifacts": self._artifacts(reports),
+            "actions": self._actions(reports),
+        }
+        line = json.dumps(result)
+        self._jsonl.write(line + "\n")
+        self._jsonl.flush()
+        self._js.write(f"RESULTS.push({line});\n")
+        self._js.flush()
+
+    def _artifacts(self, reports):
+        artifacts = {}
+        for report in reports:
+            for name, value in report.user_properties:
+                if name != "artifacts":
+                    continue
+                for kind, extension in ARTIFACT_EXTENSIONS.items():
+                    path = f"{value}{extension}"
+                    artifacts[kind] = os.path.relpath(path, self.directory).replace(os.sep, "/")
+        return artifacts
+
+    @staticmethod
+    def _actions(reports):
+        for report in reversed(reports):
+            for name, value in report.user_properties:
+                if name == "actions":
+                    return value
+        return None
+
+    def write_summary(self, summary):
+        """
+        Write the page action summary of the session for the viewer.
+
+        Args:
+            summary (dict): Summary returned by ActionRecorder.summary(), or None.
+        """
+        with open(os.path.join(self.directory, "summary.js"), "w", encoding="utf-8") as js_file:
+            js_file.write(f"window.ACTION_SUMMARY = {json.dumps(summary)};\n")
+
+    def close(self):
+        """Write the tests that never reached their teardown and close the files."""
+        for reports in self._phases.values():
+            self.write(reports)
+        self._phases = {}
+        self._jsonl.close()
+        self._js.close()
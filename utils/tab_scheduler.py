@@ -0,0 +1,293 @@
+"""
+Interleaved scenarios in several tabs of a single browser.
+
+A scenario is a generator function taking a Tab. It runs its WebDriver actions normally and
+yields a condition whenever it would otherwise block on the browser (a page load, a form
+submission). The scheduler then moves on to the other tabs and resumes the scenario, with
+the condition's result, once a single non-blocking check of the condition succeeds. The
+network waits of one tab therefore overlap with the actions of the others, without the
+memory cost of another browser process.
+
+    def login(tab):
+        tab.load(form_url)
+        yield tab.condition(CanvasAccountPage.LOCATORS["email_textbox"])
+        tab.page(CanvasAccountPage).fill_form({"email_textbox": "user@example.com"})
+        tab.click(CanvasAccountPage.LOCATORS["login_button"])
+        flash = yield tab.condition(CanvasLoginPage.LOCATORS["flash_message"])
+        return flash.text
+
+    messages = TabScheduler(driver, tabs=4).run([login, login])
+
+Navigations started with Tab.load() and Tab.click() return immediately; conditions are not
+checked against the document being left until the next one has been parsed.
+
+WebDriver commands act on the focused window. The scheduler switches to a scenario's tab
+before resuming it, and forgets which tab is focused afterwards, because the scenario may
+have switched windows itself. Tab.driver and the page objects of Tab.page() are bound to
+their tab: they switch to it before a command whenever another window may be focused, so
+a page object kept across steps, or used from another tab's scenario, still drives its own
+tab. Switch windows through Tab.driver rather than the scheduler's driver, so that the
+switch is noticed.
+"""
+
+import logging
+import time
+from collections import deque
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from config import Config
+from utils.dom_wait import FIND_ELEMENT_JS
+from utils.instrumentation import count_poll
+
+logger = logging.getLogger(__name__)
+
+# Seconds to sleep after a round in which no tab could make progress
+POLL_INTERVAL = 0.05
+
+# Set on a document that is being navigated away from by Tab.load() or Tab.click()
+_LEAVING_FLAG = "__tabSchedulerLeaving"
+
+_LOAD_JS = f"""
+const url = new URL(arguments[0], window.location.href);
+window.{_LEAVING_FLAG} = true;
+setTimeout(() => {{
+    const samePage = url.href.split("#")[0] === window.location.href.split("#")[0];
+    window.location.assign(url.href);
+    // A change of fragment alone does not load a new document
+    if (samePage) window.location.reload();
+}});
+"""
+
+_CLICK_JS = f"""
+const element = arguments[0];
+window.{_LEAVING_FLAG} = true;
+setTimeout(() => element.click());
+"""
+
+# Returns the element of a [strategy, selector, condition] spec if it is met right now, or null
+_CHECK_CONDITION_JS = FIND_ELEMENT_JS + f"""
+if (window.{_LEAVING_FLAG} || document.readyState === "loading") return null;
+const [strategy, selector, condition] = arguments[0];
+const element = findElement(strategy, selector);
+return meetsCondition(element, condition) ? element : null;
+"""
+
+
+def dom_condition(locator, condition="visible"):
+    """
+    Build a non-blocking condition on an element, checked in a single script call.
+
+    Args:
+        locator (tuple): Element locator (By strategy, selector).
+        condition (str): "present", "visible" or "clickable".
+
+    Returns:
+        callable: Takes the driver and returns the element, or None if the condition is not met.
+    """
+    spec = [locator[0], locator[1], condition]
+
+    def check(driver):
+        return driver.execute_script(_CHECK_CONDITION_JS, spec)
+
+    check.description = f"{condition} {locator[0]}={locator[1]}"
+    return check
+
+
+class TabDriver:
+    """The driver of a TabScheduler, bound to one of its tabs."""
+
+    def __init__(self, tab):
+        self._tab = tab
+
+    def __getattr__(self, name):
+        scheduler = self._tab.scheduler
+        if name == "switch_to":
+            # The focused window is unknown once the caller switches
+            scheduler._current_handle = None
+        else:
+            scheduler._activate(self._tab)
+        return getattr(scheduler.driver, name)
+
+
+class Tab:
+    """A browser tab of a TabScheduler, in which one scenario runs at a time."""
+
+    def __init__(self, scheduler, handle):
+        self.scheduler = scheduler
+        self.handle = handle
+        self.driver = TabDriver(self)
+
+    def page(self, page_class, *args, **kwargs):
+        """
+        Create a page object bound to this tab.
+
+        Returns:
+            BasePage: The page object, acting on this tab whichever window is focused.
+        """
+        return page_class(self.driver, *args, **kwargs)
+
+    def load(self, url):
+        """Start loading `url` in this tab without waiting for the page."""
+        self.driver.execute_script(_LOAD_JS, url)
+
+    def click(self, locator):
+        """Click an element that starts a navigation (e.g. a submit button) without waiting."""
+        element = self.driver.find_element(*locator)
+        self.driver.execute_script(_CLICK_JS, element)
+
+    @staticmethod
+    def condition(locator, condition="visible"):
+        """Shortcut for dom_condition()."""
+        return dom_condition(locator, condition)
+
+
+class _Running:
+    """A scenario in progress in a tab."""
+
+    def __init__(self, index, steps):
+        self.index = index
+        self.steps = steps
+        self.condition = None
+        self.deadline = None
+
+
+class TabScheduler:
+    """Runs generator-based scenarios interleaved across the tabs of one driver."""
+
+    def __init__(self, driver, tabs=None, timeout=None, poll_interval=POLL_INTERVAL):
+        """
+        Initialize the scheduler.
+
+        Args:
+            driver (WebDriver): The WebDriver instance owning the tabs.
+            tabs (int, optional): Maximum number of tabs. Defaults to Config.TABS_PER_DRIVER.
+            timeout (int, optional): Seconds a yielded condition may take to be met.
+                                     Defaults to Config.EXPLICIT_WAIT.
+            poll_interval (float): Seconds to sleep when no tab made progress.
+        """
+        self.driver = driver
+        self.size = tabs or Config.TABS_PER_DRIVER
+        self.timeout = timeout or Config.EXPLICIT_WAIT
+        self.poll_interval = poll_interval
+        self.tabs = []
+        # Tracked locally to skip the switch command between condition checks, None when
+        # unknown because a scenario step ran
+        self._current_handle = None
+
+    def _activate(self, tab, force=False):
+        if force or self._current_handle != tab.handle:
+            self.driver.switch_to.window(tab.handle)
+            self._current_handle = tab.handle
+
+    def _open_tabs(self, count):
+        self._current_handle = self.driver.current_window_handle
+        self.tabs = [Tab(self, self._current_handle)]
+        for _ in range(count - 1):
+            self.driver.switch_to.new_window("tab")
+            self._current_handle = self.driver.current_window_handle
+            self.tabs.append(Tab(self, self._current_handle))
+        logger.info(f"Opened {len(self.tabs)} tabs")
+
+    def _close_tabs(self):
+        first, *others = self.tabs
+        for tab in others:
+            self._activate(tab)
+            self.driver.close()
+        self.driver.switch_to.window(first.handle)
+        self._current_handle = first.handle
+        self.tabs = []
+
+    def run(self, scenarios):
+        """
+        Run scenarios, at most one per tab at a time, until all of them have finished.
+
+        Args:
+            scenarios (list): Generator functions taking a Tab. The value sent back at each
+                              yield is the result of the yielded condition; a condition not
+                              met within the timeout raises TimeoutException at the yield.
+
+        Returns:
+            list: The return values of the scenarios, in the order of `scenarios`.
+
+        Raises:
+            Exception: The first error raised by a scenario, once all of them have finished.
+        """
+        if not scenarios:
+            return []
+        pending = deque(enumerate(scenarios))
+        results = [None] * len(scenarios)
+        errors = []
+        running = {}
+
+        self._open_tabs(min(self.size, len(scenarios)))
+        try:
+            while pending or running:
+                progressed = False
+                for tab in self.tabs:
+                    if tab.handle not in running and pending:
+                        index, scenario = pending.popleft()
+                        running[tab.handle] = _Running(index, scenario(tab))
+                        self._advance(tab, running, results, errors, next)
+                        progressed = True
+
+                for tab in self.tabs:
+                    current = running.get(tab.handle)
+                    if current is None:
+                        continue
+                    self._activate(tab)
+                    count_poll()
+                    try:
+                        result = current.condition(self.driver)
+                    except (NoSuchElementException, StaleElementReferenceException):
+                        result = None
+                    if result:
+                        self._advance(
+                            tab, running, results, errors, lambda steps: steps.send(result)
+                        )
+                    elif time.monotonic() >= current.deadline:
+                        description = getattr(
+                            current.condition, "description", current.condition
+                        )
+                        error = TimeoutException(
+                            f"Condition not met within {self.timeout}s: {description}"
+                        )
+                        self._advance(
+                            tab, running, results, errors, lambda steps: steps.throw(error)
+                        )
+                    else:
+                        continue
+                    progressed = True
+
+                if not progressed:
+                    time.sleep(self.poll_interval)
+        finally:
+            self._close_tabs()
+
+        if errors:
+            raise errors[0][1]
+        return results
+
+    def _advance(self, tab, running, results, errors, step):
+        """Resume the scenario of a tab up to its next yield, or record its outcome."""
+        current = running[tab.handle]
+        self._activate(tab, force=True)
+        try:
+            current.condition = step(current.steps)
+        except StopIteration as stop:
+            results[current.index] = stop.value
+            del running[tab.handle]
+            return
+        except Exception as error:
+            logger.error(f"Scenario {current.index} failed in tab {tab.handle}: {error}")
+            errors.append((current.index, error))
+            del running[tab.handle]
+            return
+        finally:
+            # The step may have switched to another window
+            self._current_handle = None
+        current.deadline = time.monotonic() + self.timeout
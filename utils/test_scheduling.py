@@ -0,0 +1,130 @@
+"""
+Duration-aware test ordering.
+
+Per-test durations are persisted across runs (as an exponentially weighted moving average) together
+with the tests that failed in the last run. Running the longest tests first lets pytest-xdist's
+load scheduling, which hands out tests in collection order to whichever worker is free, fill
+the tail of the run with the short tests instead of leaving workers idle behind a long one.
+
+Modules are ordered as a whole and their tests keep the collection order: interleaving the
+tests of several modules would tear down and rebuild their module-scoped fixtures (one
+browser per module) every time the run goes back to a module.
+"""
+
+import json
+import os
+
+# Weight of the latest run in the moving average of a test's duration
+SMOOTHING = 0.5
+
+SCHEDULE_MODES = ("duration", "failed-first", "none")
+
+
+class DurationHistory:
+    """
+    Durations and last failures of the tests, persisted in a JSON file.
+
+    Registered as a pytest plugin to receive the test reports of the run.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the history, loading it from `path` if it exists.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        self.path = path
+        self.durations = {}
+        self.failed = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as history_file:
+                data = json.load(history_file)
+            self.durations = data.get("durations", {})
+            self.failed = set(data.get("failed", []))
+        self._run_durations = {}
+        self._run_failed = set()
+
+    def pytest_runtest_logreport(self, report):
+        """Account for a setup, call or teardown report of the current run."""
+        nodeid = report.nodeid
+        self._run_durations[nodeid] = self._run_durations.get(nodeid, 0) + report.duration
+        if report.failed:
+            self._run_failed.add(nodeid)
+
+    def save(self):
+        """Merge the current run into the history and write it to disk."""
+        if not self._run_durations:
+            return
+        for nodeid, duration in self._run_durations.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = duration
+            else:
+                self.durations[nodeid] = SMOOTHING * duration + (1 - SMOOTHING) * previous
+        # A filtered run (-k, a single file) keeps the failures of the tests it did not run
+        self.failed = (self.failed - set(self._run_durations)) | self._run_failed
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as history_file:
+            json.dump(
+                {"durations": self.durations, "failed": sorted(self.failed)},
+                history_file,
+                indent=1,
+            )
+        os.replace(temp_path, self.path)
+
+    def expected_duration(self, nodeid):
+        """Return the expected duration of a test, the average one if it never ran."""
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return sum(self.durations.values()) / len(self.durations)
+        return 0
+
+
+def _module(item):
+    return item.nodeid.partition("::")[0]
+
+
+def order_items(items, history, mode):
+    """
+    Reorder collected test items in place, module by module.
+
+    The order only depends on the history file and the nodeids, so every xdist worker
+    collects the tests in the same order.
+
+    Args:
+        items (list): The collected pytest items.
+        history (DurationHistory): Durations and failures of previous runs.
+        mode (str): "duration" (longest modules first), "failed-first" (modules with a last
+                    failure first, then longest first) or "none".
+
+    Raises:
+        ValueError: If the mode is not supported.
+    """
+    if mode not in SCHEDULE_MODES:
+        raise ValueError(f"Unsupported schedule mode: {mode}")
+    if mode == "none":
+        return
+
+    # Modules in the order of their first test, each with its tests in collection order
+    modules = {}
+    for item in items:
+        modules.setdefault(_module(item), []).append(item)
+
+    # Ties keep the collection order
+    positions = {module: index for index, module in enumerate(modules)}
+
+    def sort_key(module):
+        module_items = modules[module]
+        failed_first = mode == "failed-first" and any(
+            item.nodeid in history.failed for item in module_items
+        )
+        return (
+            not failed_first,
+            -sum(history.expected_duration(item.nodeid) for item in module_items),
+            positions[module],
+        )
+
+    items[:] = [item for module in sorted(modules, key=sort_key) for item in modules[module]]
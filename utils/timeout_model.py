@@ -0,0 +1,162 @@
+"""
+Wait timeouts learned from the latencies observed in previous runs.
+
+Every successful BasePage wait records how long it took, keyed by page class, LOCATORS key and
+condition. Once a key has enough samples, its timeout becomes a high percentile of them times a
+factor plus a margin, never above the configured timeout, which stays the hard ceiling. A
+wait that usually takes 300ms then gives up after a couple of seconds instead of 20, so a
+broken run fails in seconds rather than minutes. Until a key has enough samples the
+configured timeout is used.
+
+The history is kept per target, the site under test (local stand-in sites share one target)
+and Config.NETWORK_MODE, so that the latencies of stand-in, replayed or benchmark runs never
+shorten the waits of a live run. A wait that gives up after a learned timeout discards the
+history of its key, which falls back to the configured timeout until it is learned again.
+
+Negative checks (BasePage.is_element_displayed without an explicit timeout) use the learned
+timeout of the element when there is one and Config.NEGATIVE_CHECK_TIMEOUT otherwise.
+
+The history is kept in <reports-dir>/timeout_history.json. Under pytest-xdist each worker
+writes the samples of its run and the controller merges them into the history.
+"""
+
+import glob
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+from config import Config
+from utils.instrumentation import percentile
+
+# Most recent samples kept per key
+MAX_SAMPLES = 200
+
+# Sample recorded when a wait gives up after its learned timeout
+_TIMED_OUT = None
+
+_LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def history_target():
+    """
+    Return the target the latencies of this run are recorded for, e.g. "www.instructure.com/replay".
+
+    Stand-in sites run on a random local port, they all share the "local" host.
+    """
+    host = urlsplit(Config.APP_URL).hostname or ""
+    if host in _LOCAL_HOSTS:
+        host = "local"
+    return f"{host}/{Config.NETWORK_MODE}"
+
+
+class TimeoutModel:
+    """Latency history of the waits per target, and the timeouts derived from it."""
+
+    def __init__(self):
+        self.path = None
+        self.history = {}
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """
+        Load the history from `path` if it exists; save() writes it back there.
+
+        Args:
+            path (str): Path of the JSON history file.
+        """
+        self.path = path
+        self.history = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as history_file:
+                history = json.load(history_file)
+            # Histories saved before they were kept per target are dropped
+            self.history = {
+                target: keys for target, keys in history.items() if isinstance(keys, dict)
+            }
+
+    def record(self, key, duration):
+        """Record the duration in seconds of a successful wait."""
+        with self._lock:
+            target_samples = self.samples.setdefault(history_target(), {})
+            target_samples.setdefault(key, []).append(duration)
+
+    def record_timeout(self, key):
+        """
+        Record that a wait gave up after its learned timeout.
+
+        The history of the key is discarded, for the rest of the run and in the saved history,
+        so the wait uses the configured timeout again until enough new samples are recorded.
+        """
+        target = history_target()
+        with self._lock:
+            self.history.get(target, {}).pop(key, None)
+            self.samples.setdefault(target, {}).setdefault(key, []).append(_TIMED_OUT)
+
+    def timeout(self, key, default):
+        """
+        Return the timeout of a wait.
+
+        Args:
+            key (str): Key of the wait, see BasePage._timeout_key.
+            default (float): The configured timeout, also used as the ceiling.
+
+        Returns:
+            float: The learned timeout, or `default` without enough history or when
+                   Config.ADAPTIVE_TIMEOUTS is off.
+        """
+        learned = self.learned_timeout(key)
+        return default if learned is None else min(default, learned)
+
+    def learned_timeout(self, key):
+        """Return the timeout learned for `key` on the current target, or None without enough history."""
+        if not Config.ADAPTIVE_TIMEOUTS:
+            return None
+        samples = self.history.get(history_target(), {}).get(key, [])
+        if len(samples) < Config.TIMEOUT_MIN_SAMPLES:
+            return None
+        return (
+            percentile(samples, Config.TIMEOUT_PERCENTILE) * Config.TIMEOUT_FACTOR
+            + Config.TIMEOUT_MARGIN
+        )
+
+    def write_samples(self, path):
+        """Write the samples of this process, for the controller to merge."""
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(self.samples, json_file)
+
+    def merge_samples(self, pattern):
+        """Add the samples written by other processes (e.g. xdist workers) and remove their files."""
+        for source in sorted(glob.glob(pattern)):
+            with open(source, encoding="utf-8") as json_file:
+                for target, keys in json.load(json_file).items():
+                    target_samples = self.samples.setdefault(target, {})
+                    for key, durations in keys.items():
+                        target_samples.setdefault(key, []).extend(durations)
+            os.remove(source)
+
+    def save(self):
+        """Merge the samples of the run into the history and write it to disk."""
+        if self.path is None or not self.samples:
+            return
+        for target, keys in self.samples.items():
+            target_history = self.history.setdefault(target, {})
+            for key, durations in keys.items():
+                if _TIMED_OUT in durations:
+                    # Only the samples recorded after the last timeout are kept
+                    last_timeout = len(durations) - 1 - durations[::-1].index(_TIMED_OUT)
+                    target_history.pop(key, None)
+                    durations = durations[last_timeout + 1 :]
+                samples = target_history.get(key, []) + durations
+                if samples:
+                    target_history[key] = samples[-MAX_SAMPLES:]
+        self.samples = {}
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as history_file:
+            json.dump(self.history, history_file)
+        os.replace(temp_path, self.path)
+
+
+timeout_model = TimeoutModel()
@@ -1,16 +1,65 @@
 import logging
+import os
+import threading
+import time
 
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from urllib3.exceptions import HTTPError
 
-from InstructureAssessment.config import Config
+from config import Config
+from utils.chromedriver_resolver import resolve_chromedriver
+from utils.instrumentation import count_commands
+from utils.network_replay import get_replay_proxy
+from utils.request_blocking import apply_request_blocking, host_allowlist_argument
 
 logger = logging.getLogger(__name__)
 
+BROWSER_PROFILES = ("default", "dense")
+
+# Chrome switches of the dense profile: no GPU emulation, extensions or background services
+DENSE_ARGUMENTS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--mute-audio",
+)
+
+
+class SharedRemoteConnection(RemoteConnection):
+    """
+    Keep-alive command connection to a Grid endpoint, shared by all the remote drivers of the
+    process.
+
+    WebDriver.quit() closes the command executor of the driver, which would drop the pooled
+    sockets of every other driver; this connection stays open until close_pool() is called.
+    """
+
+    def close(self):
+        """Keep the connection pool open for the other drivers, see close_pool()."""
+
+    def close_pool(self):
+        """Close the pooled sockets for good."""
+        super().close()
+
 
 class WebDriverFactory:
 
+    # Keep-alive command connections to Grid endpoints, shared by all remote drivers
+    _remote_connections = {}
+    _remote_connections_lock = threading.Lock()
+
     @staticmethod
     def get_driver(browser=None, headless=None):
         """
@@ -18,7 +67,7 @@ class WebDriverFactory:
 
         Args:
             browser (str, optional): The browser to use for the WebDriver. Defaults to the value of Config.BROWSER.
-                                     Supported values are "chrome" and "safari".
+                                     Supported values are "chrome", "remote" and "safari".
             headless (bool, optional): Whether to run the browser in headless mode. Defaults to the value of Config.HEADLESS.
 
         Returns:
@@ -31,26 +80,213 @@ class WebDriverFactory:
         browser = browser or Config.BROWSER
 
         if browser == "chrome":
-            return WebDriverFactory._get_chrome_driver(headless)
+            driver = WebDriverFactory._get_chrome_driver(headless)
+        elif browser == "remote":
+            driver = WebDriverFactory._get_remote_driver(headless)
         elif browser == "safari":
-            return WebDriverFactory._get_safari_driver()
+            driver = WebDriverFactory._get_safari_driver()
         else:
             raise ValueError("Unsupported Browser")
+        # Commands per page action, see utils/instrumentation.py
+        return count_commands(driver)
 
     @staticmethod
-    def _get_chrome_driver(headless):
-        """Returns an instance of Chrome WebDriver using WebDriverManager"""
+    def _get_chrome_options(headless):
+        """Returns the Chrome options shared by local and remote drivers"""
         options = webdriver.ChromeOptions()
         logger.info(f"Running tests in headless mode: {headless}")
 
+        if Config.BROWSER_PROFILE not in BROWSER_PROFILES:
+            raise ValueError(f"Unsupported browser profile: {Config.BROWSER_PROFILE}")
+        if Config.BROWSER_PROFILE == "dense":
+            WebDriverFactory._add_dense_arguments(options, headless)
+        else:
+            if headless:
+                options.add_argument("--headless")
+            options.add_argument("--start-maximized")
+        # Pages declare their own readiness, see BasePage.wait_until_ready
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
+        if Config.ALLOWED_HOSTS:
+            options.add_argument(host_allowlist_argument(Config.ALLOWED_HOSTS))
+        return options
+
+    @staticmethod
+    def _add_dense_arguments(options, headless):
+        """
+        Adds the options of the dense profile, which keeps the footprint of each Chrome small
+        enough to pack many of them on one CI runner.
+        """
         if headless:
-            options.add_argument("--headless")
-        options.add_argument("--start-maximized")
+            options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={Config.DENSE_WINDOW_SIZE}")
+        for argument in DENSE_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_argument(
+            f"--renderer-process-limit={Config.DENSE_RENDERER_PROCESS_LIMIT}"
+        )
+        # The cache stays in the temporary profile of the driver, which is removed on quit
+        options.add_argument(f"--disk-cache-size={Config.DENSE_DISK_CACHE_MB * 1024 * 1024}")
+        if WebDriverFactory._shm_size_mb() < Config.DENSE_MIN_SHM_MB:
+            # Docker's default 64MB /dev/shm makes renderers crash under load
+            options.add_argument("--disable-dev-shm-usage")
+
+    @staticmethod
+    def _shm_size_mb():
+        """Returns the size of /dev/shm in megabytes, 0 if it does not exist"""
+        try:
+            stats = os.statvfs("/dev/shm")
+        except OSError:
+            return 0
+        return stats.f_blocks * stats.f_frsize // (1024 * 1024)
+
+    @staticmethod
+    def get_local_chrome_options(headless=None):
+        """
+        Returns the options of a Chrome launched on this machine, for clients that start their
+        own chromedriver (e.g. utils/async_webdriver.py) as well as for get_driver().
+
+        Besides the profile, page load strategy and host allowlist, the browser is sent
+        through the record/replay proxy unless Config.NETWORK_MODE is "live".
+
+        Args:
+            headless (bool, optional): Whether to run the browser in headless mode. Defaults to the value of Config.HEADLESS.
+
+        Returns:
+            ChromeOptions: The options of the browser.
+        """
+        options = WebDriverFactory._get_chrome_options(headless or Config.HEADLESS)
+        if Config.NETWORK_MODE != "live":
+            # Record or replay every request through the local proxy, see utils/network_replay.py
+            options.add_argument(f"--proxy-server=http://{get_replay_proxy().address}")
+            options.add_argument("--ignore-certificate-errors")
+        return options
+
+    @staticmethod
+    def _get_chrome_driver(headless):
+        """Returns an instance of Chrome WebDriver using a locally resolved chromedriver"""
+        options = WebDriverFactory.get_local_chrome_options(headless)
         driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()), options=options
+            service=ChromeService(resolve_chromedriver()), options=options
         )
+        apply_request_blocking(driver)
         return driver
 
+    @staticmethod
+    def _get_remote_connection(grid_url):
+        """Returns the keep-alive command connection to a Grid endpoint, created once per process"""
+        with WebDriverFactory._remote_connections_lock:
+            connection = WebDriverFactory._remote_connections.get(grid_url)
+            if connection is None:
+                connection = SharedRemoteConnection(grid_url, keep_alive=True)
+                WebDriverFactory._remote_connections[grid_url] = connection
+            return connection
+
+    @staticmethod
+    def close_remote_connections(grid_url=None):
+        """
+        Closes the shared connections to Grid endpoints, once no remote driver uses them.
+
+        Args:
+            grid_url (str, optional): Only close the connection to this endpoint.
+        """
+        with WebDriverFactory._remote_connections_lock:
+            urls = [grid_url] if grid_url else list(WebDriverFactory._remote_connections)
+            for url in urls:
+                connection = WebDriverFactory._remote_connections.pop(url, None)
+                if connection is not None:
+                    connection.close_pool()
+
+    @staticmethod
+    def _get_remote_driver(headless):
+        """
+        Returns a Chrome session on the Selenium Grid (or standalone server) at Config.GRID_URL.
+
+        While the Grid cannot create a session (all slots busy, queue timeout, node starting),
+        the request is retried with exponential backoff for up to Config.GRID_SESSION_TIMEOUT seconds.
+        """
+        options = WebDriverFactory._get_chrome_options(headless)
+        connection = WebDriverFactory._get_remote_connection(Config.GRID_URL)
+        deadline = time.monotonic() + Config.GRID_SESSION_TIMEOUT
+        delay = 1
+        while True:
+            try:
+                return webdriver.Remote(command_executor=connection, options=options)
+            except (SessionNotCreatedException, HTTPError) as error:
+                if time.monotonic() + delay > deadline:
+                    raise
+                logger.warning(
+                    f"Grid at {Config.GRID_URL} did not create a session ({error}), "
+                    f"retrying in {delay}s"
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    @staticmethod
+    def get_driver_memory(driver):
+        """
+        Returns the memory used by a local driver: the proportional set size (PSS) of
+        chromedriver and every process it started, read from /proc.
+
+        Pages shared between Chrome processes are split among them instead of being counted
+        once per process, and only the driver's own process tree is visited.
+
+        Args:
+            driver (WebDriver): A driver returned by get_driver().
+
+        Returns:
+            int: Memory in bytes, or None for remote drivers and outside Linux.
+        """
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is None or not os.path.isdir("/proc"):
+            return None
+
+        total = 0
+        pending = [process.pid]
+        while pending:
+            pid = pending.pop()
+            memory = WebDriverFactory._process_memory(pid)
+            if memory is None:
+                # The process has exited, its children were reparented
+                continue
+            total += memory
+            pending.extend(WebDriverFactory._child_pids(pid))
+        return total
+
+    @staticmethod
+    def _process_memory(pid):
+        """Returns the PSS of a process in bytes, its RSS on kernels without smaps_rollup."""
+        try:
+            with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as smaps_file:
+                for line in smaps_file:
+                    if line.startswith("Pss:"):
+                        return int(line.split()[1]) * 1024
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return None
+        try:
+            with open(f"/proc/{pid}/statm", encoding="utf-8") as statm_file:
+                return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            return None
+
+    @staticmethod
+    def _child_pids(pid):
+        """Returns the direct children of a process, from the children list of each thread."""
+        children = []
+        try:
+            threads = os.listdir(f"/proc/{pid}/task")
+        except OSError:
+            return children
+        for tid in threads:
+            try:
+                with open(f"/proc/{pid}/task/{tid}/children", encoding="utf-8") as children_file:
+                    children.extend(int(child) for child in children_file.read().split())
+            except OSError:
+                continue
+        return children
+
     @staticmethod
     def _get_safari_driver():
         """Returns an instance of Safari WebDriver using WebDriverManager"""